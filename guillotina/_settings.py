@@ -97,6 +97,11 @@ app_settings: Dict[str, Any] = {
     "valid_id_characters": string.digits + string.ascii_lowercase + ".-_@$^()+ =",
     "load_catalog": True,
     "catalog_max_results": 50,
+    "security_decision_cache_size": 10000,
+    "jwt_cache_size": 10000,
+    "jwt_cache_ttl": 60,
+    "websocket_concurrency": 10,
+    "blob_prefetch_chunks": 4,
     "managers_roles": {
         "guillotina.ContainerAdmin": 1,
         "guillotina.ContainerDeleter": 1,
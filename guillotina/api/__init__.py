@@ -5,6 +5,7 @@ from . import addons  # noqa
 from . import aggregation  # noqa
 from . import app  # noqa
 from . import behaviors  # noqa
+from . import bulk  # noqa
 from . import container  # noqa
 from . import content  # noqa
 from . import dynamic  # noqa
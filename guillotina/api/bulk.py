@@ -0,0 +1,206 @@
+import logging
+import uuid
+from typing import Any, Dict, List, Tuple
+
+import orjson
+
+from guillotina import configure, error_reasons
+from guillotina._settings import app_settings
+from guillotina.api.service import Service
+from guillotina.component import query_adapter, query_multi_adapter
+from guillotina.exc_resp import render_error_response
+from guillotina.exceptions import ConflictError, TIDConflictError
+from guillotina.interfaces import IErrorResponseException, IFolder, IResponse
+from guillotina.response import ErrorResponse, HTTPPreconditionFailed, Response
+from guillotina.security.utils import get_view_permission
+from guillotina.transactions import get_tm, get_transaction
+from guillotina.utils import get_object_url, get_security_policy, navigate_to
+
+
+logger = logging.getLogger("guillotina")
+
+OPERATIONS = {"create": "POST", "patch": "PATCH", "delete": "DELETE"}
+
+NDJSON = "application/x-ndjson"
+
+ABORTED = {"reason": "Batch aborted"}
+CONFLICT = {"reason": "Conflict"}
+
+
+class _Failed(Exception):
+    def __init__(self, status: int, error: Dict[str, Any]):
+        self.status = status
+        self.error = error
+
+
+def _failed_result(index: int, operation: Any, status: int, error: Dict[str, Any]) -> Dict[str, Any]:
+    op = operation.get("op") if isinstance(operation, dict) else None
+    return {"index": index, "op": op, "status": status, "error": error}
+
+
+def _error_result(resp: Response) -> Tuple[int, Dict[str, Any]]:
+    content = resp.content if isinstance(resp.content, dict) else {}
+    return resp.status_code, content
+
+
+@configure.service(
+    context=IFolder,
+    method="POST",
+    permission="guillotina.AccessContent",
+    name="@bulk",
+    summary="Create, modify and delete many resources in one request",
+    description=(
+        "The body is a JSON array or newline delimited JSON (application/x-ndjson) "
+        "of operations: {'op': 'create', 'data': {...}}, {'op': 'patch', 'path': 'id', "
+        "'data': {...}} and {'op': 'delete', 'path': 'id'}. Operations are applied "
+        "in one transaction, or in transactions of batch_size operations, and a "
+        "result is streamed as a line of json for every operation."
+    ),
+    parameters=[{"name": "batch_size", "in": "query", "required": False, "schema": {"type": "number"}}],
+    responses={"200": {"description": "Newline delimited json result of every operation"}},
+)
+class BulkOperations(Service):
+    async def get_operations(self) -> List[Any]:
+        body = await self.request.read()
+        try:
+            if (self.request.content_type or "").split(";")[0].strip() == NDJSON:
+                return [orjson.loads(line) for line in bytes(body).splitlines() if line.strip()]
+            operations = orjson.loads(body)
+        except orjson.JSONDecodeError as e:
+            raise HTTPPreconditionFailed(content={"reason": "Invalid json payload", "message": str(e)})
+        if not isinstance(operations, list):
+            raise HTTPPreconditionFailed(content={"reason": "Expected a list of operations"})
+        return operations
+
+    def get_batch_size(self, total: int) -> int:
+        try:
+            batch_size = int(self.request.query["batch_size"])
+        except (KeyError, ValueError):
+            batch_size = 0
+        if batch_size <= 0:
+            return max(total, 1)
+        return batch_size
+
+    async def get_view(self, operation: Any):
+        if not isinstance(operation, dict) or operation.get("op") not in OPERATIONS:
+            raise _Failed(
+                412,
+                render_error_response("PreconditionFailed", error_reasons.REQUIRED_PARAM_MISSING),
+            )
+        path = operation.get("path") or ""
+        if operation["op"] != "create" and not path:
+            raise _Failed(
+                412,
+                render_error_response("PreconditionFailed", error_reasons.REQUIRED_PARAM_MISSING),
+            )
+        try:
+            target = await navigate_to(self.context, path)
+        except KeyError:
+            raise _Failed(404, {"reason": "Not found", "path": path})
+
+        method = app_settings["http_methods"][OPERATIONS[operation["op"]]]
+        view = query_multi_adapter((target, self.request), method, name="")
+        if view is None:
+            raise _Failed(405, render_error_response("MethodNotAllowed", error_reasons.NOT_ALLOWED))
+        security = get_security_policy()
+        if not security.check_permission(get_view_permission(view.__class__), view):
+            raise _Failed(401, render_error_response("Unauthorized", error_reasons.NOT_ALLOWED))
+        return target, view
+
+    async def apply(self, index: int, operation: Any) -> Dict[str, Any]:
+        """
+        Run the default view of the operation, with the data of the
+        operation as json payload
+        """
+        target, view = await self.get_view(operation)
+        payload = operation.get("data") or {}
+
+        async def json():
+            return payload
+
+        self.request.json = json
+        try:
+            if hasattr(view, "prepare"):
+                view = (await view.prepare()) or view
+            view_result = await view()
+        finally:
+            del self.request.json
+
+        result = {"index": index, "op": operation["op"], "status": 200}
+        if IResponse.providedBy(view_result):
+            if view_result.status_code >= 400:
+                raise _Failed(*_error_result(view_result))
+            result["status"] = view_result.status_code
+            if isinstance(view_result.content, dict):
+                for key in ("@id", "@name", "@uid"):
+                    if key in view_result.content:
+                        result[key] = view_result.content[key]
+        if "@id" not in result:
+            result["@id"] = get_object_url(target, self.request)
+        return result
+
+    async def apply_batch(self, start: int, operations: List[Any]) -> Tuple[bool, List[Dict[str, Any]]]:
+        """
+        Apply every operation of the batch in the current transaction,
+        nothing of the batch is applied when any of them fails
+        """
+        results: List[Dict[str, Any]] = []
+        for index, operation in enumerate(operations, start):
+            try:
+                results.append(await self.apply(index, operation))
+                continue
+            except (ConflictError, TIDConflictError):
+                raise
+            except _Failed as exc:
+                status, error = exc.status, exc.error
+            except Response as exc:
+                status, error = _error_result(exc)
+            except Exception as exc:
+                eid = uuid.uuid4().hex
+                resp = query_adapter(
+                    exc, IErrorResponseException, kwargs={"error": "ServiceError", "eid": eid}
+                )
+                if resp is None:
+                    logger.error(f"Error applying bulk operation {index}", exc_info=True)
+                    resp = ErrorResponse("ServiceError", "Error applying operation", status=500)
+                status, error = _error_result(resp)
+            return False, [
+                _failed_result(idx, op, status, error)
+                if idx == index
+                else _failed_result(idx, op, 424, ABORTED)
+                for idx, op in enumerate(operations, start)
+            ]
+        return True, results
+
+    async def __call__(self):
+        operations = await self.get_operations()
+        batch_size = self.get_batch_size(len(operations))
+        tm = get_tm()
+        txn = get_transaction()
+
+        resp = Response(status=200)
+        resp.content_type = NDJSON
+        await resp.prepare(self.request)
+
+        for start in range(0, len(operations), batch_size):
+            batch = operations[start : start + batch_size]
+            try:
+                applied, results = await self.apply_batch(start, batch)
+                if applied:
+                    await tm.commit(txn=txn)
+            except (ConflictError, TIDConflictError):
+                applied = False
+                results = [_failed_result(index, op, 409, CONFLICT) for index, op in enumerate(batch, start)]
+            if applied:
+                # index the objects of the batch
+                self.request.execute_futures()
+            else:
+                await tm.abort(txn=txn)
+                self.request.clear_futures()
+            # the request commits the last transaction when done
+            txn = await tm.begin()
+
+            await resp.write(b"".join(orjson.dumps(result) + b"\n" for result in results), eof=False)
+
+        await resp.write(b"", eof=True)
+        return resp
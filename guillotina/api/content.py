@@ -1,3 +1,5 @@
+import base64
+
 from guillotina import configure, content, error_reasons, security
 from guillotina._cache import FACTORY_CACHE
 from guillotina._settings import app_settings
@@ -673,6 +675,7 @@ async def ids(context, request):
         {"name": "omit", "in": "query", "required": False, "schema": {"type": "string"}},
         {"name": "page_size", "in": "query", "required": False, "schema": {"type": "number"}},
         {"name": "page", "in": "query", "required": False, "schema": {"type": "number"}},
+        {"name": "cursor", "in": "query", "required": False, "schema": {"type": "string"}},
     ],
     responses={"200": {"description": "Successfully returned response object"}},
 )
@@ -682,10 +685,6 @@ async def items(context, request):
         page_size = int(request.query["page_size"])
     except Exception:
         page_size = 20
-    try:
-        page = int(request.query["page"])
-    except Exception:
-        page = 1
 
     txn = get_transaction()
 
@@ -695,16 +694,47 @@ async def items(context, request):
     if request.query.get("omit"):
         omit = request.query.get("omit").split(",")
 
+    if "cursor" in request.query:
+        # keyset pagination, cursor is the last oid of the previous page
+        # and an empty cursor asks for the first page
+        after = None
+        if request.query.get("cursor"):
+            try:
+                after = base64.b64decode(request.query["cursor"], altchars=b"-_", validate=True).decode(
+                    "utf-8"
+                )
+            except (ValueError, UnicodeError):
+                raise ErrorResponse(
+                    "PreconditionFailed",
+                    _("Invalid cursor"),
+                    status=412,
+                    reason=error_reasons.PRECONDITION_FAILED,
+                )
+        obs, next_after = await txn.get_page_of_children(context, after=after, page_size=page_size)
+        cursor = None
+        if next_after is not None:
+            cursor = base64.urlsafe_b64encode(next_after.encode("utf-8")).decode("ascii")
+        result = {"page_size": page_size, "cursor": cursor}
+    else:
+        # offset pagination, the cost grows with the page number
+        try:
+            page = int(request.query["page"])
+        except Exception:
+            page = 1
+        keys = await txn.get_page_of_keys(context.__uuid__, page=page, page_size=page_size)
+        children = {ob.__name__: ob async for ob in txn.get_children(context, keys)}
+        obs = [children[key] for key in keys if key in children]
+        result = {"page": page, "page_size": page_size}
+
     results = []
-    for key in await txn.get_page_of_keys(context.__uuid__, page=page, page_size=page_size):
-        ob = await context.async_get(key)
+    for ob in obs:
         serializer = get_multi_adapter((ob, request), IResourceSerializeToJson)
         try:
             results.append(await serializer(include=include, omit=omit))
         except TypeError:
             results.append(await serializer())
 
-    return {"items": results, "total": await context.async_len(), "page": page, "page_size": page_size}
+    return {"items": results, "total": await context.async_len(), **result}
 
 
 @configure.service(
@@ -60,6 +60,13 @@ QUERY_PARAMETERS = [
         "description": "List of metadata fields to exclude",
         "schema": {"type": "string"},
     },
+    {
+        "in": "query",
+        "required": False,
+        "name": "_total",
+        "description": "How items_total is computed: exact, estimate or none to skip it",
+        "schema": {"type": "string", "enum": ["exact", "estimate", "none"]},
+    },
     {"in": "query", "required": False, "name": "__eq", "schema": {"type": "string"}},
     {"in": "query", "required": False, "name": "__not", "schema": {"type": "string"}},
     {"in": "query", "required": False, "name": "__gt", "schema": {"type": "string"}},
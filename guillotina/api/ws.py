@@ -1,9 +1,13 @@
+import asyncio
 import time
+from functools import partial
+from typing import Dict, Optional
 from urllib import parse
 
 import orjson
 from jwcrypto import jwe
 from jwcrypto.common import json_encode
+from zope.interface import alsoProvides, directlyProvidedBy
 
 from guillotina import configure, logger, routes, task_vars
 from guillotina._settings import app_settings
@@ -11,7 +15,7 @@ from guillotina.api.service import Service
 from guillotina.auth.extractors import BasicAuthPolicy
 from guillotina.component import get_utility, query_multi_adapter
 from guillotina.interfaces import IApplication, IContainer, IPermission, IResponse
-from guillotina.request import WebSocketJsonDecodeError
+from guillotina.request import Request, WebSocketJsonDecodeError
 from guillotina.security.utils import get_view_permission
 from guillotina.transactions import get_tm
 from guillotina.utils import get_jwk_key, get_security_policy
@@ -89,6 +93,26 @@ class WebsocketGetToken(Service):
     summary="Make a web socket connection",
 )
 class WebsocketsView(Service):
+    """
+    Frames are handled concurrently, up to ``websocket_concurrency`` of them
+    for every connection, each one in a read only transaction. Frames with
+    the same id are handled in the order they are received.
+    """
+
+    def get_frame_request(self, parsed) -> Request:
+        scope = dict(
+            self.request.scope,
+            type="http",
+            method="GET",
+            path=parsed.path,
+            query_string=parsed.query.encode("utf-8"),
+        )
+        request = Request.factory(scope, send=None, receive=None)
+        request.application = self.request.application
+        # active layers of the container
+        alsoProvides(request, *directlyProvidedBy(self.request))
+        return request
+
     async def handle_ws_request(self, ws, message):
         method = app_settings["http_methods"]["GET"]
         try:
@@ -99,9 +123,12 @@ class WebsocketsView(Service):
         parsed = parse.urlparse(message.get("path", message.get("value")))
         path = tuple(p for p in parsed.path.split("/") if p)
 
+        request = self.get_frame_request(parsed)
+        task_vars.request.set(request)
+
         from guillotina.traversal import traverse
 
-        obj, tail = await traverse(self.request, task_vars.container.get(), path)
+        obj, tail = await traverse(request, task_vars.container.get(), path)
 
         if tail and len(tail) > 0:
             # convert match lookups
@@ -116,15 +143,15 @@ class WebsocketsView(Service):
         security = get_security_policy()
         allowed = security.check_permission(permission.id, obj)
         if not allowed:
-            return await ws.send_bytes(orjson.dumps({"error": "Not allowed"}))
+            return await ws.send_bytes(orjson.dumps({"error": "Not allowed", "id": frame_id}))
 
         try:
-            view = query_multi_adapter((obj, self.request), method, name=view_name)
+            view = query_multi_adapter((obj, request), method, name=view_name)
         except AttributeError:
             view = None
 
         try:
-            view.__route__.matches(self.request, tail or [])
+            view.__route__.matches(request, tail or [])
         except (KeyError, IndexError):
             view = None
 
@@ -145,14 +172,41 @@ class WebsocketsView(Service):
         else:
             from guillotina.traversal import apply_rendering
 
-            resp = await apply_rendering(view, self.request, view_result)
+            resp = await apply_rendering(view, request, view_result)
 
-        # Return the value, body is always encoded
-        response_object = orjson.dumps({"data": resp.body.decode("utf-8"), "id": frame_id})
-        await ws.send_bytes(response_object)
+        if resp.content_type == "application/json":
+            # the rendered json is sent as it is
+            data = resp.body or b"null"
+        else:
+            data = orjson.dumps(resp.body.decode("utf-8"))
+        await ws.send_bytes(b'{"id":' + orjson.dumps(frame_id) + b',"data":' + data + b"}")
 
         # Wait for possible value
-        self.request.execute_futures()
+        request.execute_futures()
+
+    async def handle_frame(self, ws, message, previous: Optional[asyncio.Future]):
+        if previous is not None:
+            # frames with the same id keep their order
+            await asyncio.wait([previous])
+        tm = get_tm()
+        # every frame has its own transaction and futures
+        task_vars.txn.set(None)
+        task_vars.futures.set(None)
+        txn = None
+        try:
+            txn = await tm.begin(read_only=True)
+            await self.handle_ws_request(ws, message)
+        except Exception:
+            logger.error("Exception on ws", exc_info=True)
+            try:
+                await ws.send_bytes(orjson.dumps({"error": "Error", "id": message.get("id", "0")}))
+            except Exception:
+                logger.debug("Could not send ws error", exc_info=True)
+        finally:
+            # only currently support GET requests which are *never*
+            # supposed to be commits
+            if txn is not None:
+                await tm.abort(txn=txn)
 
     async def __call__(self):
         tm = get_tm()
@@ -160,6 +214,15 @@ class WebsocketsView(Service):
         ws = self.request.get_ws()
         await ws.prepare()
 
+        limit = asyncio.Semaphore(max(app_settings.get("websocket_concurrency", 1), 1))
+        # last frame handled for every id
+        pending: Dict[str, asyncio.Future] = {}
+
+        def done(frame_id, task):
+            limit.release()
+            if pending.get(frame_id) is task:
+                del pending[frame_id]
+
         async for msg in ws:
             try:
                 message = msg.json
@@ -171,15 +234,15 @@ class WebsocketsView(Service):
             if message["op"].lower() == "close":
                 break
             elif message["op"].lower() == "get":
-                txn = await tm.begin()
-                try:
-                    await self.handle_ws_request(ws, message)
-                except Exception:
-                    logger.error("Exception on ws", exc_info=True)
-                finally:
-                    # only currently support GET requests which are *never*
-                    # supposed to be commits
-                    await tm.abort(txn=txn)
+                # stop reading frames while the connection is at its limit
+                await limit.acquire()
+                frame_id = message.get("id", "0")
+                task = asyncio.ensure_future(self.handle_frame(ws, message, pending.get(frame_id)))
+                task.add_done_callback(partial(done, frame_id))
+                pending[frame_id] = task
+
+        if pending:
+            await asyncio.wait(list(pending.values()))
 
         logger.debug("websocket connection closed")
         await ws.close()
@@ -0,0 +1,149 @@
+import hashlib
+import time
+from typing import Dict, Optional, Set, Tuple
+
+from lru import LRU
+
+from guillotina._settings import app_settings
+
+
+try:
+    import prometheus_client
+
+    JWT_CACHE_OPS = prometheus_client.Counter(
+        "guillotina_auth_jwt_cache_total",
+        "Total count of verified token cache lookups by result (hit or miss).",
+        labelnames=["result"],
+    )
+except ImportError:
+    JWT_CACHE_OPS = None
+
+
+SessionKey = Tuple[str, str]
+
+
+def record_lookup(result: str) -> None:
+    if JWT_CACHE_OPS is not None:
+        JWT_CACHE_OPS.labels(result=result).inc()
+
+
+class VerifiedTokenCache:
+    """
+    Process wide cache of the claims of verified tokens.
+
+    Tokens are keyed by their digest and kept until their ``exp`` claim, and
+    at most ``jwt_cache_ttl`` seconds. Sessions checked for a token are only
+    cached while session revocations are received (``sessions_revocable``).
+    """
+
+    def __init__(self, size=None, ttl=None):
+        self._size = size
+        self._ttl = ttl
+        self._cache = None
+        # digests of the tokens with a checked session
+        self._sessions: Dict[SessionKey, Set[bytes]] = {}
+        self.sessions_revocable = False
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        if self._size is not None:
+            return self._size
+        return app_settings.get("jwt_cache_size", 0)
+
+    @property
+    def ttl(self):
+        if self._ttl is not None:
+            return self._ttl
+        return app_settings.get("jwt_cache_ttl", 60)
+
+    def _get_cache(self):
+        if self._cache is None:
+            size = self.size
+            if not size:
+                return None
+            self._cache = LRU(size, callback=self._evicted)
+        return self._cache
+
+    def _evicted(self, digest, entry):
+        session = entry[2]
+        if session is not None:
+            digests = self._sessions.get(session)
+            if digests is not None:
+                digests.discard(digest)
+                if len(digests) == 0:
+                    del self._sessions[session]
+
+    def _get_entry(self, digest):
+        cache = self._get_cache()
+        if cache is None:
+            return None
+        entry = cache.get(digest)
+        if entry is not None and entry[1] <= time.time():
+            self._evicted(digest, entry)
+            del cache[digest]
+            return None
+        return entry
+
+    def get_digest(self, token: str) -> bytes:
+        return hashlib.sha256(token.encode("utf-8")).digest()
+
+    def get(self, token: str) -> Optional[Dict]:
+        entry = self._get_entry(self.get_digest(token))
+        if entry is None:
+            self.misses += 1
+            record_lookup("miss")
+            return None
+        self.hits += 1
+        record_lookup("hit")
+        # callers may change the claims
+        return dict(entry[0])
+
+    def set(self, token: str, claims: Dict):
+        cache = self._get_cache()
+        if cache is None:
+            return
+        expires = time.time() + self.ttl
+        exp = claims.get("exp")
+        if isinstance(exp, (int, float)):
+            expires = min(expires, exp)
+        digest = self.get_digest(token)
+        if digest in cache:
+            self._evicted(digest, cache[digest])
+        cache[digest] = (dict(claims), expires, None)
+
+    def has_session(self, token: str) -> bool:
+        if not self.sessions_revocable:
+            return False
+        entry = self._get_entry(self.get_digest(token))
+        return entry is not None and entry[2] is not None
+
+    def set_session(self, token: str, ident: str, session: str):
+        if not self.sessions_revocable:
+            return
+        digest = self.get_digest(token)
+        entry = self._get_entry(digest)
+        if entry is None:
+            return
+        key = (ident, session)
+        self._cache[digest] = (entry[0], entry[1], key)
+        self._sessions.setdefault(key, set()).add(digest)
+
+    def revoke_session(self, ident: str, session: str):
+        digests = self._sessions.pop((ident, session), set())
+        if not self._cache:
+            return
+        for digest in digests:
+            if digest in self._cache:
+                del self._cache[digest]
+
+    def clear(self):
+        self._cache = None
+        self._sessions = {}
+
+    def __len__(self):
+        return len(self._cache) if self._cache else 0
+
+
+token_cache = VerifiedTokenCache()
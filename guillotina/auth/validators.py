@@ -12,6 +12,7 @@ from lru import LRU
 from guillotina import configure
 from guillotina._settings import app_settings
 from guillotina.auth import find_user
+from guillotina.auth.cache import token_cache
 from guillotina.component import get_utility, query_utility
 from guillotina.interfaces import IApplication, IPasswordChecker, IPasswordHasher, ISessionManagerUtility
 from guillotina.utils import strings_differ
@@ -112,6 +113,19 @@ class SaltedHashPasswordValidator:
             return user
 
 
+def decode_jwt(value: str) -> dict:
+    """
+    Claims of a verified token, from the cache of verified tokens when possible
+    """
+    claims = token_cache.get(value)
+    if claims is None:
+        claims = jwt.decode(
+            value, app_settings["jwt"]["secret"], algorithms=[app_settings["jwt"]["algorithm"]]
+        )
+        token_cache.set(value, claims)
+    return claims
+
+
 class JWTValidator:
     for_validators = ("bearer", "wstoken", "cookie")
 
@@ -124,9 +138,7 @@ class JWTValidator:
             return
 
         try:
-            validated_jwt = jwt.decode(
-                token["token"], app_settings["jwt"]["secret"], algorithms=[app_settings["jwt"]["algorithm"]]
-            )
+            validated_jwt = decode_jwt(token["token"])
             token["id"] = validated_jwt.get("id", validated_jwt.get("sub"))
             token["decoded"] = validated_jwt
             user = await find_user(token)
@@ -150,14 +162,16 @@ class JWTSessionValidator:
             return
 
         try:
-            validated_jwt = jwt.decode(
-                token["token"], app_settings["jwt"]["secret"], algorithms=[app_settings["jwt"]["algorithm"]]
-            )
+            validated_jwt = decode_jwt(token["token"])
 
             session_manager = query_utility(ISessionManagerUtility)
             if session_manager is not None:
                 session = validated_jwt.get("session", None)
-                valid_session = await session_manager.exist_session(validated_jwt["id"], session)
+                valid_session = token_cache.has_session(token["token"])
+                if not valid_session:
+                    valid_session = await session_manager.exist_session(validated_jwt["id"], session)
+                    if valid_session:
+                        token_cache.set_session(token["token"], validated_jwt["id"], session)
                 if valid_session:
                     token["id"] = validated_jwt["id"]
                     token["decoded"] = validated_jwt
@@ -1,5 +1,8 @@
+import asyncio
+from bisect import bisect_right
 from io import BytesIO
-from typing import AsyncIterator, Union
+from itertools import accumulate
+from typing import AsyncIterator, List, Optional, Tuple, Union
 
 from guillotina._settings import app_settings
 from guillotina.exceptions import BlobChunkNotFound
@@ -33,6 +36,7 @@ class Blob:
 class BlobFile:
 
     _started_writing = False
+    _chunk_offsets: Optional[List[int]] = None
 
     def __init__(self, blob, mode, transaction=None):
         self.blob = blob
@@ -48,6 +52,7 @@ class BlobFile:
         self.blob.chunk_sizes = {}
         self.blob.size = 0
         self.blob.chunks = 0
+        self._chunk_offsets = None
 
     async def async_write_chunk(self, data: bytes):
         if self.mode not in ("w", "a"):
@@ -69,6 +74,7 @@ class BlobFile:
 
         self.blob.chunks += 1
         self.blob.size += len(data)
+        self._chunk_offsets = None
 
     async def async_write(self, data: Union[bytes, BytesIO], chunk_size: int = 1024 * 1024 * 1):
         if isinstance(data, bytes):
@@ -87,18 +93,76 @@ class BlobFile:
         except (KeyError, TypeError, IndexError):
             raise BlobChunkNotFound("Could not find blob({}), chunk({})".format(self.blob.bid, chunk_index))
 
-    async def iter_async_read(self) -> AsyncIterator[bytes]:
+    async def async_read_chunks(self, start: int, end: int) -> List[bytes]:
+        """
+        read chunks from ``start`` to ``end`` (not included) in one query
+        """
+        records = await self.transaction.read_blob_chunks(self.blob.bid, start, end)
+        if len(records) != end - start:
+            raise BlobChunkNotFound(
+                "Could not find blob({}), chunks({}-{})".format(self.blob.bid, start, end - 1)
+            )
+        return [record["data"] for record in records]
+
+    def chunk_offsets(self) -> List[int]:
+        """
+        byte offset every chunk starts at, the last value is the blob size
+        """
+        if self._chunk_offsets is None:
+            sizes = self.blob.chunk_sizes
+            self._chunk_offsets = [0] + list(accumulate(sizes[idx] for idx in range(self.blob.chunks)))
+        return self._chunk_offsets
+
+    def find_chunk(self, offset: int) -> Tuple[int, int]:
+        """
+        get the index of the chunk with the byte at ``offset`` and the offset it starts at
+        """
+        offsets = self.chunk_offsets()
+        chunk_index = bisect_right(offsets, offset) - 1
+        if chunk_index < 0 or chunk_index >= self.blob.chunks:
+            raise BlobChunkNotFound("Could not find blob({}), offset({})".format(self.blob.bid, offset))
+        return chunk_index, offsets[chunk_index]
+
+    async def iter_async_read(
+        self, start: int = 0, end: Optional[int] = None, prefetch: Optional[int] = None
+    ) -> AsyncIterator[bytes]:
         """
         yield chunks of data...
+
+        Chunks are read ``prefetch`` at a time and the next ones are read
+        while the current ones are consumed.
         """
-        for chunk_index in range(self.blob.chunks):
-            yield await self.async_read_chunk(chunk_index)
+        if end is None:
+            end = self.blob.chunks
+        if prefetch is None:
+            prefetch = app_settings.get("blob_prefetch_chunks", 4)
+        prefetch = max(prefetch, 1)
+        pending = None
+        try:
+            chunk_index = start
+            while chunk_index < end:
+                batch_end = min(chunk_index + prefetch, end)
+                if pending is None:
+                    chunks = await self.async_read_chunks(chunk_index, batch_end)
+                else:
+                    chunks = await pending
+                    pending = None
+                chunk_index = batch_end
+                if chunk_index < end:
+                    pending = asyncio.ensure_future(
+                        self.async_read_chunks(chunk_index, min(chunk_index + prefetch, end))
+                    )
+                for chunk in chunks:
+                    yield chunk
+        finally:
+            if pending is not None:
+                pending.cancel()
 
     async def async_read(self, chunk_size=None) -> bytes:
         """
         read all the data... should this implement complete file-like api?
         """
-        data = b""
+        chunks = []
         async for chunk in self.iter_async_read():
-            data += chunk
-        return data
+            chunks.append(chunk)
+        return b"".join(chunks)
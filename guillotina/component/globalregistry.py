@@ -12,10 +12,11 @@
 #
 ##############################################################################
 import asyncio
+import itertools
 import logging
 import os
 import time
-from typing import Type
+from typing import Any, Dict, List, Tuple, Type
 
 from zope.interface import implementer, providedBy
 from zope.interface.adapter import AdapterLookup, AdapterRegistry
@@ -28,14 +29,72 @@ from guillotina.profile import profilable
 
 profile_logger = logging.getLogger("guillotina.profile")
 
+DispatchPlan = Tuple[Tuple[Tuple[Any, bool], ...], ...]
+
+_generations = itertools.count()
+
 
 class GuillotinaAdapterLookup(AdapterLookup):
+    def __init__(self, *args, **kwargs):
+        # subscriber dispatch plans by required specifications and provided
+        self._dispatch: Dict[Tuple[Any, ...], DispatchPlan] = {}
+        # unique for every state of the registrations, for lookups cached elsewhere
+        self.generation = next(_generations)
+        super().__init__(*args, **kwargs)
+
+    def changed(self, originally_changed):
+        super().changed(originally_changed)
+        self._dispatch.clear()
+        self.generation = next(_generations)
+
+    def dispatch_plan(self, objects, provided) -> DispatchPlan:
+        """
+        Subscriptions for the objects sorted by priority and grouped in steps
+        of ``(subscription, is_coroutine)`` pairs, steps of more than one
+        subscription are run concurrently.
+        """
+        required = tuple(map(providedBy, objects))
+        key = required + (provided,)
+        try:
+            return self._dispatch[key]
+        except KeyError:
+            pass
+
+        plan: List[Tuple[Tuple[Any, bool], ...]] = []
+        group: List[Tuple[Any, bool]] = []
+        group_priority = None
+        for subscription in sorted(
+            self.subscriptions(required, provided), key=lambda sub: getattr(sub, "priority", 100)
+        ):
+            is_coroutine = asyncio.iscoroutinefunction(subscription)
+            priority = getattr(subscription, "priority", 100)
+            if is_coroutine and getattr(subscription, "concurrent", False):
+                if group and priority == group_priority:
+                    group.append((subscription, True))
+                    continue
+                if group:
+                    plan.append(tuple(group))
+                group, group_priority = [(subscription, True)], priority
+                continue
+            if group:
+                plan.append(tuple(group))
+                group, group_priority = [], None
+            plan.append(((subscription, is_coroutine),))
+        if group:
+            plan.append(tuple(group))
+
+        self._dispatch[key] = result = tuple(plan)
+        return result
+
     @profilable
     async def asubscribers(self, objects, provided):
-        subscriptions = self.subscriptions(map(providedBy, objects), provided)
         results = []
-        for subscription in sorted(subscriptions, key=lambda sub: getattr(sub, "priority", 100)):
-            if asyncio.iscoroutinefunction(subscription):
+        for step in self.dispatch_plan(objects, provided):
+            if len(step) > 1:
+                results.extend(await asyncio.gather(*(subscription(*objects) for subscription, _ in step)))
+                continue
+            subscription, is_coroutine = step[0]
+            if is_coroutine:
                 results.append(await subscription(*objects))
             else:
                 results.append(subscription(*objects))
@@ -43,11 +102,11 @@ class GuillotinaAdapterLookup(AdapterLookup):
 
     @profilable
     def subscribers(self, objects, provided):
-        subscriptions = self.subscriptions(map(providedBy, objects), provided)
         result = []
-        for subscription in sorted(subscriptions, key=lambda sub: getattr(sub, "priority", 100)):
-            if not asyncio.iscoroutinefunction(subscription):
-                result.append(subscription(*objects))
+        for step in self.dispatch_plan(objects, provided):
+            for subscription, is_coroutine in step:
+                if not is_coroutine:
+                    result.append(subscription(*objects))
         return result
 
 
@@ -87,16 +146,13 @@ class DebugGuillotinaAdapterLookup(GuillotinaAdapterLookup):  # pragma: no cover
         }
 
         start = time.time() * 1000
-        subscriptions = sorted(
-            self.subscriptions(map(providedBy, objects), provided),
-            key=lambda sub: getattr(sub, "priority", 100),
-        )
+        subscriptions = [sub for step in self.dispatch_plan(objects, provided) for sub in step]
         info["lookup_time"] = (time.time() * 1000) - start
         info["found"] = len(subscriptions)
         results = []
-        for subscription in subscriptions:
+        for subscription, is_coroutine in subscriptions:
             start = time.time() * 1000
-            if asyncio.iscoroutinefunction(subscription):
+            if is_coroutine:
                 results.append(await subscription(*objects))
             else:
                 results.append(subscription(*objects))
@@ -126,6 +182,13 @@ class GuillotinaAdapterRegistry(AdapterRegistry):
         self.__name__ = name
         super().__init__()
 
+    @property
+    def generation(self) -> int:
+        """
+        Changes when the registrations of the registry change
+        """
+        return self._v_lookup.generation
+
 
 @implementer(IComponentLookup)
 class GlobalComponents(Components):  # type: ignore
@@ -274,3 +274,84 @@ def test_suite():
             unittest.makeSuite(Test_provide_handler),
         )
     )
+
+
+class Test_asubscribers(unittest.IsolatedAsyncioTestCase):
+
+    from guillotina.component.testing import setUp, tearDown
+
+    def _makeEvent(self):
+        from zope.interface import Interface, implementer
+
+        class IFoo(Interface):
+            pass
+
+        @implementer(IFoo)
+        class Foo(object):
+            pass
+
+        return IFoo, Foo()
+
+    async def test_dispatch_plan_is_invalidated_on_registration(self):
+        from guillotina.component.globalregistry import get_global_components, provide_handler
+
+        IFoo, foo = self._makeEvent()
+        called = []
+
+        async def first(event):
+            called.append("first")
+
+        def second(event):
+            called.append("second")
+
+        first.priority = 200
+        provide_handler(first, (IFoo,))
+        gsm = get_global_components()
+        await gsm.adapters.asubscribers((foo,), None)
+        self.assertEqual(called, ["first"])
+
+        lookup = gsm.adapters._v_lookup
+        plan = lookup.dispatch_plan((foo,), None)
+        self.assertIs(plan, lookup.dispatch_plan((foo,), None))
+
+        provide_handler(second, (IFoo,))
+        self.assertEqual(lookup.dispatch_plan((foo,), None), (((second, False),), ((first, True),)))
+        called.clear()
+        await gsm.adapters.asubscribers((foo,), None)
+        self.assertEqual(called, ["second", "first"])
+
+        called.clear()
+        gsm.adapters.subscribers((foo,), None)
+        self.assertEqual(called, ["second"])
+
+    async def test_concurrent_subscribers(self):
+        import asyncio
+
+        from guillotina.component.globalregistry import get_global_components, provide_handler
+
+        IFoo, foo = self._makeEvent()
+        running = []
+        concurrency = []
+
+        def make_handler(name, concurrent):
+            async def handler(event):
+                running.append(name)
+                concurrency.append(len(running))
+                await asyncio.sleep(0.01)
+                running.remove(name)
+                return name
+
+            handler.concurrent = concurrent
+            return handler
+
+        handlers = [make_handler(name, name != "last") for name in ("a", "b", "c", "last")]
+        for handler in handlers:
+            provide_handler(handler, (IFoo,))
+        gsm = get_global_components()
+        plan = gsm.adapters._v_lookup.dispatch_plan((foo,), None)
+        self.assertEqual([len(step) for step in plan], [3, 1])
+
+        results = await gsm.adapters.asubscribers((foo,), None)
+        self.assertEqual(results, ["a", "b", "c", "last"])
+        self.assertEqual(max(concurrency), 3)
+        self.assertEqual(concurrency[-1], 1)
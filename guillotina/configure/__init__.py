@@ -545,6 +545,7 @@ class subscriber(_factory_decorator):  # noqa: N801
 
     def __call__(self, klass=None):
         klass.priority = self.config.pop("priority", 100)
+        klass.concurrent = self.config.pop("concurrent", False)
         return super().__call__(klass)
 
 
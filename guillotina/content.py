@@ -342,6 +342,16 @@ class Folder(Resource):
         async for item in txn.get_children(self, keys):  # type: ignore
             yield item
 
+    async def async_get_path(self, keys: List[str]) -> List[IBaseObject]:
+        """
+        Asynchronously get the chain of objects for a path inside this folder,
+        resolving uncached parts of the path with a single storage lookup.
+
+        :param keys: ids of the path segments, from this folder downwards
+        """
+        txn = self._get_transaction()
+        return await txn.get_path(self, keys)  # type: ignore
+
     async def async_del(self, key: str) -> None:
         """
         Asynchronously delete object in the folder
@@ -11,6 +11,11 @@ app_settings = {
         "strategy": "basic",
         "ttl": 3600,
         "push": True,  # push out object data to fill other guillotina caches with changes
+        "wire_format": "pickle",  # or "framed": header + json metadata + raw state bytes for records
+        "compression": None,  # "zlib" or "lz4" to compress framed record states
+        "compression_threshold": 8192,  # minimum state size to compress
+        "invalidation_batch_window": 5,  # ms to coalesce invalidations of commits, 0 to publish each one
+        "invalidation_batch_size": 1000,  # publish as soon as this number of keys are pending
     },
     "load_utilities": {
         "guillotina_cache": {
@@ -0,0 +1,116 @@
+import asyncio
+import logging
+import time
+import uuid
+from typing import Any, Dict, List, Optional
+
+
+try:
+    import prometheus_client
+
+    INVALIDATION_BATCH_KEYS = prometheus_client.Histogram(
+        "guillotina_cache_invalidation_batch_keys",
+        "Histogram of number of keys sent in each invalidation message",
+        buckets=(1, 5, 10, 50, 100, 500, 1000, 5000, float("inf")),
+    )
+    INVALIDATION_BATCH_COMMITS = prometheus_client.Histogram(
+        "guillotina_cache_invalidation_batch_commits",
+        "Histogram of number of commits coalesced in each invalidation message",
+        buckets=(1, 2, 5, 10, 20, 50, 100, float("inf")),
+    )
+    INVALIDATION_LAG = prometheus_client.Histogram(
+        "guillotina_cache_invalidation_lag_seconds",
+        "Histogram of time invalidations wait to be published (in seconds)",
+    )
+except ImportError:
+    INVALIDATION_BATCH_KEYS = None
+    INVALIDATION_BATCH_COMMITS = None
+    INVALIDATION_LAG = None
+
+
+logger = logging.getLogger("guillotina.contrib.cache")
+
+
+class InvalidationBatcher:
+    """
+    Coalesce the invalidations of the commits of a process.
+
+    Keys invalidated in a window of ``window`` ms are published in one message,
+    deduplicated, or as soon as ``max_keys`` keys are pending. A window of
+    ``0`` publishes every commit on its own.
+    """
+
+    def __init__(self, utility, window: float = 5, max_keys: int = 1000):
+        self._utility = utility
+        self._window = window / 1000
+        self._max_keys = max_keys
+        self._keys: Dict[str, None] = {}
+        self._push: Dict[str, Any] = {}
+        self._tids: List[str] = []
+        self._started: Optional[float] = None
+        self._timer: Optional[asyncio.Task] = None
+        self._lock = asyncio.Lock()
+        self._prefix = uuid.uuid4().hex
+        self._seq = 0
+        self.batches = 0
+        self.commits = 0
+
+    def __len__(self):
+        return len(self._keys)
+
+    async def add(self, tid, keys: List[str], push: Optional[Dict[str, Any]] = None):
+        if self._started is None:
+            self._started = time.monotonic()
+        self._tids.append(tid)
+        push = push or {}
+        for key in keys:
+            self._keys[key] = None
+            # pushed data of a previous commit is outdated by this one
+            if key not in push:
+                self._push.pop(key, None)
+        self._push.update(push)
+        self.commits += 1
+
+        if self._window <= 0 or len(self._keys) >= self._max_keys:
+            await self.flush()
+        elif self._timer is None:
+            self._timer = asyncio.ensure_future(self._flush_later())
+
+    async def _flush_later(self):
+        await asyncio.sleep(self._window)
+        self._timer = None
+        try:
+            await self.flush()
+        except Exception:
+            logger.warning("Error publishing cache invalidations", exc_info=True)
+
+    async def flush(self):
+        if self._timer is not None and self._timer is not asyncio.current_task():
+            self._timer.cancel()
+            self._timer = None
+        if len(self._tids) == 0:
+            return
+        keys, push, tids, started = list(self._keys), self._push, self._tids, self._started
+        self._keys, self._push, self._tids, self._started = {}, {}, [], None
+
+        self._seq += 1
+        batch_tid = tids[0] if len(tids) == 1 else f"{self._prefix}-{self._seq}"
+        # the message comes back to this process too
+        self._utility.ignore_tid(batch_tid)
+        async with self._lock:
+            await self._utility._subscriber.publish(
+                self._utility.updates_channel,
+                batch_tid,
+                {"tid": batch_tid, "keys": keys, "push": push},
+            )
+        self.batches += 1
+        if INVALIDATION_BATCH_KEYS is not None:
+            INVALIDATION_BATCH_KEYS.observe(len(keys))
+            INVALIDATION_BATCH_COMMITS.observe(len(tids))
+            INVALIDATION_LAG.observe(time.monotonic() - started)
+
+    async def close(self):
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
@@ -142,6 +142,7 @@ typedef struct {
     Py_ssize_t hits;
     Py_ssize_t clean;
     Py_ssize_t misses;
+    Py_ssize_t rejected;  /* values not stored because they are bigger than the cache */
     PyObject *callback;
 } LRU;
 
@@ -234,7 +235,7 @@ lru_length(LRU *self)
 static PyObject *
 LRU_memory(LRU *self)
 {
-    return Py_BuildValue("l", self->memory);
+    return Py_BuildValue("n", self->memory);
 }
 
 static PyObject *
@@ -311,7 +312,7 @@ LRU_get(LRU *self, PyObject *args)
 
 void lru_vacuum(LRU *self) {
     // vacuuum
-    while(self->memory > self->size) {
+    while(self->memory > self->size && self->last) {
         self->memory -= self->last->size;
         lru_delete_last(self);
         self->clean += 1;
@@ -324,13 +325,24 @@ _lru_ass_sub(LRU *self, PyObject *key, PyObject *value, Py_ssize_t memory)
 {
 
     int res = 0;
-    /* do nothing if provided val is greater in size than the desired cache */
-    if (memory > self->size) {
+    Node *node = GET_NODE(self->dict, key);
+    PyErr_Clear();  /* GET_NODE sets an exception on miss. Shut it up. */
+
+    /* do not store values greater in size than the desired cache,
+       any previous value for the key is stale so it is dropped */
+    if (value && memory > self->size) {
+        self->rejected++;
+        if (node) {
+            res = PUT_NODE(self->dict, key, NULL);
+            if (res == 0) {
+                self->memory -= node->size;
+                lru_remove_node(self, node);
+            }
+            Py_DECREF(node);
+        }
         return res;
     }
 
-    Node *node = GET_NODE(self->dict, key);
-    PyErr_Clear();  /* GET_NODE sets an exception on miss. Shut it up. */
     if (value) {
         if (node) {
             Py_INCREF(value);
@@ -387,7 +399,7 @@ LRU_set(LRU *self, PyObject *args) {
     PyObject *key, *value;
     Py_ssize_t mem;
 
-    if (!PyArg_ParseTuple(args, "OOl", &key, &value, &mem))
+    if (!PyArg_ParseTuple(args, "OOn", &key, &value, &mem))
             return NULL;
     _lru_ass_sub(self, key, value, mem);
     Py_RETURN_NONE;
@@ -521,17 +533,16 @@ static PyObject *
 LRU_set_size(LRU *self, PyObject *args, PyObject *kwds)
 {
     Py_ssize_t newSize;
-    if (!PyArg_ParseTuple(args, "l", &newSize)) {
+    if (!PyArg_ParseTuple(args, "n", &newSize)) {
         return NULL;
     }
     if (newSize <= 0) {
         PyErr_SetString(PyExc_ValueError, "Size should be a positive number");
         return NULL;
     }
-    while (lru_length(self) > newSize) {
-        lru_delete_last(self);
-    }
     self->size = newSize;
+    /* size is a memory budget, evict until we fit in it */
+    lru_vacuum(self);
     Py_RETURN_NONE;
 }
 
@@ -557,7 +568,13 @@ LRU_clear(LRU *self)
 static PyObject *
 LRU_get_size(LRU *self)
 {
-    return Py_BuildValue("i", self->size);
+    return Py_BuildValue("n", self->size);
+}
+
+static PyObject *
+LRU_get_rejected(LRU *self)
+{
+    return Py_BuildValue("n", self->rejected);
 }
 
 static PyObject *
@@ -605,7 +622,9 @@ static PyMethodDef LRU_methods[] = {
     {"clear", (PyCFunction)LRU_clear, METH_NOARGS,
                     PyDoc_STR("L.clear() -> clear LRU")},
     {"get_stats", (PyCFunction)LRU_get_stats, METH_NOARGS,
-                    PyDoc_STR("L.get_stats() -> returns a tuple with cache hits and misses")},
+                    PyDoc_STR("L.get_stats() -> returns a tuple with cache hits, misses and evictions")},
+    {"get_rejected", (PyCFunction)LRU_get_rejected, METH_NOARGS,
+                    PyDoc_STR("L.get_rejected() -> number of values too big to be stored")},
     {"peek_first_item", (PyCFunction)LRU_peek_first_item, METH_NOARGS,
                     PyDoc_STR("L.peek_first_item() -> returns the MRU item (key,value) without changing key order")},
     {"peek_last_item", (PyCFunction)LRU_peek_last_item, METH_NOARGS,
@@ -629,7 +648,7 @@ LRU_init(LRU *self, PyObject *args, PyObject *kwds)
     static char *kwlist[] = {"size", "callback", NULL};
     PyObject *callback = NULL;
     self->callback = NULL;
-    if (!PyArg_ParseTupleAndKeywords(args, kwds, "l|O", kwlist, &self->size, &callback)) {
+    if (!PyArg_ParseTupleAndKeywords(args, kwds, "n|O", kwlist, &self->size, &callback)) {
         return -1;
     }
 
@@ -652,6 +671,7 @@ LRU_init(LRU *self, PyObject *args, PyObject *kwds)
     self->misses = 0;
     self->memory = 0;
     self->clean = 0;
+    self->rejected = 0;
     return 0;
 }
 
@@ -1,7 +1,13 @@
 from typing import Any
 from typing import Dict
 from typing import Optional
+from typing import Tuple
 
 class LRU(Dict[str, Any]):
     def __init__(self, size: int): ...
     def set(self, key: str, value: Any, size: Optional[int] = None) -> None: ...
+    def set_size(self, size: int) -> None: ...
+    def get_size(self) -> int: ...
+    def get_memory(self) -> int: ...
+    def get_stats(self) -> Tuple[int, int, int]: ...
+    def get_rejected(self) -> int: ...
@@ -1,19 +1,110 @@
 import pickle
+import struct
 import typing
+import zlib
 
 import asyncpg
+import orjson
 
+from guillotina import app_settings
 from guillotina.profile import profilable
 
 
+try:
+    import lz4.frame
+except ImportError:
+    lz4 = None  # type: ignore
+
+
+# framed records: header + json metadata + raw (maybe compressed) state bytes
+MAGIC = b"GC"
+VERSION = 1
+HEADER = struct.Struct("!2sBBI")  # magic, version, compression, metadata length
+
+COMPRESSION_NONE = 0
+COMPRESSION_ZLIB = 1
+COMPRESSION_LZ4 = 2
+_compressions = {"zlib": COMPRESSION_ZLIB, "lz4": COMPRESSION_LZ4}
+
+
+def _compress(compression: int, data: bytes) -> bytes:
+    if compression == COMPRESSION_ZLIB:
+        return zlib.compress(data, 1)
+    if compression == COMPRESSION_LZ4:
+        return lz4.frame.compress(data)
+    return data
+
+
+def _decompress(compression: int, data: bytes) -> bytes:
+    if compression == COMPRESSION_ZLIB:
+        return zlib.decompress(data)
+    if compression == COMPRESSION_LZ4:
+        if lz4 is None:
+            raise ValueError("lz4 compressed cache value but lz4 is not installed")
+        return lz4.frame.decompress(data)
+    return data
+
+
+def dumps_record(value: typing.Any, compression: typing.Optional[str] = None, threshold: int = 0) -> bytes:
+    """
+    Serialize a record in the framed format, the state is written as is
+    (compressed when ``compression`` is set and the state is at least ``threshold`` bytes).
+
+    :param value: dict or ``asyncpg.Record`` with a ``state`` value
+    :returns: bytes
+    """
+    state = value["state"]
+    metadata = orjson.dumps({k: v for k, v in value.items() if k != "state"})
+    compression_type = COMPRESSION_NONE
+    if compression is not None and len(state) >= threshold:
+        compression_type = _compressions.get(compression, COMPRESSION_NONE)
+        if compression_type == COMPRESSION_LZ4 and lz4 is None:
+            compression_type = COMPRESSION_ZLIB
+        state = _compress(compression_type, state)
+    return b"".join([HEADER.pack(MAGIC, VERSION, compression_type, len(metadata)), metadata, state])
+
+
+def loads_record(value: bytes) -> typing.Dict[str, typing.Any]:
+    """
+    Deserialize a record written by ``dumps_record``.
+
+    :param value: bytes
+    :returns: dict
+    """
+    _, version, compression_type, metadata_size = HEADER.unpack_from(value)
+    if version != VERSION:
+        raise ValueError(f"Unsupported cache record version {version}")
+    view = memoryview(value)
+    start = HEADER.size + metadata_size
+    data = orjson.loads(view[HEADER.size : start])
+    data["state"] = _decompress(compression_type, bytes(view[start:]))
+    return data
+
+
+def is_record(value: typing.Any) -> bool:
+    return isinstance(value, (dict, asyncpg.Record)) and isinstance(value.get("state"), bytes)
+
+
 @profilable
 def dumps(value: typing.Any) -> bytes:
     """
-    Serialize the received value using ``pickle.dumps``.
+    Serialize the received value.
+
+    Records are written in the framed format when the ``wire_format`` cache
+    setting is ``framed``, everything else uses ``pickle.dumps``.
 
     :param value: dict
     :returns: bytes
     """
+    settings = app_settings.get("cache", {})
+    if settings.get("wire_format", "pickle") == "framed" and is_record(value):
+        try:
+            return dumps_record(
+                value, settings.get("compression"), settings.get("compression_threshold", 8192)
+            )
+        except TypeError:
+            # metadata not json serializable, fallback to pickle
+            pass
     if isinstance(value, asyncpg.Record):
         value = dict(value)
     return pickle.dumps(value)
@@ -22,11 +113,13 @@ def dumps(value: typing.Any) -> bytes:
 @profilable
 def loads(value: bytes) -> typing.Any:
     """
-    Deserialize value using ``pickle.loads``.
+    Deserialize value, framed records or ``pickle.loads``.
 
     :param value: bytes
-    :returns: output of ``pickle.loads``.
+    :returns: deserialized value
     """
     if value is None:
         return None
+    if value[:2] == MAGIC:
+        return loads_record(value)
     return pickle.loads(value)
@@ -1,9 +1,10 @@
 import asyncio
 import logging
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from guillotina import app_settings, configure
 from guillotina.component import query_utility
+from guillotina.contrib.cache import serialize
 from guillotina.db.cache.base import BaseCache
 from guillotina.db.interfaces import ITransaction, ITransactionCache
 from guillotina.exceptions import NoChannelConfigured, NoPubSubUtility
@@ -55,6 +56,28 @@ class BasicCache(BaseCache):
         await self._utility.set([self.get_key(**opts) for opts in keyset], value)
         self._stored += 1
 
+    @profilable
+    async def get_many(self, keysets: List[Dict[str, Any]]) -> List[Optional[Any]]:
+        if self._utility is None:
+            return [None] * len(keysets)
+        results = await self._utility.get_many([self.get_key(**opts) for opts in keysets])
+        for obj in results:
+            if obj is not None:
+                self._hits += 1
+            else:
+                self._misses += 1
+        return results
+
+    @profilable
+    async def set_many(self, entries: List[Tuple[Any, List[Dict[str, Any]]]]):
+        if self._utility is None or len(entries) == 0:
+            return
+        await self._utility.set_many(
+            [([self.get_key(**opts) for opts in keyset], value) for value, keyset in entries]
+        )
+        for _ in entries:
+            self._stored += 1
+
     @profilable
     async def clear(self):
         if self._utility is None:
@@ -140,18 +163,20 @@ class BasicCache(BaseCache):
             logger.warning("Error closing connection", exc_info=True)
 
     async def fill_cache(self):
+        entries = []
         for obj, pickled in self._stored_objects:
             val = {"state": pickled, "zoid": obj.__uuid__, "tid": obj.__serial__, "id": obj.__name__}
             if obj.__of__:
-                await self.set(
-                    val, [dict(oid=obj.__of__, id=obj.__name__, variant="annotation"), dict(oid=obj.__uuid__)]
-                )
+                keyset = [dict(oid=obj.__of__, id=obj.__name__, variant="annotation"), dict(oid=obj.__uuid__)]
             else:
                 keyset = [dict(oid=obj.__uuid__)]
                 if obj.__parent__:
                     val["parent_id"] = obj.__parent__.__uuid__
                     keyset.append(dict(container=obj.__parent__, id=obj.__name__))
-                await self.set(val, keyset)
+            entries.append((val, keyset))
+        if len(entries) > 0:
+            # all the objects of the transaction are stored with one network request
+            await self.set_many(entries)
 
     @profilable
     async def synchronize(self, keys_to_publish):
@@ -163,6 +188,7 @@ class BasicCache(BaseCache):
         if app_settings.get("cache", {}).get("updates_channel", None) is None:  # pragma: no cover
             raise NoChannelConfigured()
         push = {}
+        framed = app_settings["cache"].get("wire_format", "pickle") == "framed"
         if self.push_enabled:
             for obj, pickled in self._stored_objects:
                 val = {"state": pickled, "zoid": obj.__uuid__, "tid": obj.__serial__, "id": obj.__name__}
@@ -173,12 +199,8 @@ class BasicCache(BaseCache):
                         ob_key = self.get_key(container=obj.__parent__, id=obj.__name__)
                     else:
                         ob_key = self.get_key(oid=obj.__uuid__)
-                push[ob_key] = val
+                # framed records travel as bytes so the state is not pickled again
+                push[ob_key] = serialize.dumps(val) if framed else val
 
         self._stored_objects.clear()
-        self._utility.ignore_tid(self._transaction._tid)
-        await self._utility._subscriber.publish(
-            app_settings["cache"]["updates_channel"],
-            self._transaction._tid,
-            {"tid": self._transaction._tid, "keys": keys_to_publish, "push": push},
-        )
+        await self._utility.queue_invalidation(self._transaction._tid, keys_to_publish, push)
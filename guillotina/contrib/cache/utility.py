@@ -3,23 +3,50 @@ import logging
 import pickle
 import uuid
 from sys import getsizeof
-from typing import List, Optional
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
 
 import asyncpg
 
 from guillotina import app_settings
 from guillotina.component import query_utility
 from guillotina.contrib.cache import CACHE_PREFIX, memcache, serialize
+from guillotina.contrib.cache.batcher import InvalidationBatcher
 from guillotina.contrib.cache.lru import LRU
+from guillotina.db.cache.singleflight import SingleFlight, storage_flights
 from guillotina.exceptions import NoPubSubUtility
 from guillotina.interfaces import IPubSubUtility
 from guillotina.profile import profilable
+from guillotina.security import decision_cache
 from guillotina.utils import resolve_dotted_name
 
 
 logger = logging.getLogger("guillotina.contrib.cache")
 _default_size = 1024
-_basic_types = (bytes, str, int, float)
+_basic_types = (bytes, str, int, float, bool, type(None))
+# approximate memory used by the lru node and dict slot of every key
+_entry_overhead = 160
+
+
+# called with the oids of every invalidation, for process caches of other objects
+_invalidation_listeners: List[Callable[[Set[str]], None]] = []
+
+
+def add_invalidation_listener(listener: Callable[[Set[str]], None]) -> None:
+    if listener not in _invalidation_listeners:
+        _invalidation_listeners.append(listener)
+
+
+def get_size(value) -> int:
+    """
+    Memory used by a cached value, including the values it holds
+    """
+    if isinstance(value, _basic_types):
+        return getsizeof(value)
+    if isinstance(value, (dict, asyncpg.Record)):
+        return getsizeof(value) + sum(getsizeof(k) + get_size(v) for k, v in value.items())
+    if isinstance(value, (list, tuple, set, frozenset)):
+        return getsizeof(value) + sum(get_size(v) for v in value)
+    return max(getsizeof(value), _default_size)
 
 
 class CacheUtility:
@@ -34,6 +61,8 @@ class CacheUtility:
         self._subscriber = None
         self._obj_driver = None  # driver for obj cache
         self._uid = uuid.uuid4().hex
+        self._network_flights = SingleFlight()
+        self._batcher: Optional[InvalidationBatcher] = None
         self.initialized = False
 
     @profilable
@@ -51,10 +80,25 @@ class CacheUtility:
         elif settings["updates_channel"] not in (None, ""):
             await self._subscriber.initialized()
             await self._subscriber.subscribe(settings["updates_channel"], self._uid, self.invalidate)
+            self._batcher = InvalidationBatcher(
+                self,
+                window=settings.get("invalidation_batch_window", 5),
+                max_keys=settings.get("invalidation_batch_size", 1000),
+            )
         self.initialized = True
 
+    @property
+    def updates_channel(self):
+        return app_settings.get("cache", {}).get("updates_channel")
+
     async def finalize(self, app):
         settings = app_settings["cache"]
+        if self._batcher is not None:
+            try:
+                await self._batcher.close()
+            except Exception:
+                logger.warning("Error publishing cache invalidations", exc_info=True)
+            self._batcher = None
         if self._subscriber is not None:
             try:
                 await self._subscriber.unsubscribe(settings["updates_channel"], self._uid)
@@ -72,49 +116,92 @@ class CacheUtility:
                 logger.debug("Retrieved {} from memory cache".format(key))
                 return self._memory_cache[key]
             if self._obj_driver is not None:
-                val = await self._obj_driver.get(CACHE_PREFIX + key)
-                if val is not None:
-                    logger.debug("Retrieved {} from redis cache".format(key))
-                    val = serialize.loads(val)
-                    size = self.get_size(val)
-                    self._memory_cache.set(key, val, size)
-                    return val
+                # concurrent misses of the same key wait for a single network get
+                return await self._network_flights.run("network", key, lambda: self._get_network(key))
         except Exception:
             logger.warning("Error getting cache value", exc_info=True)
 
+    async def _get_network(self, key):
+        val = await self._obj_driver.get(CACHE_PREFIX + key)
+        if val is not None:
+            logger.debug("Retrieved {} from redis cache".format(key))
+            val = serialize.loads(val)
+            size = self.get_size(val)
+            self._memory_cache.set(key, val, self.get_entry_size(key, size))
+        return val
+
     def get_size(self, value):
-        if isinstance(value, (dict, asyncpg.Record)):
-            if "state" in value:
-                return len(value["state"])
-        if isinstance(value, list) and len(value) > 0:
-            # if its a list, guesss from first gey the length, and
-            # estimate it from the total lenghts on the list..
-            return getsizeof(value[0]) * len(value)
-        if isinstance(value, _basic_types):
-            return getsizeof(value)
-        return _default_size
+        return get_size(value)
+
+    def get_entry_size(self, key, size):
+        return size + getsizeof(key) + _entry_overhead
+
+    async def get_many(self, keys: List[str]) -> List[Any]:
+        """
+        Get the values of several keys, in the same order, with
+        one network request for the keys not in memory
+        """
+        results: List[Any] = [None] * len(keys)
+        network = []
+        for idx, key in enumerate(keys):
+            if key in self._memory_cache:
+                results[idx] = self._memory_cache[key]
+            else:
+                network.append(idx)
+        if len(network) > 0 and self._obj_driver is not None:
+            try:
+                values = await self._obj_driver.get_many([CACHE_PREFIX + keys[idx] for idx in network])
+                for idx, val in zip(network, values):
+                    if val is not None:
+                        val = serialize.loads(val)
+                        self._memory_cache.set(
+                            keys[idx], val, self.get_entry_size(keys[idx], self.get_size(val))
+                        )
+                        results[idx] = val
+            except Exception:
+                logger.warning("Error getting cache values", exc_info=True)
+        return results
 
     # Set a object from cache
     async def set(self, keys, value, ttl=None):
         if not isinstance(keys, list):
             keys = [keys]
-        size = self.get_size(value)
-        for key in keys:
+        await self.set_many([(keys, value)], ttl=ttl)
+
+    @profilable
+    async def set_many(self, entries: List[Tuple[List[str], Any]], ttl=None):
+        """
+        Set several values, each one under a list of keys, with
+        one network request for all of them
+        """
+        if ttl is None:
+            ttl = self._settings.get("ttl", 3600)
+        stored: Dict[str, bytes] = {}
+        for keys, value in entries:
             try:
-                self._memory_cache.set(key, value, size)
-                if ttl is None:
-                    ttl = self._settings.get("ttl", 3600)
+                size = self.get_size(value)
+                for key in keys:
+                    # every key is charged the full value so the lru memory is never
+                    # below what it really holds, even when keys are evicted separately
+                    self._memory_cache.set(key, value, self.get_entry_size(key, size))
                 if self._obj_driver is not None:
                     stored_value = serialize.dumps(value)
-                    await self._obj_driver.set(CACHE_PREFIX + key, stored_value, expire=ttl)
-                logger.debug("set {} in cache".format(key))
+                    for key in keys:
+                        stored[CACHE_PREFIX + key] = stored_value
+                logger.debug("set {} in cache".format(keys))
             except Exception:
                 logger.warning("Error setting cache value", exc_info=True)
-            size = 0  # additional keys to set have 0 size in cache
+        if len(stored) > 0:
+            try:
+                await self._obj_driver.set_many(stored, expire=ttl)
+            except Exception:
+                logger.warning("Error setting cache values", exc_info=True)
 
     @profilable
     # Delete a set of objects from cache
     async def delete_all(self, keys):
+        self._forget_flights(keys)
+        self._invalidate_oids(keys)
         delete_keys = []
         for key in keys:
             delete_keys.append(CACHE_PREFIX + key)
@@ -160,6 +247,8 @@ class CacheUtility:
             self._ignored_tids.remove(data["tid"])
             return
 
+        self._forget_flights(data["keys"])
+        self._invalidate_oids(data["keys"])
         for key in data["keys"]:
             if key in self._memory_cache:
                 del self._memory_cache[key]
@@ -167,16 +256,48 @@ class CacheUtility:
         push = data.get("push", {})
         if isinstance(push, dict):
             for cache_key, ob in push.items():
-                self._memory_cache.set(cache_key, ob, self.get_size(ob))
+                if isinstance(ob, bytes):
+                    ob = serialize.loads(ob)
+                self._memory_cache.set(cache_key, ob, self.get_entry_size(cache_key, self.get_size(ob)))
 
         # clean up possible memory leak
         while len(self._ignored_tids) > 100:
             self._ignored_tids.pop(0)
 
+    def _forget_flights(self, keys):
+        # loads started before the invalidation could return stale values
+        storage_flights.forget(keys)
+        self._network_flights.forget(keys)
+
+    def _invalidate_oids(self, keys):
+        oids = set()
+        for key in keys:
+            oids.update(key.split("/", 1)[0].split("-")[1:])
+        # decisions are keyed by serial, this only releases the ones of changed objects
+        decision_cache.invalidate(oids)
+        for listener in _invalidation_listeners:
+            try:
+                listener(oids)
+            except Exception:
+                logger.warning("Error invalidating oids", exc_info=True)
+
     def ignore_tid(self, tid):
         # so we don't invalidate twice...
         self._ignored_tids.append(tid)
 
+    async def queue_invalidation(self, tid, keys, push=None):
+        """
+        Publish the invalidation of a commit, coalesced with the ones
+        of other commits of the process in a short window
+        """
+        if self._batcher is not None:
+            await self._batcher.add(tid, keys, push)
+        elif self._subscriber is not None:
+            self.ignore_tid(tid)
+            await self._subscriber.publish(
+                self.updates_channel, tid, {"tid": tid, "keys": keys, "push": push or {}}
+            )
+
     async def send_invalidation(self, keys_to_publish, push=None):
         if self._subscriber:
             await self._subscriber.publish(
@@ -186,7 +307,29 @@ class CacheUtility:
             )
 
     async def get_stats(self):
-        result = {"in-memory": {"size": len(self._memory_cache), "stats": self._memory_cache.get_stats()}}
+        hits, misses, evictions = self._memory_cache.get_stats()
+        result = {
+            "in-memory": {
+                "size": len(self._memory_cache),
+                "stats": (hits, misses, evictions),
+                "hits": hits,
+                "misses": misses,
+                "evictions": evictions,
+                "rejected": self._memory_cache.get_rejected(),
+                "memory": self._memory_cache.get_memory(),
+                "memory_budget": self._memory_cache.get_size(),
+            },
+            "coalesced": {"storage": storage_flights.waits, "network": self._network_flights.waits},
+        }
+        if self._batcher is not None:
+            result["invalidations"] = {
+                "commits": self._batcher.commits,
+                "batches": self._batcher.batches,
+                "pending": len(self._batcher),
+            }
         if self._obj_driver is not None:
-            result["network"]: self.driver.info()
+            try:
+                result["network"] = await self._obj_driver.info()
+            except Exception:
+                logger.warning("Error getting network cache info", exc_info=True)
         return result
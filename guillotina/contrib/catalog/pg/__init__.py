@@ -6,12 +6,16 @@ from guillotina import configure
 logger = logging.getLogger("guillotina")
 
 app_settings = {
+    # how search totals are computed by default: exact, estimate or none
+    "catalog_total": "exact",
+    # planner estimates below this number fall back to an exact total
+    "catalog_estimate_threshold": 10000,
     "load_utilities": {
         "catalog": {
             "provides": "guillotina.interfaces.ICatalogUtility",
             "factory": "guillotina.contrib.catalog.pg.utility.PGSearchUtility",
         }
-    }
+    },
 }
 
 
@@ -3,7 +3,7 @@ import urllib
 
 from dateutil.parser import parse
 
-from guillotina import configure
+from guillotina import app_settings, configure
 from guillotina.catalog.parser import BaseParser, to_list
 from guillotina.catalog.types import BasicParsedQueryInfo
 from guillotina.catalog.utils import get_index_definition
@@ -14,6 +14,7 @@ from guillotina.interfaces.catalog import ICatalogUtility
 
 
 _type_mapping = {"int": int, "float": float}
+TOTAL_MODES = ("exact", "estimate", "none")
 
 
 class ParsedQueryInfo(BasicParsedQueryInfo):
@@ -22,6 +23,7 @@ class ParsedQueryInfo(BasicParsedQueryInfo):
     wheres_arguments: typing.List[typing.Any]
     selects: typing.List[str]
     selects_arguments: typing.List[typing.Any]
+    total: str
 
 
 @configure.adapter(for_=(ICatalogUtility, IResource), provides=ISearchParser, name="default")
@@ -140,6 +142,9 @@ class Parser(BaseParser):
         return pg_index.where(result, operator), [result], pg_index.select(), field
 
     def __call__(self, params: typing.Dict) -> ParsedQueryInfo:
+        total = params.pop("_total", None) or app_settings.get("catalog_total", "exact")
+        if total not in TOTAL_MODES:
+            total = "exact"
         query_info = super().__call__(params)
         wheres: typing.List[str] = []
         arguments: typing.List[str] = []
@@ -169,5 +174,6 @@ class Parser(BaseParser):
                 wheres_arguments=arguments,
                 selects=selects,
                 selects_arguments=selects_arguments,
+                total=total,
             ),
         )
@@ -6,6 +6,7 @@ import asyncpg.exceptions
 import orjson
 from zope.interface import implementer
 
+from guillotina import app_settings
 from guillotina.api.content import DefaultGET
 from guillotina.auth.users import AnonymousUser
 from guillotina.catalog.catalog import DefaultSearchUtility
@@ -172,6 +173,7 @@ class PGSearchUtility(DefaultSearchUtility):
         select_fields: typing.List[str],
         distinct: typing.Optional[bool] = False,
         unrestricted: bool = False,
+        full_count: bool = False,
     ) -> typing.Tuple[str, typing.List[typing.Any]]:
         if query["sort_on"] is None:
             # always need a sort otherwise paging never works
@@ -187,6 +189,10 @@ class PGSearchUtility(DefaultSearchUtility):
             sql_arguments.append(query["selects_arguments"][idx])
             arg_index += 1
 
+        if full_count:
+            # total of the filtered set computed in the same statement as the page
+            select_fields.append("count(*) over() as full_count")
+
         sql_arguments, sql_wheres = self.parse_sql_query_to_arguments_and_where_clauses(
             arg_index, query, sql_arguments
         )
@@ -221,9 +227,10 @@ class PGSearchUtility(DefaultSearchUtility):
         context,
         query: ParsedQueryInfo,
         unrestricted: bool = False,
+        select_fields: typing.Optional[typing.List[str]] = None,
     ) -> typing.Tuple[str, typing.List[typing.Any]]:
 
-        select_fields = ["count(*)"]
+        select_fields = select_fields or ["count(*)"]
         sql_arguments, sql_wheres = self.parse_sql_query_to_arguments_and_where_clauses(1, query, [])
         sql_wheres.extend(self.get_default_where_clauses(context, unrestricted=unrestricted))
 
@@ -237,6 +244,76 @@ class PGSearchUtility(DefaultSearchUtility):
         )
         return sql, sql_arguments
 
+    def build_estimate_query(
+        self,
+        context,
+        query: ParsedQueryInfo,
+        unrestricted: bool = False,
+    ) -> typing.Tuple[str, typing.List[typing.Any]]:
+        sql, sql_arguments = self.build_count_query(
+            context, query, unrestricted=unrestricted, select_fields=["zoid"]
+        )
+        return "EXPLAIN (FORMAT JSON) " + sql, sql_arguments
+
+    async def get_estimated_total(
+        self, context: IBaseObject, query: ParsedQueryInfo, unrestricted: bool = False
+    ) -> int:
+        """
+        Number of rows postgresql planner statistics expect the query to match
+        """
+        sql, arguments = self.build_estimate_query(context, query, unrestricted=unrestricted)
+        txn = get_transaction()
+        if txn is None:
+            raise TransactionNotFound()
+        conn = await txn.get_connection()
+        logger.debug(f"Running estimate:\n{sql}\n{arguments}")
+        async with txn.lock:
+            plan = await conn.fetchval(sql, *arguments)
+        if isinstance(plan, str):
+            plan = json.loads(plan)
+        return int(plan[0]["Plan"]["Plan Rows"])
+
+    async def get_total(
+        self,
+        context: IBaseObject,
+        query: ParsedQueryInfo,
+        records: typing.List[typing.Any],
+        unrestricted: bool = False,
+    ) -> int:
+        total = len(records)
+        if total < query["size"] and (total > 0 or query["_from"] == 0):
+            # last page, no need to count anything
+            return query["_from"] + total
+        if total > 0:
+            return records[0]["full_count"]
+        # page past the end of the results, window count has nothing to report
+        sql, arguments = self.build_count_query(context, query, unrestricted=unrestricted)
+        txn = get_transaction()
+        if txn is None:
+            raise TransactionNotFound()
+        conn = await txn.get_connection()
+        logger.debug(f"Running count:\n{sql}\n{arguments}")
+        async with txn.lock:
+            records = await conn.fetch(sql, *arguments)
+        return records[0]["count"]
+
+    async def _prepare_total(
+        self, context: IBaseObject, query: ParsedQueryInfo, unrestricted: bool = False
+    ) -> typing.Tuple[bool, typing.Optional[int]]:
+        """
+        Decide how the total is computed for the query.
+
+        Returns whether the page query needs to include the window count and
+        the estimated total, when the estimate is large enough to be used.
+        """
+        if query.get("total") == "none":
+            return False, None
+        if query.get("total") == "estimate":
+            estimate = await self.get_estimated_total(context, query, unrestricted=unrestricted)
+            if estimate >= app_settings.get("catalog_estimate_threshold", 10000):
+                return False, estimate
+        return True, None
+
     def load_meatdata(self, query: ParsedQueryInfo, data: typing.Dict[str, typing.Any]):
         metadata: typing.Dict[str, typing.Any] = {}
         if query["metadata"] is None:
@@ -255,7 +332,8 @@ class PGSearchUtility(DefaultSearchUtility):
         select_fields = [
             "json->'" + sqlq(field) + "' as " + sqlq(field) for field in query["metadata"] or []
         ]  # noqa
-        sql, arguments = self.build_query(context, query, select_fields, True)
+        full_count, estimate = await self._prepare_total(context, query)
+        sql, arguments = self.build_query(context, query, select_fields, True, full_count=full_count)
 
         txn = get_transaction()
         if txn is None:
@@ -269,14 +347,10 @@ class PGSearchUtility(DefaultSearchUtility):
         for record in records:
             results.append([json.loads(record[field]) for field in query["metadata"] or []])
 
-        total = len(results)
-        if total >= query["size"] or query["_from"] != 0:
-            sql, arguments = self.build_count_query(context, query)
-            logger.debug(f"Running search:\n{sql}\n{arguments}")
-            async with txn.lock:
-                records = await conn.fetch(sql, *arguments)
-            total = records[0]["count"]
-        return {"items": results, "items_total": total}
+        total = estimate
+        if full_count:
+            total = await self.get_total(context, query, records)
+        return self._build_results(results, total)
 
     async def search_raw(self, context: IBaseObject, query: typing.Any):
         """
@@ -310,8 +384,17 @@ class PGSearchUtility(DefaultSearchUtility):
         parsed_query = parse_query(context, query, self)
         return await self._query(context, parsed_query, True)  # type: ignore
 
+    def _build_results(self, results: typing.List[typing.Any], total: typing.Optional[int]):
+        if total is None:
+            # totals skipped
+            return {"items": results}
+        return {"items": results, "items_total": total}
+
     async def _query(self, context: IResource, query: ParsedQueryInfo, unrestricted: bool = False):
-        sql, arguments = self.build_query(context, query, ["id", "zoid", "json"], unrestricted=unrestricted)
+        full_count, estimate = await self._prepare_total(context, query, unrestricted=unrestricted)
+        sql, arguments = self.build_query(
+            context, query, ["id", "zoid", "json"], unrestricted=unrestricted, full_count=full_count
+        )
         txn = get_current_transaction()
         conn = await txn.get_connection()
         results = []
@@ -331,11 +414,17 @@ class PGSearchUtility(DefaultSearchUtility):
 
         async with txn.lock:
             records = await conn.fetch(sql, *arguments)
+        objects = {}
+        if fullobjects and request is not None and txn is not None:
+            # load all the objects of the page at once
+            objects = {ob.__uuid__: ob for ob in await txn.get_many([record["zoid"] for record in records])}
         for record in records:
             data = json.loads(record["json"])
             if fullobjects and request is not None and txn is not None:
-                # Get Object
-                obj = await txn.get(data["uuid"])
+                obj = objects.get(record["zoid"])
+                if obj is None:
+                    # removed since it was found
+                    continue
                 # Serialize object
                 view = DefaultGET(obj, request)
                 result = await view()
@@ -346,15 +435,10 @@ class PGSearchUtility(DefaultSearchUtility):
                 result["@id"] = data["@absolute_url"] = context_url + data["path"]
             results.append(result)
 
-        # also do count...
-        total = len(results)
-        if total >= query["size"] or query["_from"] != 0:
-            sql, arguments = self.build_count_query(context, query, unrestricted=unrestricted)
-            logger.debug(f"Running search:\n{sql}\n{arguments}")
-            async with txn.lock:
-                records = await conn.fetch(sql, *arguments)
-            total = records[0]["count"]
-        return {"items": results, "items_total": total}
+        total = estimate
+        if full_count:
+            total = await self.get_total(context, query, records, unrestricted=unrestricted)
+        return self._build_results(results, total)
 
     async def index(self, container, datas):
         """
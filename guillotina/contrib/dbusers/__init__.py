@@ -14,10 +14,17 @@ app_settings = {
         }
     },
     "min_username_length": 3,
+    # users resolved with their groups kept per process, needs guillotina.contrib.cache
+    "principal_cache_size": 1000,
 }
 
 
 def includeme(root, settings):
+    from guillotina.contrib.cache.utility import add_invalidation_listener
+    from guillotina.contrib.dbusers.cache import principal_cache
+
+    add_invalidation_listener(principal_cache.invalidate)
+    principal_cache.clear()
     configure.scan("guillotina.contrib.dbusers.content.users")
     configure.scan("guillotina.contrib.dbusers.content.groups")
     configure.scan("guillotina.contrib.dbusers.install")
@@ -0,0 +1,127 @@
+from contextlib import contextmanager
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from lru import LRU
+
+from guillotina import app_settings
+
+
+PrincipalKey = Tuple[str, str, str]
+
+
+class PrincipalCache:
+    """
+    Process wide cache of users resolved with their groups.
+
+    Users are keyed by database, container uuid and user id. Entries are
+    snapshots of the stored records, every request builds its own objects
+    from them. An entry is dropped when the cache invalidation channel
+    reports a change on the user or any of its groups, and it is not stored
+    when any of them is invalidated while the user is loaded.
+    """
+
+    def __init__(self, size=None):
+        self._size = size
+        self._cache = None
+        # keys of the entries that depend on every oid
+        self._by_oid: Dict[str, Set[PrincipalKey]] = {}
+        # number of invalidations, and the number of the last invalidation
+        # of every oid while users are loaded
+        self._counter = 0
+        self._loading = 0
+        self._invalidated: Dict[str, int] = {}
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        if self._size is not None:
+            return self._size
+        return app_settings.get("principal_cache_size", 0)
+
+    def _get_cache(self):
+        if self._cache is None:
+            size = self.size
+            if not size:
+                return None
+            self._cache = LRU(size, callback=self._evicted)
+        return self._cache
+
+    def _evicted(self, key, entry):
+        for oid in entry[1]:
+            keys = self._by_oid.get(oid)
+            if keys is not None:
+                keys.discard(key)
+                if len(keys) == 0:
+                    del self._by_oid[oid]
+
+    def get(self, key: PrincipalKey):
+        cache = self._get_cache()
+        if cache is None:
+            return None
+        entry = cache.get(key)
+        if entry is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[0]
+
+    @contextmanager
+    def loading(self):
+        """
+        Yields the counter to store the loaded user with
+        """
+        self._loading += 1
+        try:
+            yield self._counter
+        finally:
+            self._loading -= 1
+            if self._loading == 0:
+                self._invalidated = {}
+
+    def set(self, key: PrincipalKey, snapshot, oids: Iterable[str], counter: Optional[int] = None):
+        cache = self._get_cache()
+        if cache is None:
+            return
+        oids = frozenset(oids)
+        if counter is not None and any(self._invalidated.get(oid, 0) > counter for oid in oids):
+            # changed while it was loaded
+            return
+        if key in cache:
+            self._evicted(key, cache[key])
+        cache[key] = (snapshot, oids)
+        for oid in oids:
+            self._by_oid.setdefault(oid, set()).add(key)
+
+    def invalidate(self, oids: Iterable[str]):
+        oids = list(oids)
+        self._counter += 1
+        if self._loading > 0:
+            for oid in oids:
+                self._invalidated[oid] = self._counter
+        if not self._cache:
+            return
+        for oid in oids:
+            for key in list(self._by_oid.get(oid, ())):
+                if key in self._cache:
+                    # removing from the lru does not call the eviction callback
+                    self._evicted(key, self._cache[key])
+                    del self._cache[key]
+
+    def clear(self):
+        self._cache = None
+        self._by_oid = {}
+
+    def __len__(self):
+        return len(self._cache) if self._cache else 0
+
+
+principal_cache = PrincipalCache()
+
+
+def get_principal_key(container, user_id: str) -> Optional[PrincipalKey]:
+    uuid = getattr(container, "__uuid__", None)
+    if uuid is None:
+        return None
+    tm = getattr(container.__txn__, "manager", None)
+    return (getattr(tm, "db_id", "root"), uuid, user_id)
@@ -1,16 +1,64 @@
+import pickle
 import typing
 
+from guillotina import app_settings
 from guillotina.component import query_utility
 from guillotina.contrib.catalog.pg.utility import PGSearchUtility
+from guillotina.db.orm.interfaces import IBaseObject
 from guillotina.exceptions import ContainerNotFound, TransactionNotFound
-from guillotina.interfaces import IPrincipal
+from guillotina.interfaces import ICacheUtility, IPrincipal
 from guillotina.interfaces.catalog import ICatalogUtility
 from guillotina.transactions import get_transaction
 from guillotina.utils import get_current_container, navigate_to
 
+from .cache import get_principal_key, principal_cache
 from .services.utils import NoCatalogException
 
 
+def _get_record(ob: IBaseObject) -> typing.Dict[str, typing.Any]:
+    protocol = app_settings.get("pickle_protocol", pickle.HIGHEST_PROTOCOL)
+    return {
+        "state": pickle.dumps(ob, protocol=protocol),
+        "zoid": ob.__uuid__,
+        "tid": ob.__serial__,
+        "id": ob.__name__,
+    }
+
+
+def _load_record(record: typing.Dict[str, typing.Any], parent: IBaseObject, txn) -> IBaseObject:
+    ob = app_settings["object_reader"](record)
+    ob.__parent__ = parent
+    ob.__txn__ = txn
+    return ob
+
+
+def _get_snapshot(user) -> typing.Dict[str, typing.Any]:
+    # records of the user and its groups, objects are not shared between requests
+    parents: typing.Dict[str, typing.Any] = {}
+    groups = {}
+    for ident, group in user._groups_cache.items():
+        parent = group.__parent__
+        if parent.__uuid__ not in parents:
+            parents[parent.__uuid__] = _get_record(parent)
+        groups[ident] = (parent.__uuid__, _get_record(group))
+    return {
+        "users": _get_record(user.__parent__),
+        "user": _get_record(user),
+        "parents": parents,
+        "groups": groups,
+    }
+
+
+def _load_snapshot(container, snapshot: typing.Dict[str, typing.Any]):
+    txn = get_transaction()
+    users = _load_record(snapshot["users"], container, txn)
+    user = _load_record(snapshot["user"], users, txn)
+    parents = {uuid: _load_record(record, container, txn) for uuid, record in snapshot["parents"].items()}
+    for ident, (parent_uuid, record) in snapshot["groups"].items():
+        user._groups_cache[ident] = _load_record(record, parents[parent_uuid], txn)
+    return user
+
+
 class DBUserIdentifier:
     async def get_user(self, token: typing.Dict) -> typing.Optional[IPrincipal]:
         """Returns the current user associated with the token and None if user
@@ -19,8 +67,7 @@ class DBUserIdentifier:
         """
         try:
             container = get_current_container()
-            users = await container.async_get("users")
-        except (AttributeError, KeyError, ContainerNotFound):
+        except ContainerNotFound:
             return None
 
         user_id = token.get("id", "")
@@ -28,23 +75,48 @@ class DBUserIdentifier:
             # No user id in the token
             return None
 
-        if not await users.async_contains(user_id):
-            # User id does not correspond to any existing user folder
-            return None
-
-        user = await users.async_get(user_id)
-        if user.disabled:
-            # User is disabled
-            return None
+        # users are cached while the cache utility invalidates their changes
+        key = None
+        if query_utility(ICacheUtility) is not None:
+            key = get_principal_key(container, user_id)
+        if key is not None:
+            snapshot = principal_cache.get(key)
+            if snapshot is not None:
+                return _load_snapshot(container, snapshot)
 
-        # Load groups into cache
-        for ident in user.groups:
+        with principal_cache.loading() as counter:
             try:
-                user._groups_cache[ident] = await navigate_to(container, f"groups/{ident}")
-            except KeyError:
-                continue
-
-        return user
+                users = await container.async_get("users")
+            except (AttributeError, KeyError, ContainerNotFound):
+                return None
+
+            if not await users.async_contains(user_id):
+                # User id does not correspond to any existing user folder
+                return None
+
+            user = await users.async_get(user_id)
+            if user.disabled:
+                # User is disabled
+                return None
+
+            # Load groups into cache
+            oids = [user.__uuid__]
+            for ident in user.groups:
+                try:
+                    group = await navigate_to(container, f"groups/{ident}")
+                except KeyError:
+                    # adding the group changes the groups folder
+                    groups = await container.async_get("groups")
+                    if groups is not None:
+                        oids.append(groups.__uuid__)
+                    continue
+                user._groups_cache[ident] = group
+                oids.append(group.__uuid__)
+
+            if key is not None and not getattr(get_transaction(), "reads_from_replica", False):
+                # replicas can lag behind the invalidations
+                principal_cache.set(key, _get_snapshot(user), oids, counter)
+            return user
 
 
 class EmailDBUserIdentifier:
@@ -1,7 +1,16 @@
 from guillotina import configure
 
 
+app_settings = {
+    "image": {
+        "scale_workers": 2,  # processes scaling images, 0 to use the application executor
+        "scale_cache_size": 52428800,  # memory for generated scales by image md5, 0 to disable
+    }
+}
+
+
 def includeme(root, settings):
     configure.scan("guillotina.contrib.image.install")
     configure.scan("guillotina.contrib.image.api")
     configure.scan("guillotina.contrib.image.behaviors")
+    configure.scan("guillotina.contrib.image.subscribers")
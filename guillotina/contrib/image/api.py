@@ -7,14 +7,14 @@ from guillotina.api.service import TraversableFieldService
 from guillotina.component import get_multi_adapter
 from guillotina.contrib.image.interfaces import IImagingSettings
 from guillotina.contrib.image.preview import CloudPreviewImageFileField
-from guillotina.contrib.image.scale import scaleImage
+from guillotina.contrib.image.utils import get_scale_cache, get_scale_cache_key, read_image, scale_image
 from guillotina.event import notify
 from guillotina.events import ObjectModifiedEvent
 from guillotina.interfaces import IFileManager
 from guillotina.interfaces.content import IResource
 from guillotina.response import HTTPNoContent, HTTPNotFound
 from guillotina.schema.interfaces import IOrderedDict
-from guillotina.utils import get_registry, run_async
+from guillotina.utils import get_registry
 
 
 BUFFER = 262144
@@ -61,22 +61,23 @@ class UpdateImageScale(TraversableFieldService):
         if file is None:
             raise HTTPNotFound(content={"message": "File or custom filename required to download"})
 
-        adapter = get_multi_adapter((self.context, self.request, self.field), IFileManager)
-
-        data = b""
-        async for chunk in adapter.iter_data():
-            data += chunk
-
         width, _, height = allowed_sizes[scale_name].partition(":")
+        quality = settings["quality"]
 
-        result, format_, size = await run_async(
-            scaleImage,
-            data,
-            int(width),
-            int(height),
-            quality=settings["quality"],
-            direction="thumbnail",
-        )
+        scale_cache = get_scale_cache()
+        cache_key = get_scale_cache_key(file, scale_name, int(width), int(height), quality)
+        cached = None
+        if scale_cache is not None and cache_key is not None:
+            cached = scale_cache.get(cache_key)
+
+        if cached is not None:
+            result, format_ = cached
+        else:
+            adapter = get_multi_adapter((self.context, self.request, self.field), IFileManager)
+            data = await read_image(adapter.iter_data())
+            result, format_, size = await scale_image(data, int(width), int(height), quality)
+            if scale_cache is not None and cache_key is not None:
+                scale_cache.set(cache_key, (result, format_), len(result))
 
         async def generator(data):
             buf = BytesIO(data)
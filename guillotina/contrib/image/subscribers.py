@@ -0,0 +1,9 @@
+from guillotina import configure
+from guillotina.contrib.image.utils import shutdown_executor
+from guillotina.interfaces import IApplicationCleanupEvent
+
+
+@configure.subscriber(for_=IApplicationCleanupEvent)
+async def close_image_executor(event):
+    # worker processes must not outlive the application
+    shutdown_executor()
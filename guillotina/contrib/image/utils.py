@@ -0,0 +1,79 @@
+import asyncio
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from io import BytesIO
+from typing import AsyncIterator, Optional, Tuple
+
+from guillotina import app_settings
+from guillotina.component import get_utility
+from guillotina.contrib.cache.lru import LRU
+from guillotina.contrib.image.scale import scaleImage
+from guillotina.interfaces import IApplication
+from guillotina.utils import run_async
+
+
+_scale_cache = None
+
+
+def get_scale_cache() -> Optional[LRU]:
+    """
+    Process wide cache of generated scales, bounded by memory
+    """
+    global _scale_cache
+    if _scale_cache is None:
+        size = app_settings.get("image", {}).get("scale_cache_size", 0)
+        if not size:
+            return None
+        _scale_cache = LRU(size)
+    return _scale_cache
+
+
+def get_scale_cache_key(file, scale_name: str, width: int, height: int, quality: int) -> Optional[str]:
+    # md5 is provided by the client on upload, the stored data must be part of the key
+    blob = getattr(file, "_blob", None)
+    data_id = getattr(blob, "bid", None) or getattr(file, "uri", None)
+    if not data_id:
+        return None
+    return f"{data_id}-{getattr(file, 'md5', None) or ''}-{scale_name}-{width}x{height}-{quality}"
+
+
+def get_executor() -> Optional[ProcessPoolExecutor]:
+    workers = app_settings.get("image", {}).get("scale_workers", 0)
+    if not workers:
+        return None
+    root = get_utility(IApplication, name="root")
+    if not hasattr(root, "_image_executor"):
+        # workers do not inherit the state of the event loop process
+        root._image_executor = ProcessPoolExecutor(
+            max_workers=workers, mp_context=multiprocessing.get_context("spawn")
+        )
+    return root._image_executor
+
+
+def shutdown_executor() -> None:
+    root = get_utility(IApplication, name="root")
+    executor = getattr(root, "_image_executor", None)
+    if executor is not None:
+        del root._image_executor
+        executor.shutdown(wait=True)
+
+
+async def read_image(iterator: AsyncIterator[bytes]) -> bytes:
+    buffer = BytesIO()
+    async for chunk in iterator:
+        buffer.write(chunk)
+    return buffer.getvalue()
+
+
+async def scale_image(data: bytes, width: int, height: int, quality: int) -> Tuple[bytes, str, tuple]:
+    """
+    Scale the image in the image process pool, or the application
+    executor when ``scale_workers`` is ``0``
+    """
+    func = partial(scaleImage, data, width, height, quality=quality, direction="thumbnail")
+    executor = get_executor()
+    if executor is None:
+        return await run_async(func)  # type: ignore
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(executor, func)
@@ -0,0 +1,24 @@
+app_settings = {
+    "jobs": {
+        "database": None,  # id of the postgresql database with the jobs table, first one by default
+        "table_name": "guillotina_jobs",
+        "channel": "guillotina_jobs",  # LISTEN/NOTIFY channel to wake up workers
+        "workers": 2,  # concurrent jobs run by every process
+        "max_attempts": 5,
+        "retry_delay": 1,  # seconds before the first retry, doubled on every attempt
+        "max_retry_delay": 300,
+        "lease_timeout": 600,  # seconds before a running job of a dead worker is run again
+        "poll_interval": 5,  # seconds between checks for jobs when no notification arrives
+    },
+    "load_utilities": {
+        "guillotina_jobs": {
+            "provides": "guillotina.interfaces.IDurableQueueUtility",
+            "factory": "guillotina.contrib.jobs.utility.DurableQueueUtility",
+            "settings": {},
+        }
+    },
+}
+
+
+def includeme(root, settings):
+    pass
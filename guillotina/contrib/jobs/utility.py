@@ -0,0 +1,314 @@
+import asyncio
+import logging
+import traceback
+import types
+from typing import Callable, Dict, List, Optional
+
+import asyncpg
+import orjson
+
+from guillotina import app_settings, task_vars
+from guillotina.component import get_utility
+from guillotina.db.interfaces import IPostgresStorage
+from guillotina.exceptions import ContainerNotFound
+from guillotina.interfaces import IApplication, IDatabase
+from guillotina.transactions import transaction
+from guillotina.utils import get_database, get_dotted_name, resolve_dotted_name
+
+
+try:
+    import prometheus_client
+
+    JOBS = prometheus_client.Counter(
+        "guillotina_jobs_total",
+        "Total count of durable jobs by result (queued, done, retry or failed).",
+        labelnames=["result"],
+    )
+    JOBS_PROCESSING_TIME = prometheus_client.Histogram(
+        "guillotina_jobs_processing_time_seconds",
+        "Histogram of durable jobs processing time (in seconds)",
+    )
+except ImportError:
+    JOBS = None
+    JOBS_PROCESSING_TIME = None
+
+
+logger = logging.getLogger("guillotina.contrib.jobs")
+
+
+CREATE_TABLE = """
+CREATE TABLE IF NOT EXISTS {table} (
+    id BIGSERIAL PRIMARY KEY,
+    func VARCHAR(512) NOT NULL,
+    args JSONB NOT NULL,
+    kwargs JSONB NOT NULL,
+    db_id VARCHAR(256),
+    container_id VARCHAR(256),
+    status VARCHAR(16) NOT NULL DEFAULT 'pending',
+    attempts INT NOT NULL DEFAULT 0,
+    max_attempts INT NOT NULL,
+    run_at TIMESTAMPTZ NOT NULL DEFAULT now(),
+    error TEXT,
+    created TIMESTAMPTZ NOT NULL DEFAULT now()
+);
+CREATE INDEX IF NOT EXISTS {table}_run_at ON {table} (run_at, id) WHERE status != 'failed';
+"""
+
+INSERT_JOB = """
+INSERT INTO {table} (func, args, kwargs, db_id, container_id, max_attempts, run_at)
+VALUES ($1, $2::jsonb, $3::jsonb, $4, $5, $6, now() + $7 * interval '1 second')
+RETURNING id
+"""
+
+# while running, run_at is when the lease of the worker expires
+CLAIM_JOB = """
+UPDATE {table}
+SET status = 'running', attempts = attempts + 1, run_at = now() + $1 * interval '1 second'
+WHERE id = (
+    SELECT id FROM {table}
+    WHERE status != 'failed' AND run_at <= now()
+    ORDER BY run_at, id
+    LIMIT 1
+    FOR UPDATE SKIP LOCKED
+)
+RETURNING id, func, args, kwargs, db_id, container_id, attempts, max_attempts
+"""
+
+DELETE_JOB = "DELETE FROM {table} WHERE id = $1"
+
+RETRY_JOB = """
+UPDATE {table}
+SET status = 'pending', run_at = now() + $2 * interval '1 second', error = $3
+WHERE id = $1
+"""
+
+FAIL_JOB = "UPDATE {table} SET status = 'failed', error = $2 WHERE id = $1"
+
+
+def get_job_name(func: Callable) -> Optional[str]:
+    """
+    Dotted name to import a module level function, None for anything else
+    """
+    if not isinstance(func, types.FunctionType) or func.__qualname__ != func.__name__:
+        return None
+    return get_dotted_name(func)
+
+
+# results of the actions that finish a job
+RESULTS = {"delete": "done", "fail": "failed"}
+
+
+def record_job(result: str) -> None:
+    if JOBS is not None:
+        JOBS.labels(result=RESULTS.get(result, result)).inc()
+
+
+class DurableQueueUtility:
+    """
+    Jobs stored in a postgresql table and run by workers in every process.
+
+    Workers claim jobs with ``FOR UPDATE SKIP LOCKED`` so each one is run once,
+    failed jobs are retried with exponential backoff and stored jobs wake up
+    workers with ``LISTEN/NOTIFY``.
+    """
+
+    def __init__(self, settings=None):
+        self._storage = None
+        self._sql: Dict[str, str] = {}
+        self._workers: List[asyncio.Task] = []
+        self._wakeups: List[asyncio.Event] = []
+        self._listen_conn = None
+        self.initialized = False
+
+    @property
+    def settings(self):
+        return app_settings["jobs"]
+
+    def _get_storage(self):
+        root = get_utility(IApplication, name="root")
+        for db_id, db in root:
+            if not IDatabase.providedBy(db) or not IPostgresStorage.providedBy(db.storage):
+                continue
+            if self.settings["database"] in (None, db_id):
+                return db.storage
+        return None
+
+    async def initialize(self, app=None):
+        self._storage = self._get_storage()
+        if self._storage is None:
+            logger.warning("No postgresql database configured for durable jobs")
+            return
+        table = self.settings["table_name"]
+        self._sql = {
+            name: sql.format(table=table)
+            for name, sql in (
+                ("insert", INSERT_JOB),
+                ("claim", CLAIM_JOB),
+                ("delete", DELETE_JOB),
+                ("retry", RETRY_JOB),
+                ("fail", FAIL_JOB),
+            )
+        }
+        async with self._storage.pool.acquire() as conn:
+            await conn.execute(CREATE_TABLE.format(table=table))
+
+        try:
+            # pool connections do not support notifications
+            self._listen_conn = await asyncpg.connect(dsn=self._storage._dsn)
+            await self._listen_conn.add_listener(self.settings["channel"], self._notified)
+        except Exception:
+            logger.warning("Could not listen for jobs, polling for them", exc_info=True)
+            self._listen_conn = None
+
+        for _ in range(self.settings["workers"]):
+            wakeup = asyncio.Event()
+            self._wakeups.append(wakeup)
+            self._workers.append(asyncio.ensure_future(self._work(wakeup)))
+        self.initialized = True
+
+    async def finalize(self, app=None):
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._wakeups = []
+        if self._listen_conn is not None:
+            try:
+                await self._listen_conn.close(timeout=1)
+            except Exception:  # pragma: no cover
+                logger.debug("Error releasing jobs listener", exc_info=True)
+            self._listen_conn = None
+        self.initialized = False
+
+    def _notified(self, *args):
+        self.wakeup()
+
+    def wakeup(self):
+        for wakeup in self._wakeups:
+            wakeup.set()
+
+    def accepts(self, func: Callable, args=None, kwargs=None) -> bool:
+        if get_job_name(func) is None:
+            return False
+        try:
+            orjson.dumps(list(args or []))
+            orjson.dumps(kwargs or {})
+        except TypeError:
+            return False
+        return True
+
+    async def add(
+        self,
+        func: Callable,
+        args=None,
+        kwargs=None,
+        db_id: Optional[str] = None,
+        container_id: Optional[str] = None,
+        max_attempts: Optional[int] = None,
+        delay: float = 0,
+    ) -> int:
+        """
+        Store a job, the function is called with the database and container
+        of the ids in a transaction that is committed when it finishes.
+
+        :returns: id of the job
+        """
+        if self._storage is None:
+            raise ValueError("Durable jobs not initialized")
+        name = get_job_name(func)
+        if name is None:
+            raise ValueError(f"Only module level functions can be stored as jobs: {func}")
+        async with self._storage.pool.acquire() as conn:
+            job_id = await conn.fetchval(
+                self._sql["insert"],
+                name,
+                orjson.dumps(list(args or [])).decode("utf-8"),
+                orjson.dumps(kwargs or {}).decode("utf-8"),
+                db_id,
+                container_id,
+                max_attempts or self.settings["max_attempts"],
+                delay,
+            )
+            await conn.execute("SELECT pg_notify($1, $2)", self.settings["channel"], str(job_id))
+        record_job("queued")
+        self.wakeup()
+        return job_id
+
+    async def _work(self, wakeup: asyncio.Event):
+        while True:
+            wakeup.clear()
+            try:
+                job = await self._claim()
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                logger.warning("Error getting job", exc_info=True)
+                job = None
+            if job is None:
+                try:
+                    await asyncio.wait_for(wakeup.wait(), self.settings["poll_interval"])
+                except asyncio.TimeoutError:
+                    pass
+                continue
+            await self._process(job)
+
+    async def _claim(self):
+        async with self._storage.pool.acquire() as conn:
+            return await conn.fetchrow(self._sql["claim"], self.settings["lease_timeout"])
+
+    async def _process(self, job):
+        if job["attempts"] > job["max_attempts"]:
+            # lease expired on the last attempt, the worker running it died
+            await self._finish(job, "fail", "Job lease expired")
+            return
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        try:
+            # a task of its own so the job task vars do not leak to the next one
+            await asyncio.ensure_future(self._run(job))
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            error = traceback.format_exc()
+            if job["attempts"] >= job["max_attempts"]:
+                logger.error(f"Job {job['id']} {job['func']} failed", exc_info=True)
+                await self._finish(job, "fail", error)
+            else:
+                logger.warning(f"Job {job['id']} {job['func']} failed, retrying", exc_info=True)
+                delay = min(
+                    self.settings["retry_delay"] * 2 ** (job["attempts"] - 1),
+                    self.settings["max_retry_delay"],
+                )
+                await self._finish(job, "retry", delay, error)
+        else:
+            await self._finish(job, "delete")
+        finally:
+            if JOBS_PROCESSING_TIME is not None:
+                JOBS_PROCESSING_TIME.observe(loop.time() - start)
+
+    async def _finish(self, job, action: str, *args):
+        try:
+            async with self._storage.pool.acquire() as conn:
+                await conn.execute(self._sql[action], job["id"], *args)
+        except Exception:
+            # the job is run again when its lease expires
+            logger.warning(f"Error updating job {job['id']}", exc_info=True)
+        record_job(action)
+
+    async def _run(self, job):
+        func = resolve_dotted_name(job["func"])
+        args = orjson.loads(job["args"])
+        kwargs = orjson.loads(job["kwargs"])
+        if job["db_id"] is None:
+            return await func(*args, **kwargs)
+
+        db = await get_database(job["db_id"])
+        task_vars.db.set(db)
+        async with transaction(db=db):
+            if job["container_id"] is not None:
+                container = await db.async_get(job["container_id"])
+                if container is None:
+                    raise ContainerNotFound(job["container_id"])
+                task_vars.registry.set(None)
+                task_vars.container.set(container)
+            return await func(*args, **kwargs)
@@ -258,8 +258,7 @@ class MCPToolRegistry:
 
     async def invalidate_cache(self, reason: str = "manual") -> None:
         if self._cache_disabled is False:
-            keys_to_delete = await self._driver_redis.keys_startswith(self._key_cache_redis_prefix)
-            await self._driver_redis.delete_all(keys_to_delete)
+            await self._driver_redis.delete_prefix(self._key_cache_redis_prefix)
 
     def metadata(self) -> Dict[str, Any]:
         return {
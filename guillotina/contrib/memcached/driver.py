@@ -248,15 +248,41 @@ class MemcachedDriver:
         if _SEND_METRICS:
             MEMCACHED_OPS_DELETE_ALL_NUM_KEYS.observe(len(keys))
 
+        try:
+            await self.delete_many(keys)
+            logger.debug("Deleted cache keys {}".format(keys))
+        except Exception:
+            logger.warning("Error deleting cache keys {}".format(keys), exc_info=True)
+
+    # MULTI KEY API, commands are sent concurrently without waiting for replies
+
+    async def set_many(self, items: Dict[str, bytes], *, expire: Optional[int] = None) -> None:
+        if len(items) == 0:
+            return
+        client = self._get_client()
+        kwargs: Dict[str, int] = {}
+        if expire is not None:
+            kwargs["exptime"] = expire
+        with watch("set_many"):
+            await asyncio.gather(
+                *[client.set(safe_key(key), data, noreply=True, **kwargs) for key, data in items.items()]
+            )
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if len(keys) == 0:
+            return []
+        client = self._get_client()
+        safe_keys = [safe_key(key) for key in keys]
+        with watch("get_many"):
+            items: Dict[bytes, emcache.Item] = await client.get_many(safe_keys)
+        return [items[key].value if key in items else None for key in safe_keys]
+
+    async def delete_many(self, keys: List[str]) -> None:
+        if len(keys) == 0:
+            return
         client = self._get_client()
         with watch("delete_many"):
-            for key in keys:
-                try:
-                    with watch("delete"):
-                        await client.delete(safe_key(key), noreply=True)
-                    logger.debug("Deleted cache keys {}".format(keys))
-                except Exception:
-                    logger.warning("Error deleting cache keys {}".format(keys), exc_info=True)
+            await asyncio.gather(*[client.delete(safe_key(key), noreply=True) for key in keys])
 
     async def flushall(self) -> None:
         client = self._get_client()
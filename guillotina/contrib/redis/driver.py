@@ -6,7 +6,8 @@ except ImportError:
 
 import asyncio
 import logging
-from typing import Dict, List, Optional
+import re
+from typing import AsyncIterator, Dict, List, Optional, Union
 
 import backoff
 from redis.asyncio.client import PubSub
@@ -44,6 +45,12 @@ except ImportError:
 
 logger = logging.getLogger("guillotina.contrib.redis")
 
+_glob_chars = re.compile(r"([*?\[\]\\])")
+
+
+def _glob_escape(value: str) -> str:
+    return _glob_chars.sub(r"\\\1", value)
+
 
 class RedisDriver:
     def __init__(self):
@@ -124,20 +131,88 @@ class RedisDriver:
         await self._pool.expire(key, expire)
 
     async def keys_startswith(self, key: str):
+        """
+        All the keys starting with ``key``, prefer ``scan_prefix``
+        to not hold every key in memory
+        """
+        return [k async for k in self.scan_prefix(key)]
+
+    async def scan_prefix(self, prefix: str, *, count: int = 1000) -> AsyncIterator[bytes]:
+        """
+        Iterate the keys starting with ``prefix`` using ``SCAN``, every
+        call only walks ``count`` keys so the server is never blocked
+        like with ``KEYS``. Keys may be yielded more than once.
+        """
         if self._pool is None:
             raise NoRedisConfigured()
-        return await self._pool.keys(f"{key}*")
+        match = _glob_escape(prefix) + "*"
+        cursor = 0
+        while True:
+            with watch(labels={"type": "scan"}):
+                cursor, keys = await self._pool.scan(cursor=cursor, match=match, count=count)
+            for key in keys:
+                yield key
+            if cursor == 0:
+                break
+
+    async def delete_prefix(self, prefix: str, *, batch_size: int = 1000) -> int:
+        """
+        Delete the keys starting with ``prefix`` in batches of ``batch_size``
+        keys, returns the number of keys found
+        """
+        total = 0
+        batch: List[bytes] = []
+        async for key in self.scan_prefix(prefix, count=batch_size):
+            batch.append(key)
+            if len(batch) >= batch_size:
+                await self.delete_many(batch)
+                total += len(batch)
+                batch = []
+        if len(batch) > 0:
+            await self.delete_many(batch)
+            total += len(batch)
+        return total
 
     async def delete_all(self, keys: List[str]):
+        try:
+            await self.delete_many(keys)
+            logger.debug("Deleted cache keys {}".format(keys))
+        except NoRedisConfigured:
+            raise
+        except Exception:
+            logger.warning("Error deleting cache keys {}".format(keys), exc_info=True)
+
+    # MULTI KEY API, one round trip for all the keys
+
+    async def set_many(self, items: Dict[str, bytes], *, expire: Optional[int] = None):
         if self._pool is None:
             raise NoRedisConfigured()
-        for key in keys:
-            try:
-                with watch(labels={"type": "acquire_conn"}):
-                    await self._pool.delete(key)
-                logger.debug("Deleted cache keys {}".format(keys))
-            except Exception:
-                logger.warning("Error deleting cache keys {}".format(keys), exc_info=True)
+        if len(items) == 0:
+            return
+        with watch(labels={"type": "set_many"}):
+            async with self._pool.pipeline(transaction=False) as pipe:
+                for key, data in items.items():
+                    pipe.set(key, data, ex=expire)
+                results = await pipe.execute()
+        failed = [key for key, ok in zip(items, results) if ok is not True]
+        if len(failed) > 0:
+            logger.warning("Error setting cache keys {}".format(failed))
+
+    async def get_many(self, keys: List[str]) -> List[Optional[bytes]]:
+        if self._pool is None:
+            raise NoRedisConfigured()
+        if len(keys) == 0:
+            return []
+        with watch(labels={"type": "get_many"}):
+            return await self._pool.mget(keys)
+
+    async def delete_many(self, keys: List[Union[str, bytes]]):
+        if self._pool is None:
+            raise NoRedisConfigured()
+        if len(keys) == 0:
+            return
+        with watch(labels={"type": "delete_many"}):
+            await self._pool.delete(*keys)
 
     async def flushall(self, *, async_op: bool = False):
         if self._pool is None:
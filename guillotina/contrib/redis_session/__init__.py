@@ -4,6 +4,7 @@ app_settings = {
         "session_manager": {
             "provides": "guillotina.interfaces.ISessionManagerUtility",
             "factory": "guillotina.contrib.redis_session.utility.RedisSessionManagerUtility",
+            "settings": {"revocations_channel": "guillotina-sessions"},
         }
     },
     "auth_token_validators": ["guillotina.auth.validators.JWTSessionValidator"],
@@ -3,6 +3,9 @@ import logging
 import uuid
 
 from guillotina import app_settings
+from guillotina.auth.cache import token_cache
+from guillotina.component import query_utility
+from guillotina.interfaces import IPubSubUtility
 
 
 logger = logging.getLogger("guillotina")
@@ -12,7 +15,10 @@ class RedisSessionManagerUtility:
     def __init__(self, settings=None):
         self._ttl = app_settings.get("jwt", {}).get("token_expiration", 3660)
         self._prefix = settings.get("prefix", "session")
+        self._revocations_channel = settings.get("revocations_channel", "guillotina-sessions")
         self._driver = None
+        self._subscriber = None
+        self._uid = uuid.uuid4().hex
         self._initialized = False
 
     async def initialize(self, app=None):
@@ -21,11 +27,27 @@ class RedisSessionManagerUtility:
         loop = asyncio.get_event_loop()
         self._driver = await redis.get_driver()
         await self._driver.initialize(loop)
+        # checked sessions are only cached while revocations are received
+        self._subscriber = query_utility(IPubSubUtility)
+        if self._subscriber is not None and self._revocations_channel:
+            await self._subscriber.initialized()
+            await self._subscriber.subscribe(self._revocations_channel, self._uid, self.revoked)
+            token_cache.sessions_revocable = True
         self._initialized = True
 
     async def finalize(self):
+        if token_cache.sessions_revocable and self._subscriber is not None:
+            token_cache.sessions_revocable = False
+            try:
+                await self._subscriber.unsubscribe(self._revocations_channel, self._uid)
+            except Exception:
+                logger.warning("Error unsubscribing from session revocations", exc_info=True)
         self._initialized = False
 
+    async def revoked(self, *, data=None, sender=None):
+        if isinstance(data, dict):
+            token_cache.revoke_session(data.get("ident"), data.get("session"))
+
     async def new_session(self, ident: str, data: str = "") -> str:
         session = uuid.uuid4().hex
         session_key = f"{self._prefix}:{ident}:{session}"
@@ -49,6 +71,11 @@ class RedisSessionManagerUtility:
         value = await self._driver.get(session_key)
         if value is not None:
             await self._driver.delete(session_key)
+            token_cache.revoke_session(ident, session)
+            if token_cache.sessions_revocable:
+                await self._subscriber.publish(
+                    self._revocations_channel, self._uid, {"ident": ident, "session": session}
+                )
         else:
             raise KeyError("Invalid session")
 
@@ -64,9 +91,11 @@ class RedisSessionManagerUtility:
     async def list_sessions(self, ident: str):
         if ident is None:
             return []
-        session_key = f"{self._prefix}:{ident}"
-        value = await self._driver.keys_startswith(session_key)
-        return [x.split(b":")[2].decode("utf-8") for x in value]
+        session_key = f"{self._prefix}:{ident}:"
+        sessions = set()
+        async for key in self._driver.scan_prefix(session_key):
+            sessions.add(key.split(b":")[2].decode("utf-8"))
+        return list(sessions)
 
     async def get_session(self, ident: str, session: str):
         if ident is None:
@@ -1,5 +1,5 @@
 import typing
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from guillotina import glogging
 from guillotina.db.orm.interfaces import IBaseObject
@@ -85,6 +85,20 @@ class BaseCache:
         """
         raise NotImplementedError
 
+    async def get_many(self, keysets: List[Dict[str, Any]]) -> List[Optional[Any]]:
+        """
+        Get the values of several keys, in the same order,
+        every keyset are the params to build a cache key
+        """
+        return [await self.get(**opts) for opts in keysets]
+
+    async def set_many(self, entries: List[Tuple[Any, List[Dict[str, Any]]]]):
+        """
+        Set several values, every entry is a value with the keyset it is stored with
+        """
+        for value, keyset in entries:
+            await self.set(value, keyset=keyset)
+
     async def clear(self):
         raise NotImplementedError
 
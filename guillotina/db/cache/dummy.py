@@ -1,4 +1,4 @@
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional, Tuple
 
 from guillotina import configure
 from guillotina.db.cache.base import BaseCache
@@ -15,6 +15,12 @@ class DummyCache(BaseCache):
     ):
         pass
 
+    async def get_many(self, keysets: List[Dict[str, Any]]) -> List[Optional[Any]]:
+        return [None] * len(keysets)
+
+    async def set_many(self, entries: List[Tuple[Any, List[Dict[str, Any]]]]):
+        pass
+
     async def clear(self):
         pass
 
@@ -0,0 +1,71 @@
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Iterable
+
+
+try:
+    import prometheus_client
+
+    COALESCED = prometheus_client.Counter(
+        "guillotina_cache_coalesced_total",
+        "Total count of cache misses that waited for an in-flight load of the same key.",
+        labelnames=["type"],
+    )
+except ImportError:
+    COALESCED = None
+
+
+_FAILED = object()
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent loads of the same key in the process.
+
+    The first caller for a key runs the load, callers arriving while it is in
+    flight wait for its result instead of running their own. If the load fails
+    or is cancelled, waiting callers run the load themselves.
+    """
+
+    def __init__(self):
+        self._flights: Dict[Any, asyncio.Future] = {}
+        self.waits = 0
+
+    async def run(self, name: str, key: Any, func: Callable[[], Awaitable[Any]]) -> Any:
+        loop = asyncio.get_running_loop()
+        flight = self._flights.get(key)
+        if flight is not None and flight.get_loop() is loop:
+            result = await asyncio.shield(flight)
+            if result is not _FAILED:
+                self.waits += 1
+                if COALESCED is not None:
+                    COALESCED.labels(type=name).inc()
+                return result
+            return await func()
+
+        flight = loop.create_future()
+        self._flights[key] = flight
+        try:
+            result = await func()
+        except BaseException:
+            flight.set_result(_FAILED)
+            raise
+        else:
+            flight.set_result(result)
+            return result
+        finally:
+            if self._flights.get(key) is flight:
+                del self._flights[key]
+
+    def forget(self, keys: Iterable[Any]) -> None:
+        """
+        Loads started before keys were invalidated are not joined anymore
+        """
+        for key in keys:
+            self._flights.pop(key, None)
+
+    def __len__(self):
+        return len(self._flights)
+
+
+# process wide flights of storage loads, by cache key
+storage_flights = SingleFlight()
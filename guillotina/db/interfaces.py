@@ -63,6 +63,11 @@ class ITransaction(Interface):
         Get oid object
         """
 
+    async def get_many(oids: typing.List[str]) -> typing.List[IBaseObject]:
+        """
+        Get objects for list of oids, oids not found are left out
+        """
+
     async def contains(oid: str, key: str) -> bool:
         """
         Does an object container another
@@ -83,6 +88,11 @@ class ITransaction(Interface):
         Get children of object
         """
 
+    async def get_path(parent: IBaseObject, keys: typing.List[str]) -> typing.List[IBaseObject]:
+        """
+        Get chain of objects for path of keys inside object
+        """
+
     def delete(obj: IBaseObject):
         """
         delete object
@@ -103,6 +113,14 @@ class ITransaction(Interface):
         Get items in content
         """
 
+    async def get_page_of_children(
+        parent: IBaseObject, after: typing.Optional[str] = None, page_size: int = 1000
+    ) -> typing.Tuple[typing.List[IBaseObject], typing.Optional[str]]:
+        """
+        Get a page of children ordered by oid after the oid `after`, with the
+        oid to get the next page after, None on the last page
+        """
+
     async def get_connection() -> typing.Any:
         """
         Get current connection object
@@ -176,6 +194,16 @@ class ITransactionCache(Interface):
         set cached data
         """
 
+    async def get_many(keysets):
+        """
+        get cached objects of a list of key params, in the same order
+        """
+
+    async def set_many(entries):
+        """
+        set a list of (value, keyset) cached data
+        """
+
     async def delete(key):
         """
         delete cache key
@@ -217,11 +245,21 @@ class IStorage(Interface):
         load ob from oid
         """
 
+    async def load_many(txn, oids):
+        """
+        load the records of a list of oids, oids not found are left out
+        """
+
     async def store(oid, old_serial, writer, obj, txn):
         """
         store oid with obj
         """
 
+    async def store_many(txn, objects):
+        """
+        store list of (oid, old_serial, writer, obj) tuples
+        """
+
     async def delete(txn, oid):
         """
         delete ob by oid
@@ -262,11 +300,28 @@ class IStorage(Interface):
         get keys for oid
         """
 
+    async def get_keys_after(txn, oid, after=None, page_size=1000):
+        """
+        get a page of zoid and id of the children of oid ordered by zoid,
+        after the zoid `after`
+        """
+
+    async def get_children_after(txn, oid, after=None, page_size=1000):
+        """
+        get a page of records of the children of oid ordered by zoid,
+        after the zoid `after`
+        """
+
     async def get_child(txn, parent_oid, id):
         """
         get child of parent oid
         """
 
+    async def get_path(txn, parent_oid, ids):
+        """
+        get the records of a chain of children ids starting at parent oid
+        """
+
     async def has_key(txn, parent_oid, id):
         """
         check if key exists
@@ -302,9 +357,9 @@ class IStorage(Interface):
         read blob chunk
         """
 
-    async def read_blob_chunks(txn, bid):
+    async def read_blob_chunks(txn, bid, start=0, end=None):
         """
-        read blob chunks
+        read blob chunks from ``start`` to ``end`` (not included), ordered by chunk index
         """
 
     async def del_blob(txn, bid):
@@ -22,7 +22,7 @@ class BaseStorage:
     async def initialize(self, loop=None, **kw):
         raise NotImplemented()  # pragma: no cover
 
-    async def open(self):
+    async def open(self, read_only=False):
         raise NotImplemented()  # pragma: no cover
 
     async def close(self, con):
@@ -31,9 +31,22 @@ class BaseStorage:
     async def load(self, txn, oid):
         raise NotImplemented()  # pragma: no cover
 
+    async def load_many(self, txn, oids):
+        records = []
+        for oid in oids:
+            try:
+                records.append(await self.load(txn, oid))
+            except KeyError:
+                pass
+        return records
+
     async def store(self, oid, old_serial, writer, obj, txn):
         raise NotImplemented()  # pragma: no cover
 
+    async def store_many(self, txn, objects):
+        for oid, old_serial, writer, obj in objects:
+            await self.store(oid, old_serial, writer, obj, txn)
+
     async def delete(self, txn, oid):
         raise NotImplemented()  # pragma: no cover
 
@@ -61,12 +74,31 @@ class BaseStorage:
     async def get_page_of_keys(self, txn, oid, page=1, page_size=1000):
         raise NotImplemented()  # pragma: no cover
 
+    async def get_keys_after(self, txn, oid, after=None, page_size=1000):
+        raise NotImplemented()  # pragma: no cover
+
+    async def get_children_after(self, txn, oid, after=None, page_size=1000):
+        raise NotImplemented()  # pragma: no cover
+
     async def keys(self, txn, oid):
         raise NotImplemented()  # pragma: no cover
 
     async def get_child(self, txn, parent_oid, id):
         raise NotImplemented()  # pragma: no cover
 
+    async def get_path(self, txn, parent_oid, ids):
+        records = []
+        for id in ids:
+            try:
+                record = await self.get_child(txn, parent_oid, id)
+            except KeyError:
+                record = None
+            if record is None:
+                break
+            records.append(record)
+            parent_oid = record["zoid"]
+        return records
+
     async def has_key(self, txn, parent_oid, id):
         raise NotImplemented()  # pragma: no cover
 
@@ -88,8 +120,19 @@ class BaseStorage:
     async def read_blob_chunk(self, txn, bid, chunk=0):
         raise NotImplemented()  # pragma: no cover
 
-    async def read_blob_chunks(self, txn, bid):
-        raise NotImplemented()  # pragma: no cover
+    async def read_blob_chunks(self, txn, bid, start=0, end=None):
+        records = []
+        chunk = start
+        while end is None or chunk < end:
+            try:
+                record = await self.read_blob_chunk(txn, bid, chunk)
+            except (KeyError, IndexError):
+                record = None
+            if record is None:
+                break
+            records.append(record)
+            chunk += 1
+        return records
 
     async def del_blob(self, txn, bid):
         raise NotImplemented()  # pragma: no cover
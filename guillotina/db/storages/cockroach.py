@@ -268,6 +268,11 @@ class CockroachStorage(pg.PostgresqlStorage):
                 )
         await txn._cache.store_object(obj, pickled)
 
+    async def store_many(self, txn, objects):
+        # no json column and no batched statements for cockroach, store one by one
+        for oid, old_serial, writer, obj in objects:
+            await self.store(oid, old_serial, writer, obj, txn)
+
     async def commit(self, transaction):
         if transaction._db_txn is not None:
             async with transaction._lock:
@@ -40,7 +40,7 @@ class DummyStorage(BaseStorage):  # type: ignore
         """Reset the tables"""
         pass
 
-    async def open(self):
+    async def open(self, read_only=False):
         return self
 
     async def close(self, con):
@@ -204,6 +204,10 @@ class DummyStorage(BaseStorage):  # type: ignore
     async def read_blob_chunk(self, txn, bid, chunk=0):
         return {"data": self._blobs[bid]["chunks"][chunk]}
 
+    async def read_blob_chunks(self, txn, bid, start=0, end=None):
+        chunks = self._blobs.get(bid, {"chunks": []})["chunks"]
+        return [{"chunk_index": idx, "data": data} for idx, data in enumerate(chunks[start:end], start=start)]
+
     async def get_conflicts(self, txn):
         return []
 
@@ -214,6 +218,19 @@ class DummyStorage(BaseStorage):  # type: ignore
         end = start + page_size
         return [self._db[key]["id"] for key in keys[start:end]]
 
+    def _get_children_oids_after(self, oid, after, page_size):
+        oids = sorted(coid for coid in self._db[oid]["children"].values() if coid > (after or ""))
+        return oids[:page_size]
+
+    async def get_keys_after(self, txn, oid, after=None, page_size=1000):
+        return [
+            {"zoid": coid, "id": self._db[coid]["id"]}
+            for coid in self._get_children_oids_after(oid, after, page_size)
+        ]
+
+    async def get_children_after(self, txn, oid, after=None, page_size=1000):
+        return [await self.load(txn, coid) for coid in self._get_children_oids_after(oid, after, page_size)]
+
     async def vacuum(self):
         """
         nothing to vacuum in this implementation
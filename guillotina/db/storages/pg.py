@@ -2,6 +2,7 @@ import asyncio
 import concurrent
 import time
 from asyncio import shield
+from collections import deque
 from contextlib import asynccontextmanager, contextmanager
 
 import asyncpg
@@ -15,6 +16,7 @@ from guillotina.const import TRASHED_ID
 from guillotina.db.events import StorageCreatedEvent
 from guillotina.db.interfaces import IPostgresStorage
 from guillotina.db.storages.base import BaseStorage
+from guillotina.db.storages.replicas import PRIMARY, ReadReplicas, record_acquire
 from guillotina.db.storages.utils import SQLStatements, clear_table_name, get_table_definition, register_sql
 from guillotina.db.uid import MAX_UID_LENGTH
 from guillotina.event import notify
@@ -40,10 +42,20 @@ try:
         "Histogram of time it takes to acquire locks (in seconds)",
         labelnames=["type"],
     )
+    PG_CONFLICT_CHECKED_OIDS = prometheus_client.Counter(
+        "guillotina_db_pg_conflict_checked_oids_total",
+        "Total count of modified objects checked for conflicts on commit.",
+    )
+    PG_CONFLICTS = prometheus_client.Counter(
+        "guillotina_db_pg_conflicts_total",
+        "Total count of objects changed by other transactions found when checking for conflicts.",
+    )
 except ImportError:
     PG_OPS = None
     PG_OPS_PROCESSING_TIME = None
     PG_LOCK_ACQUIRE_TIME = None
+    PG_CONFLICT_CHECKED_OIDS = None
+    PG_CONFLICTS = None
 
 
 class watch(metrics.watch):
@@ -82,6 +94,15 @@ WHERE zoid = $1::varchar({MAX_UID_LENGTH})
 """,
 )
 
+register_sql(
+    "GET_OIDS",
+    f"""
+SELECT zoid, tid, state_size, resource, of, parent_id, id, type, state
+FROM {{table_name}}
+WHERE zoid = ANY($1::varchar({MAX_UID_LENGTH})[])
+""",
+)
+
 register_sql(
     "GET_CHILDREN_KEYS",
     f"""
@@ -110,6 +131,26 @@ WHERE parent_id = $1::varchar({MAX_UID_LENGTH}) AND id = $2::text
 """,
 )
 
+register_sql(
+    "GET_PATH",
+    f"""
+WITH RECURSIVE path AS (
+    SELECT zoid, tid, state_size, resource, type, state, id, parent_id, of, 1 AS depth
+    FROM {{table_name}}
+    WHERE parent_id = $1::varchar({MAX_UID_LENGTH}) AND id = ($2::text[])[1]
+    UNION ALL
+    SELECT child.zoid, child.tid, child.state_size, child.resource, child.type, child.state,
+           child.id, child.parent_id, child.of, path.depth + 1
+    FROM {{table_name}} child
+    JOIN path ON child.parent_id = path.zoid
+    WHERE path.depth < array_length($2::text[], 1) AND child.id = ($2::text[])[path.depth + 1]
+)
+SELECT zoid, tid, state_size, resource, type, state, id, parent_id, of
+FROM path
+ORDER BY depth
+""",
+)
+
 register_sql(
     "GET_CHILDREN_BATCH",
     f"""
@@ -214,6 +255,62 @@ register_sql("UPDATE", _wrap_return_count(NAIVE_UPDATE + """ AND tid = $7::bigin
 register_sql("NAIVE_UPDATE", _wrap_return_count(NAIVE_UPDATE))
 
 
+# batched versions of the statements above, every column except the tid
+# is provided as an array so a group of objects is stored with one statement
+BATCHED_ROWS = f"""
+unnest($1::varchar({MAX_UID_LENGTH})[], $3::int[], $4::int[], $5::boolean[],
+       $6::varchar({MAX_UID_LENGTH})[], $7::bigint[], $8::varchar({MAX_UID_LENGTH})[],
+       $9::text[], $10::text[], $11::text[], $12::bytea[])
+    AS t(zoid, state_size, part, resource, of, otid, parent_id, id, type, json, state)"""
+
+register_sql(
+    "BATCHED_NAIVE_UPSERT",
+    f"""
+INSERT INTO {{table_name}}
+(zoid, tid, state_size, part, resource, of, otid, parent_id, id, type, json, state)
+SELECT t.zoid, $2::bigint, t.state_size, t.part, t.resource, t.of, t.otid,
+       t.parent_id, t.id, t.type, t.json::jsonb, t.state
+FROM {BATCHED_ROWS}
+ON CONFLICT (zoid)
+DO UPDATE SET
+    tid = EXCLUDED.tid,
+    state_size = EXCLUDED.state_size,
+    part = EXCLUDED.part,
+    resource = EXCLUDED.resource,
+    of = EXCLUDED.of,
+    otid = EXCLUDED.otid,
+    parent_id = EXCLUDED.parent_id,
+    id = EXCLUDED.id,
+    type = EXCLUDED.type,
+    json = EXCLUDED.json,
+    state = EXCLUDED.state
+RETURNING zoid""",
+)
+
+register_sql(
+    "BATCHED_UPDATE",
+    f"""
+UPDATE {{table_name}}
+SET
+    tid = $2::bigint,
+    state_size = t.state_size,
+    part = t.part,
+    resource = t.resource,
+    of = t.of,
+    otid = t.otid,
+    parent_id = t.parent_id,
+    id = t.id,
+    type = t.type,
+    json = t.json::jsonb,
+    state = t.state
+FROM {BATCHED_ROWS}
+WHERE
+    {{table_name}}.zoid = t.zoid
+    AND {{table_name}}.tid = t.otid
+RETURNING {{table_name}}.zoid""",
+)
+
+
 register_sql(
     "NUM_CHILDREN", f"SELECT count(*) FROM {{table_name}} WHERE parent_id = $1::varchar({MAX_UID_LENGTH})"
 )
@@ -282,6 +379,18 @@ AND chunk_index = $2::int
 )
 
 
+register_sql(
+    "READ_BLOB_CHUNKS",
+    f"""
+SELECT chunk_index, data from {{table_name}}
+WHERE bid = $1::VARCHAR({MAX_UID_LENGTH})
+AND chunk_index >= $2::int
+AND ($3::int IS NULL OR chunk_index < $3::int)
+ORDER BY chunk_index
+""",
+)
+
+
 register_sql(
     "DELETE_BLOB",
     f"""
@@ -311,6 +420,28 @@ OFFSET $3::int
 """,
 )
 
+register_sql(
+    "GET_CHILDREN_KEYS_AFTER",
+    f"""
+SELECT zoid, id
+FROM {{table_name}}
+WHERE parent_id = $1::varchar({MAX_UID_LENGTH}) AND zoid > $2::varchar({MAX_UID_LENGTH})
+ORDER BY zoid
+LIMIT $3::int
+""",
+)
+
+register_sql(
+    "GET_CHILDREN_AFTER",
+    f"""
+SELECT zoid, tid, state_size, resource, type, state, id, parent_id, of
+FROM {{table_name}}
+WHERE parent_id = $1::varchar({MAX_UID_LENGTH}) AND zoid > $2::varchar({MAX_UID_LENGTH})
+ORDER BY zoid
+LIMIT $3::int
+""",
+)
+
 register_sql(
     "DELETE_OBJECT",
     f"""
@@ -594,12 +725,49 @@ async def TransactionConnectionContextManager(storage, txn, op):
         async with watch_lock(txn._lock, op):
             with watch_db:
                 yield txn._db_conn
+    elif storage.replicas is not None and txn.read_only:
+        conn = await storage.open(read_only=True)
+        try:
+            with watch_db:
+                yield conn
+        finally:
+            await storage.close(conn)
     else:
         async with storage.pool.acquire(timeout=storage._conn_acquire_timeout) as conn:
             with watch_db:
                 yield conn
 
 
+class TIDBlockAllocator:
+    """
+    Hand out tids reserved from the database in blocks with a single query.
+
+    Tids are handed out in order inside a process but not across processes,
+    so a tid is only used for a transaction if it is greater than the serial of
+    every object the transaction modifies. Objects tids always increase and
+    the tid check on updates keeps detecting conflicts.
+    """
+
+    def __init__(self, storage, size):
+        self._storage = storage
+        self._size = size
+        self._tids = deque()
+        self._lock = asyncio.Lock()
+
+    async def get(self, min_tid=0):
+        async with self._lock:
+            while True:
+                while self._tids:
+                    tid = self._tids.popleft()
+                    if tid > min_tid:
+                        return tid
+                # new tids are always greater than all the committed ones
+                self._tids.extend(await self._storage.get_next_tids(self._size))
+
+    def __len__(self):
+        return len(self._tids)
+
+
 @implementer(IPostgresStorage)
 class PostgresqlStorage(BaseStorage):
     """Storage to a relational database, based on invalidation polling"""
@@ -613,6 +781,7 @@ class PostgresqlStorage(BaseStorage):
     _blobs_table_name = "blobs"
 
     _next_tid_sql = "SELECT nextval('{schema}.tid_sequence');"
+    _next_tids_sql = "SELECT nextval('{schema}.tid_sequence') FROM generate_series(1, $1);"
     _max_tid_sql = "SELECT last_value FROM {schema}.tid_sequence;"
 
     _object_schema = {
@@ -648,6 +817,7 @@ class PostgresqlStorage(BaseStorage):
         "CREATE INDEX IF NOT EXISTS {object_table_name}_of ON {objects_table_name} (of);",
         "CREATE INDEX IF NOT EXISTS {object_table_name}_part ON {objects_table_name} (part);",
         "CREATE INDEX IF NOT EXISTS {object_table_name}_parent ON {objects_table_name} (parent_id);",
+        "CREATE INDEX IF NOT EXISTS {object_table_name}_parent_zoid ON {objects_table_name} (parent_id, zoid);",  # noqa
         "CREATE INDEX IF NOT EXISTS {object_table_name}_id ON {objects_table_name} (id);",
         "CREATE INDEX IF NOT EXISTS {object_table_name}_type ON {objects_table_name} (type);",
         "ALTER TABLE {objects_table_name} ADD CONSTRAINT {object_table_name}_parent_id_zoid_check CHECK (parent_id != zoid) NOT VALID;",  # noqa
@@ -674,6 +844,12 @@ class PostgresqlStorage(BaseStorage):
         blobs_table_name="blobs",
         connection_manager=None,
         autovacuum=True,
+        store_batch_size=100,
+        tid_block_size=1,
+        conflict_check_batch_size=1000,
+        read_replicas=None,
+        replica_max_lag=5,
+        replica_check_interval=5,
         **options,
     ):
         super(PostgresqlStorage, self).__init__(read_only)
@@ -693,8 +869,20 @@ class PostgresqlStorage(BaseStorage):
         self._sql = SQLStatements()
         self._connection_manager = connection_manager
         self._autovacuum = autovacuum
+        self._store_batch_size = store_batch_size
+        self._conflict_check_batch_size = conflict_check_batch_size
+        self._read_replicas = read_replicas or []
+        self._replica_max_lag = replica_max_lag
+        self._replica_check_interval = replica_check_interval
+        self._replicas = None
+        self._tid_allocator = None
+        if tid_block_size > 1:
+            self._tid_allocator = TIDBlockAllocator(self, tid_block_size)
 
     async def finalize(self):
+        if self._replicas is not None:
+            await self._replicas.finalize()
+            self._replicas = None
         await self._connection_manager.close()
 
     @property
@@ -709,6 +897,10 @@ class PostgresqlStorage(BaseStorage):
     def connection_manager(self):
         return self._connection_manager
 
+    @property
+    def replicas(self):
+        return self._replicas
+
     @property
     def lock(self):
         return self._connection_manager.lock
@@ -829,6 +1021,16 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
                         await conn.execute(trash_sql)
                         await notify(StorageCreatedEvent(self, db_conn=conn))
 
+        if self._read_replicas and self._replicas is None:
+            self._replicas = ReadReplicas(
+                self._read_replicas,
+                pool_size=self._pool_size,
+                conn_acquire_timeout=self._conn_acquire_timeout,
+                max_lag=self._replica_max_lag,
+                check_interval=self._replica_check_interval,
+            )
+            await self._replicas.initialize(**kw)
+
         self._connection_initialized_on = time.time()
 
     async def remove(self):
@@ -838,12 +1040,20 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
             await conn.execute("DROP TABLE IF EXISTS {} CASCADE;".format(self.objects_table_name))
 
     @restart_conn_on_exception
-    async def open(self):
+    async def open(self, read_only=False):
+        if read_only and self._replicas is not None:
+            conn = await self._replicas.acquire()
+            if conn is not None:
+                return conn
+            # no replica available
+            record_acquire(PRIMARY)
         return await self.pool.acquire(timeout=self._conn_acquire_timeout)
 
     async def close(self, con):
         try:
             with watch("release_connection"):
+                if self._replicas is not None and await shield(self._replicas.release(con)):
+                    return
                 await shield(self.pool.release(con, timeout=1))
         except (asyncio.CancelledError, asyncio.TimeoutError, asyncpg.exceptions.ConnectionDoesNotExistError):
             log.warning("Exception on connection close", exc_info=True)
@@ -859,6 +1069,11 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
             raise KeyError(oid)
         return objects
 
+    async def load_many(self, txn, oids):
+        sql = self._sql.get("GET_OIDS", self.objects_table_name)
+        async with self.acquire(txn, "load_objects_by_oid") as conn:
+            return await conn.fetch(sql, oids)
+
     @profilable
     async def store(self, oid, old_serial, writer, obj, txn):
         assert oid is not None
@@ -940,6 +1155,126 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
                     )
         await txn._cache.store_object(obj, pickled)
 
+    @profilable
+    async def store_many(self, txn, objects):
+        """
+        Store a group of objects in a constant number of round trips.
+
+        `objects` is a list of `(oid, old_serial, writer, obj)` tuples. New objects
+        are upserted and existing objects are updated checking the tid, in chunks
+        of `store_batch_size` rows per statement.
+        """
+        if self._store_batch_size <= 1 or len(objects) <= 1:
+            return await super().store_many(txn, objects)
+
+        inserts = []
+        updates = []
+        for oid, old_serial, writer, obj in objects:
+            assert oid is not None
+            if not obj.__new_marker__ and obj.__serial__ is not None:
+                # we should be confident this is an object update
+                updates.append((oid, old_serial, writer, obj))
+            else:
+                inserts.append((oid, old_serial, writer, obj))
+
+        for idx in range(0, len(inserts), self._store_batch_size):
+            await self._store_batch(txn, inserts[idx : idx + self._store_batch_size], False)
+        for idx in range(0, len(updates), self._store_batch_size):
+            await self._store_batch(txn, updates[idx : idx + self._store_batch_size], True)
+
+    async def _store_batch(self, txn, objects, update):
+        columns = [[] for _ in range(11)]
+        pickles = []
+        for oid, old_serial, writer, obj in objects:
+            pickled = writer.serialize()  # This calls __getstate__ of obj
+            if len(pickled) >= self._large_record_size:
+                log.info(f"Large object {obj.__class__}: {len(pickled)}")
+            if self._store_json:
+                json_dict = await writer.get_json()
+                json = orjson.dumps(json_dict).decode("utf-8")
+            else:
+                json = None
+            part = writer.part
+            if part is None:
+                part = 0
+            for column, value in zip(
+                columns,
+                (
+                    oid,
+                    len(pickled),
+                    part,
+                    writer.resource,
+                    writer.of,
+                    old_serial,
+                    writer.parent_id,
+                    writer.id,
+                    writer.type,
+                    json,
+                    pickled,
+                ),
+            ):
+                column.append(value)
+            pickles.append(pickled)
+
+        if update:
+            statement_sql = self._sql.get("BATCHED_UPDATE", self.objects_table_name)
+        else:
+            statement_sql = self._sql.get("BATCHED_NAIVE_UPSERT", self.objects_table_name)
+
+        oid, old_serial, writer, obj = objects[0]
+        async with self.acquire(txn, "store_objects") as conn:
+            try:
+                result = await conn.fetch(statement_sql, columns[0], txn._tid, *columns[1:])
+            except asyncpg.exceptions.UniqueViolationError as ex:
+                if "Key (parent_id, id)" in ex.detail or "Key (of, id)" in ex.detail:
+                    raise ConflictIdOnContainer(ex)
+                raise
+            except asyncpg.exceptions.ForeignKeyViolationError:
+                # we can not tell which object of the batch is the bad one,
+                # make sure all of them get invalidated
+                for _, _, _, batch_obj in objects:
+                    txn.deleted[batch_obj.__uuid__] = batch_obj
+                raise TIDConflictError(
+                    "Bad value inserting into database that could be caused "
+                    "by a bad cache value. This should resolve on request retry.",
+                    oid,
+                    txn,
+                    old_serial,
+                    writer,
+                )
+            except asyncpg.exceptions._base.InterfaceError as ex:
+                if "another operation is in progress" in ex.args[0]:
+                    raise ConflictError(
+                        "asyncpg error, another operation in progress.", oid, txn, old_serial, writer
+                    )
+                raise
+            except asyncpg.exceptions.DeadlockDetectedError:
+                raise ConflictError("Deadlock detected.", oid, txn, old_serial, writer)
+
+        if len(result) != len(objects):
+            if update:
+                stored = {record["zoid"] for record in result}
+                for oid, old_serial, writer, obj in objects:
+                    if oid not in stored:
+                        # raise tid conflict error
+                        raise TIDConflictError(
+                            "Mismatch of tid of object being updated. This is likely "
+                            "caused by a cache invalidation race condition and should "
+                            "be an edge case. This should resolve on request retry.",
+                            oid,
+                            txn,
+                            old_serial,
+                            writer,
+                        )
+            else:
+                log.error(
+                    "Incorrect response count from database update. "
+                    "This should not happen. tid: {}".format(txn._tid)
+                )
+
+        for (oid, old_serial, writer, obj), pickled in zip(objects, pickles):
+            await txn._cache.store_object(obj, pickled)
+
     async def _txn_oid_commit_hook(self, status, oid):
         if self._connection_manager._vacuum is not None:
             await self._connection_manager._vacuum.add_to_queue(oid, self.objects_table_name)
@@ -965,12 +1300,25 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
                     async with watch_lock(self.lock, "shared_restart_conn"):
                         return await self.restart_connection()
 
-    @restart_conn_on_exception
     async def get_next_tid(self, txn):
+        if self._tid_allocator is not None:
+            min_tid = max((ob.__serial__ or 0 for ob in txn.modified.values()), default=0)
+            return await self._tid_allocator.get(min_tid)
+        return await self._get_next_tid()
+
+    @restart_conn_on_exception
+    async def _get_next_tid(self):
         async with self.pool.acquire(timeout=self._conn_acquire_timeout) as conn:
             with watch("next_tid"):
                 return await conn.fetchval(self._next_tid_sql.format(schema=self._db_schema))
 
+    @restart_conn_on_exception
+    async def get_next_tids(self, size):
+        async with self.pool.acquire(timeout=self._conn_acquire_timeout) as conn:
+            with watch("next_tids"):
+                records = await conn.fetch(self._next_tids_sql.format(schema=self._db_schema), size)
+        return sorted(record[0] for record in records)
+
     @restart_conn_on_exception
     async def get_current_tid(self, txn):
         async with self.pool.acquire(timeout=self._conn_acquire_timeout) as conn:
@@ -1028,25 +1376,31 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
                     pass
             if restart:
                 await self.close(conn)
-                txn._db_conn = await self.open()
+                txn._db_conn = await self.open(read_only=txn.read_only)
                 return await self.start_transaction(txn, retries + 1)
 
     async def get_conflicts(self, txn):
+        """
+        Get the modified objects committed by other transactions with a greater tid.
+
+        Oids are checked in chunks of `conflict_check_batch_size` with primary key
+        lookups. A pool connection is used because the transaction connection
+        sees its own not committed changes.
+        """
         if len(txn.modified) == 0:
             return []
-        # use storage lock instead of transaction lock
-        if len(txn.modified) < 1000:
-            # if it's too large, we're not going to check on object ids
-            modified_oids = [k for k in txn.modified.keys()]
-            sql = self._sql.get("TXN_CONFLICTS_ON_OIDS", self._objects_table_name)
-            with watch("get_conflicts_oids"):
-                async with self.pool.acquire() as conn:
-                    return await conn.fetch(sql, txn._tid, modified_oids)
-        else:
-            sql = self._sql.get("TXN_CONFLICTS", self._objects_table_name)
-            with watch("get_conflicts"):
-                async with self.pool.acquire() as conn:
-                    return await conn.fetch(sql, txn._tid)
+        modified_oids = list(txn.modified.keys())
+        batch_size = max(self._conflict_check_batch_size, 1)
+        sql = self._sql.get("TXN_CONFLICTS_ON_OIDS", self._objects_table_name)
+        conflicts = []
+        async with self.pool.acquire(timeout=self._conn_acquire_timeout) as conn:
+            for idx in range(0, len(modified_oids), batch_size):
+                with watch("get_conflicts_oids"):
+                    conflicts.extend(await conn.fetch(sql, txn._tid, modified_oids[idx : idx + batch_size]))
+        if PG_CONFLICT_CHECKED_OIDS is not None:
+            PG_CONFLICT_CHECKED_OIDS.inc(len(modified_oids))
+            PG_CONFLICTS.inc(len(conflicts))
+        return conflicts
 
     async def commit(self, transaction):
         async with watch_lock(transaction._lock, "commit_txn"):
@@ -1079,6 +1433,16 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
                 keys.append(record["id"])
         return keys
 
+    async def get_keys_after(self, txn, oid, after=None, page_size=1000):
+        sql = self._sql.get("GET_CHILDREN_KEYS_AFTER", self._objects_table_name)
+        async with self.acquire(txn, "keys_after") as conn:
+            return await conn.fetch(sql, oid, after or "", page_size)
+
+    async def get_children_after(self, txn, oid, after=None, page_size=1000):
+        sql = self._sql.get("GET_CHILDREN_AFTER", self._objects_table_name)
+        async with self.acquire(txn, "children_after") as conn:
+            return await conn.fetch(sql, oid, after or "", page_size)
+
     async def keys(self, txn, oid):
         sql = self._sql.get("GET_CHILDREN_KEYS", self._objects_table_name)
         async with self.acquire(txn, "keys") as conn:
@@ -1090,6 +1454,11 @@ WHERE tablename = '{}' AND indexname = '{}_parent_id_id_key';
         result = await self.get_one_row(txn, sql, parent_oid, id, metric="get_child")
         return result
 
+    async def get_path(self, txn, parent_oid, ids):
+        sql = self._sql.get("GET_PATH", self._objects_table_name)
+        async with self.acquire(txn, "get_path") as conn:
+            return await conn.fetch(sql, parent_oid, ids)
+
     async def get_children(self, txn, parent_oid, ids):
         sql = self._sql.get("GET_CHILDREN_BATCH", self._objects_table_name)
         async with self.acquire(txn, "get_children") as conn:
@@ -1156,13 +1525,10 @@ VALUES ($1::varchar({MAX_UID_LENGTH}), -1, 0, 0, TRUE, 'stub')""",
         sql = self._sql.get("READ_BLOB_CHUNK", self._blobs_table_name)
         return await self.get_one_row(txn, sql, bid, chunk, metric="load_blob_chunk")
 
-    async def read_blob_chunks(self, txn, bid):
-        async with self.acquire(txn, "read_blob_chunks") as conn:
-            # again, not accurate through an iterator
-            async for record in conn.cursor(bid):
-                # locks are dangerous in cursors since comsuming code might do
-                # sub-queries and they you end up with a deadlock
-                yield record
+    async def read_blob_chunks(self, txn, bid, start=0, end=None):
+        sql = self._sql.get("READ_BLOB_CHUNKS", self._blobs_table_name)
+        async with self.acquire(txn, "load_blob_chunks") as conn:
+            return await conn.fetch(sql, bid, start, end)
 
     async def del_blob(self, txn, bid):
         sql = self._sql.get("DELETE_BLOB", self._blobs_table_name)
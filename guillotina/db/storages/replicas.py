@@ -0,0 +1,179 @@
+import asyncio
+import itertools
+from typing import Dict, List, Optional
+
+import asyncpg
+
+from guillotina import glogging
+from guillotina._settings import app_settings
+
+
+try:
+    import prometheus_client
+
+    PG_POOL_ACQUIRES = prometheus_client.Counter(
+        "guillotina_db_pg_pool_acquires_total",
+        "Total count of connections acquired for read only transactions by pool.",
+        labelnames=["pool"],
+    )
+    PG_REPLICA_LAG = prometheus_client.Gauge(
+        "guillotina_db_pg_replica_lag_seconds",
+        "Replication lag of read replicas (in seconds)",
+        labelnames=["pool"],
+    )
+    PG_REPLICA_HEALTHY = prometheus_client.Gauge(
+        "guillotina_db_pg_replica_healthy",
+        "1 when the read replica is used for read only transactions",
+        labelnames=["pool"],
+    )
+except ImportError:
+    PG_POOL_ACQUIRES = None
+    PG_REPLICA_LAG = None
+    PG_REPLICA_HEALTHY = None
+
+
+log = glogging.getLogger("guillotina.storage")
+
+PRIMARY = "primary"
+
+# seconds since the last replayed transaction, 0 when everything received is replayed
+REPLICA_LAG_SQL = """
+SELECT CASE
+    WHEN NOT pg_is_in_recovery() OR pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0
+    ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0)
+END"""
+
+
+def record_acquire(pool_name: str) -> None:
+    if PG_POOL_ACQUIRES is not None:
+        PG_POOL_ACQUIRES.labels(pool=pool_name).inc()
+
+
+class Replica:
+    def __init__(self, name: str, dsn: str):
+        self.name = name
+        self.dsn = dsn
+        self.pool: Optional[asyncpg.pool.Pool] = None
+        self.healthy = False
+        self.lag: float = 0
+
+    def set_status(self, healthy: bool, lag: float = 0) -> None:
+        self.healthy = healthy
+        self.lag = lag
+        if PG_REPLICA_HEALTHY is not None:
+            PG_REPLICA_HEALTHY.labels(pool=self.name).set(int(healthy))
+            PG_REPLICA_LAG.labels(pool=self.name).set(lag)
+
+
+class ReadReplicas:
+    """
+    Pools of connections to read replicas used by read only transactions.
+
+    Replicas are checked every `check_interval` seconds and only the healthy
+    ones with less than `max_lag` seconds of replication lag are used, when
+    none is available connections are taken from the primary pool.
+    """
+
+    def __init__(
+        self,
+        dsns: List[str],
+        pool_size: int = 13,
+        conn_acquire_timeout: int = 20,
+        max_lag: float = 5,
+        check_interval: float = 5,
+    ):
+        self.replicas = [Replica(f"replica{idx}", dsn) for idx, dsn in enumerate(dsns)]
+        self._pool_size = pool_size
+        self._conn_acquire_timeout = conn_acquire_timeout
+        self._max_lag = max_lag
+        self._check_interval = check_interval
+        self._connection_options: Dict = {}
+        self._cycle = itertools.cycle(self.replicas)
+        self._check_task: Optional[asyncio.Task] = None
+        # connections handed out by replica pools, to release them to their pool
+        self._acquired: Dict[int, Replica] = {}
+
+    async def initialize(self, **kw):
+        self._connection_options = kw
+        await self.check()
+        self._check_task = asyncio.ensure_future(self._check_loop())
+
+    async def finalize(self):
+        if self._check_task is not None:
+            self._check_task.cancel()
+            self._check_task = None
+        for replica in self.replicas:
+            if replica.pool is not None:
+                replica.pool.terminate()
+                replica.pool = None
+            replica.set_status(False)
+        self._acquired.clear()
+
+    async def _check_loop(self):
+        while True:
+            await asyncio.sleep(self._check_interval)
+            try:
+                await self.check()
+            except asyncio.CancelledError:  # pragma: no cover
+                raise
+            except Exception:  # pragma: no cover
+                log.warning("Error checking read replicas", exc_info=True)
+
+    async def check(self):
+        await asyncio.gather(*[self._check_replica(replica) for replica in self.replicas])
+
+    async def _check_replica(self, replica: Replica):
+        try:
+            if replica.pool is None:
+                replica.pool = await asyncpg.create_pool(
+                    dsn=replica.dsn,
+                    max_size=self._pool_size,
+                    min_size=1,
+                    connection_class=app_settings["pg_connection_class"],
+                    **self._connection_options,
+                )
+            async with replica.pool.acquire(timeout=self._conn_acquire_timeout) as conn:
+                lag = float(await conn.fetchval(REPLICA_LAG_SQL))
+        except (OSError, asyncio.TimeoutError, asyncpg.exceptions.PostgresError, asyncpg.InterfaceError):
+            if replica.healthy:
+                log.warning(f"Read replica {replica.name} is not available", exc_info=True)
+            replica.set_status(False)
+            return
+        if lag > self._max_lag and replica.healthy:
+            log.warning(f"Read replica {replica.name} is lagging {lag} seconds")
+        replica.set_status(lag <= self._max_lag, lag)
+
+    def get_replica(self) -> Optional[Replica]:
+        for _ in range(len(self.replicas)):
+            replica = next(self._cycle)
+            if replica.healthy and replica.pool is not None:
+                return replica
+        return None
+
+    async def acquire(self) -> Optional[asyncpg.connection.Connection]:
+        """
+        Get a connection from a replica, None when no replica is available
+        """
+        replica = self.get_replica()
+        if replica is None:
+            return None
+        try:
+            conn = await replica.pool.acquire(timeout=self._conn_acquire_timeout)
+        except (OSError, asyncio.TimeoutError, asyncpg.exceptions.PostgresError, asyncpg.InterfaceError):
+            log.warning(f"Could not get connection from read replica {replica.name}", exc_info=True)
+            replica.set_status(False)
+            return None
+        self._acquired[id(conn)] = replica
+        record_acquire(replica.name)
+        return conn
+
+    async def release(self, conn) -> bool:
+        """
+        Release a connection to its replica pool, False if it is not from a replica
+        """
+        replica = self._acquired.pop(id(conn), None)
+        if replica is None:
+            return False
+        if replica.pool is not None:
+            await replica.pool.release(conn, timeout=1)
+        return True
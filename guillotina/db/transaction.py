@@ -4,7 +4,7 @@ import sys
 import time
 import warnings
 from collections import OrderedDict
-from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Union
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional, Tuple, Union
 
 from typing_extensions import TypedDict
 from zope.interface import implementer
@@ -14,6 +14,7 @@ from guillotina._settings import app_settings
 from guillotina.component import query_adapter
 from guillotina.const import ROOT_ID
 from guillotina.content import Container
+from guillotina.db.cache.singleflight import storage_flights
 from guillotina.db.db import Root
 from guillotina.db.interfaces import ITransaction, ITransactionCache, IWriter
 from guillotina.db.orm.interfaces import IBaseObject
@@ -106,27 +107,39 @@ class cache:
                 record_cache_metric(func.__name__, "hit", result, key_args)
                 return result
 
-            result = await func(self, *args, **kwargs)
-
-            record_cache_metric(func.__name__, "miss", result, key_args)
-
-            if result is not None:
-                if result == _EMPTY:
-                    await self._cache.set(result, keyset=[key_args])
-                else:
-                    try:
-                        if (
-                            not this.check_state_size
-                            or len(result["state"]) < self._cache.max_cache_record_size
-                        ):
-                            await self._cache.set(
-                                result,
-                                keyset=[key_args] + [key_gen(result) for key_gen in this.additional_keys],
-                            )
-                    except (TypeError, KeyError):
-                        await self._cache.set(result, **key_args)
+            async def _load():
+                result = await func(self, *args, **kwargs)
+
+                record_cache_metric(func.__name__, "miss", result, key_args)
+
+                if result is not None and not self.reads_from_replica:
+                    if result == _EMPTY:
+                        await self._cache.set(result, keyset=[key_args])
+                    else:
+                        try:
+                            if (
+                                not this.check_state_size
+                                or len(result["state"]) < self._cache.max_cache_record_size
+                            ):
+                                await self._cache.set(
+                                    result,
+                                    keyset=[key_args] + [key_gen(result) for key_gen in this.additional_keys],
+                                )
+                        except (TypeError, KeyError):
+                            await self._cache.set(result, **key_args)
                 return result
 
+            if self.reads_from_replica:
+                # replica loads can be stale, do not share them
+                return await _load()
+            try:
+                cache_key = self._cache.get_key(**key_args)
+            except TypeError:
+                # objects without uuid yet
+                return await _load()
+            # concurrent misses of the same key wait for a single storage load
+            return await storage_flights.run(func.__name__, cache_key, _load)
+
         return _wrapper
 
 
@@ -210,7 +223,7 @@ class Transaction:
 
     async def get_connection(self):
         if self._db_conn is None:
-            self._db_conn = await self._manager._storage.open()
+            self._db_conn = await self._manager._storage.open(read_only=self.read_only)
             self._query_count_start = self.get_query_count()
         return self._db_conn
 
@@ -293,6 +306,14 @@ class Transaction:
             return True
         return False
 
+    @property
+    def reads_from_replica(self) -> bool:
+        """
+        Loads of read only transactions can be served by read replicas
+        that lag behind the primary, they must not fill the shared cache
+        """
+        return self.read_only and getattr(self._manager._storage, "replicas", None) is not None
+
     @profilable
     def register(self, obj: IBaseObject, new_oid: Optional[str] = None):
         """We are adding a new object on the DB"""
@@ -381,6 +402,69 @@ class Transaction:
 
         return obj
 
+    @profilable
+    async def get_many(self, oids: List[str], ignore_registered: bool = False) -> List[IBaseObject]:
+        """
+        Get the objects of a list of oids, in the same order.
+
+        Registered and cached objects are used when available, the rest are
+        loaded from the storage with one query and stored in the cache.
+        Oids that can not be found are left out of the result.
+        """
+        results: Dict[str, Any] = {}
+        uncached: Dict[str, None] = {}
+        for oid in oids:
+            if (not ignore_registered and oid in self.modified) or oid in results or oid in uncached:
+                continue
+            result = self._manager._hard_cache.get(oid, None)
+            if result is None:
+                uncached[oid] = None
+                continue
+            results[oid] = result
+
+        missing = []
+        if len(uncached) > 0:
+            cached = await self._cache.get_many([{"oid": oid} for oid in uncached])
+            for oid, result in zip(uncached, cached):
+                if result is None:
+                    missing.append(oid)
+                    continue
+                record_cache_metric("_get", "hit", result, {"oid": oid})
+                results[oid] = result
+
+        if len(missing) > 0:
+            to_cache = []
+            for result in await self._manager._storage.load_many(self, missing):
+                record_cache_metric("_get", "miss", result, {"oid": result["zoid"]})
+                if len(result["state"]) < self._cache.max_cache_record_size:
+                    try:
+                        keyset = [
+                            {"oid": result["zoid"]},
+                            {"container": result["parent_id"], "id": result["id"]},
+                        ]
+                    except KeyError:
+                        keyset = [{"oid": result["zoid"]}]
+                    to_cache.append((result, keyset))
+                results[result["zoid"]] = result
+            if not self.reads_from_replica:
+                await self._cache.set_many(to_cache)
+
+        objects = []
+        for oid in oids:
+            obj = None
+            if not ignore_registered:
+                obj = self.modified.get(oid, None)
+            if obj is None:
+                result = results.get(oid, None)
+                if result is None:
+                    continue
+                obj = app_settings["object_reader"](result)
+                obj.__txn__ = self
+                if obj.__immutable_cache__:
+                    self._manager._hard_cache[oid] = result
+            objects.append(obj)
+        return objects
+
     async def commit(self) -> None:
         restarts = 0
         while True:
@@ -442,19 +526,22 @@ class Transaction:
         self._before_commit = []
 
     @profilable
-    async def _store_object(self, obj, uid, added=False):
-        # There is no serial
-        if added:
-            serial = None
-        else:
-            serial = getattr(obj, "__serial__", None) or 0
+    async def _store_objects(self, objects, added=False):
+        items = []
+        for uid, obj in objects.items():
+            # There is no serial
+            if added:
+                serial = None
+            else:
+                serial = getattr(obj, "__serial__", None) or 0
+            items.append((uid, serial, IWriter(obj), obj))
 
-        writer = IWriter(obj)
-        await self._manager._storage.store(uid, serial, writer, obj, self)
-        obj.__serial__ = self._tid
-        obj.__uuid__ = uid
-        if obj.__txn__ is None:
-            obj.__txn__ = self
+        await self._manager._storage.store_many(self, items)
+        for uid, _, _, obj in items:
+            obj.__serial__ = self._tid
+            obj.__uuid__ = uid
+            if obj.__txn__ is None:
+                obj.__txn__ = self
 
     async def initialize_tid(self) -> None:
         if not self.read_only:
@@ -471,11 +558,12 @@ class Transaction:
         if self._db_txn is None:
             await self.storage.start_transaction(self)
 
-        for oid, obj in self.added.items():
-            await self._store_object(obj, oid, True)
-            obj.__new_marker__ = False
-        for oid, obj in self.modified.items():
-            await self._store_object(obj, oid)
+        if len(self.added) > 0:
+            await self._store_objects(self.added, True)
+            for obj in self.added.values():
+                obj.__new_marker__ = False
+        if len(self.modified) > 0:
+            await self._store_objects(self.modified)
         for oid, obj in self.deleted.items():
             await self._manager._storage.delete(self, oid)
 
@@ -550,6 +638,56 @@ class Transaction:
 
         return self._fill_object(result, parent)
 
+    @profilable
+    async def get_path(self, parent: IBaseObject, keys: List[str]) -> List[IBaseObject]:
+        """
+        Resolve a chain of children ids starting at parent.
+
+        Cached objects are used while possible, the rest of the path is then
+        loaded from the storage with one query and stored in the cache.
+        Resolution stops at the first id that can not be found.
+        """
+        objects: List[IBaseObject] = []
+        for idx, key in enumerate(keys):
+            uuid = self.added_children.get((parent.__uuid__, key), None)
+            if uuid is not None:
+                obj = self.added[uuid]
+            else:
+                result = await self._cache.get(container=parent, id=key)
+                if result is None:
+                    objects.extend(await self._get_path(parent, keys[idx:]))
+                    break
+                record_cache_metric("_get_child", "hit", result, {"container": parent, "id": key})
+                obj = self._load_child(result, parent)
+                if obj is None:
+                    break
+            objects.append(obj)
+            parent = obj
+        return objects
+
+    async def _get_path(self, parent: IBaseObject, keys: List[str]) -> List[IBaseObject]:
+        objects = []
+        for result in await self._manager._storage.get_path(self, parent.__uuid__, keys):
+            record_cache_metric("_get_child", "miss", result, {"container": parent, "id": result["id"]})
+            if not self.reads_from_replica and len(result["state"]) < self._cache.max_cache_record_size:
+                await self._cache.set(
+                    result, keyset=[{"container": parent, "id": result["id"]}, {"oid": result["zoid"]}]
+                )
+            obj = self._load_child(result, parent)
+            if obj is None:
+                break
+            objects.append(obj)
+            parent = obj
+        return objects
+
+    def _load_child(self, result: dict, parent: IBaseObject) -> Optional[IBaseObject]:
+        if result["zoid"] in self.deleted:
+            return None
+        obj = self.modified.get(result["zoid"], None)
+        if obj is not None:
+            return obj
+        return self._fill_object(result, parent)
+
     def _fill_object(self, item: dict, parent: IBaseObject) -> IBaseObject:
         obj = app_settings["object_reader"](item)
         obj.__parent__ = parent
@@ -558,7 +696,7 @@ class Transaction:
 
     async def _get_batch_children(self, parent: IBaseObject, keys: List[str]) -> AsyncIterator[IBaseObject]:
         for litem in await self._manager._storage.get_children(self, parent.__uuid__, keys):
-            if len(litem["state"]) < self._cache.max_cache_record_size:
+            if not self.reads_from_replica and len(litem["state"]) < self._cache.max_cache_record_size:
                 await self._cache.set(litem, container=parent, id=litem["id"])
             yield self._fill_object(litem, parent)
 
@@ -652,8 +790,8 @@ class Transaction:
     async def read_blob_chunk(self, bid, chunk=0):
         return await self._manager._storage.read_blob_chunk(self, bid, chunk)
 
-    async def read_blob_chunks(self, bid):
-        return await self._manager._storage.read_blob_chunks(self, bid)
+    async def read_blob_chunks(self, bid, start=0, end=None):
+        return await self._manager._storage.read_blob_chunks(self, bid, start, end)
 
     async def get_total_number_of_objects(self):
         return await self._manager._storage.get_total_number_of_objects(self)
@@ -682,13 +820,39 @@ class Transaction:
 
     @profilable
     async def iterate_keys(self, oid, page_size=1000):
-        page = 1
-        keys = await self._manager._storage.get_page_of_keys(self, oid, page=page, page_size=page_size)
-        while len(keys) > 0:
-            for key in keys:
-                yield key
-            page += 1
-            keys = await self._manager._storage.get_page_of_keys(self, oid, page=page, page_size=page_size)
+        # keyset pagination, every page costs the same
+        after = None
+        while True:
+            records = await self._manager._storage.get_keys_after(self, oid, after=after, page_size=page_size)
+            for record in records:
+                yield record["id"]
+            if len(records) < page_size:
+                break
+            after = records[-1]["zoid"]
+
+    @profilable
+    async def get_page_of_children(
+        self, parent: IBaseObject, after: Optional[str] = None, page_size: int = 1000
+    ) -> Tuple[List[IBaseObject], Optional[str]]:
+        """
+        Children of parent ordered by oid after the oid ``after``, loaded with
+        one query, and the oid to get the next page after (None on the last page)
+        """
+        records = await self._manager._storage.get_children_after(
+            self, parent.__uuid__, after=after, page_size=page_size
+        )
+        children = []
+        to_cache = []
+        for record in records:
+            if len(record["state"]) < self._cache.max_cache_record_size:
+                to_cache.append((record, [{"container": parent, "id": record["id"]}]))
+            child = self._load_child(record, parent)
+            if child is not None:
+                children.append(child)
+        if len(to_cache) > 0 and not self.reads_from_replica:
+            await self._cache.set_many(to_cache)
+        next_after = records[-1]["zoid"] if len(records) == page_size else None
+        return children, next_after
 
     def __enter__(self):
         task_vars.tm.set(self.manager)
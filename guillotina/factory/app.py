@@ -7,6 +7,7 @@ from jwcrypto import jwk
 
 from guillotina import configure, glogging, traversal
 from guillotina._settings import app_settings, default_settings
+from guillotina.auth.cache import token_cache
 from guillotina.behaviors import apply_concrete_behaviors
 from guillotina.component import get_utility, provide_utility
 from guillotina.configure.config import ConfigurationMachine
@@ -262,6 +263,8 @@ async def startup_app(config_file=None, settings=None, loop=None, server_app=Non
             del app_settings[k]
 
     optimize_settings(app_settings)
+    # tokens verified with the secret of a previous app
+    token_cache.clear()
 
     await notify(ApplicationConfiguredEvent(server_app, loop))
 
@@ -202,35 +202,32 @@ class DBFileStorageManagerAdapter:
         if file is None or file._blob.chunk_sizes is None:
             raise RangeNotSupported(field=self.field)
 
+        if start >= end:
+            return
+
         blob = file._blob
         bfile = blob.open()
+        try:
+            first_chunk, position = bfile.find_chunk(start)
+            last_chunk, _ = bfile.find_chunk(end - 1)
+        except BlobChunkNotFound:
+            raise RangeNotFound(field=self.field, blob=blob, start=start, end=end)
+
         total = 0
-        start_bytes_idx = start
-        # find first blob
-        search_total = 0
-        for chunk_idx, chunk_size in sorted(blob.chunk_sizes.items(), key=lambda vv: vv[0]):
-            if start_bytes_idx >= search_total and start_bytes_idx < (search_total + chunk_size):
-                start_bytes_idx = start - search_total
-                end_bytes_idx = start_bytes_idx + ((end - start) - total)
-
-                while total < (end - start):
-                    # now, just read from here until end
-                    try:
-                        chunk = (await bfile.async_read_chunk(chunk_idx))[start_bytes_idx:end_bytes_idx]
-                    except BlobChunkNotFound:
-                        raise RangeNotFound(field=self.field, blob=blob, start=start, end=end)
-                    if len(chunk) == 0:  # pragma: no cover
-                        raise RangeNotFound(field=self.field, blob=blob, start=start, end=end)
-                    total += len(chunk)
-                    yield chunk
-                    chunk_idx += 1
-                    start_bytes_idx = 0
-                    end_bytes_idx = (end - start) - total
-
-                if total != (end - start):  # pragma: no cover
-                    raise RangeNotFound(field=self.field, blob=blob, start=start, end=end)
-            else:
-                search_total += chunk_size
+        try:
+            async for chunk in bfile.iter_async_read(first_chunk, last_chunk + 1):
+                data = chunk[max(start - position, 0) : end - position]
+                position += len(chunk)
+                if len(data) == 0:
+                    # empty chunk
+                    continue
+                total += len(data)
+                yield data
+        except BlobChunkNotFound:
+            raise RangeNotFound(field=self.field, blob=blob, start=start, end=end)
+
+        if total != (end - start):  # pragma: no cover
+            raise RangeNotFound(field=self.field, blob=blob, start=start, end=end)
 
     async def append(self, dm, iterable, offset) -> int:
         blob = dm.get("_blob")
@@ -3,6 +3,7 @@ from .async_util import IAsyncJobPool  # noqa
 from .async_util import IAsyncUtility  # noqa
 from .async_util import IAuthValidationUtility  # noqa
 from .async_util import ICacheUtility  # noqa
+from .async_util import IDurableQueueUtility  # noqa
 from .async_util import IPubSubUtility  # noqa
 from .async_util import IQueueUtility  # noqa
 from .async_util import ISessionManagerUtility  # noqa
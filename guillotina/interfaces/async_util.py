@@ -23,6 +23,19 @@ class IAsyncJobPool(IAsyncUtility):
     pass
 
 
+class IDurableQueueUtility(IAsyncUtility):
+    def accepts(func, args, kwargs):
+        """
+        If the job can be stored, the function must be importable
+        and the arguments json serializable
+        """
+
+    async def add(func, args=None, kwargs=None, db_id=None, container_id=None):
+        """
+        Store a job to be run by the workers of any process
+        """
+
+
 class ICacheUtility(IAsyncUtility):
     pass
 
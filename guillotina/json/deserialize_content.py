@@ -1,12 +1,13 @@
 # -*- coding: utf-8 -*-
 import asyncio
 from copy import deepcopy
-from typing import Any, Dict, List, Type
+from typing import Any, Dict, List, Optional, Tuple, Type
 
-from zope.interface import Interface
+from lru import LRU
+from zope.interface import Interface, providedBy
 
 from guillotina import configure, glogging
-from guillotina.component import ComponentLookupError, get_adapter, query_utility
+from guillotina.component import ComponentLookupError, get_adapter, get_component_registry, query_utility
 from guillotina.content import get_all_behaviors, get_cached_factory
 from guillotina.db.transaction import _EMPTY
 from guillotina.directives import merged_tagged_value_dict, write_permission
@@ -29,6 +30,56 @@ from guillotina.utils import apply_coroutine, get_security_policy
 
 logger = glogging.getLogger("guillotina")
 
+MAX_PLANS = 1000
+
+
+def _has_invariants(schema: Type[Interface]) -> bool:
+    if schema.queryTaggedValue("invariants", []):
+        return True
+    return any(_has_invariants(base) for base in schema.__bases__)
+
+
+class DeserializationPlan:
+    """
+    Writable fields of a schema as ``name: (field, write permission,
+    converter)``, converters are the ``IJSONToValue`` adapters of the fields.
+    """
+
+    def __init__(self, schema: Type[Interface], generation: int):
+        self.schema = schema
+        self.generation = generation
+        adapters = get_component_registry().adapters
+        write_permissions = merged_tagged_value_dict(schema, write_permission.key)
+        self.fields: Dict[str, Tuple[IField, Optional[str], Any]] = {}
+        for name, field in get_fields(schema).items():
+            if name in RESERVED_ATTRS:
+                continue
+
+            if field.readonly:
+                continue
+
+            converter = adapters.lookup((providedBy(field),), IJSONToValue)
+            self.fields[name] = (field, write_permissions.get(name), converter)
+        self.order = {name: idx for idx, name in enumerate(self.fields)}
+        self.invariants = _has_invariants(schema)
+
+
+# plans are checked against the schema object and the registrations the
+# converters were resolved with
+_plans = LRU(MAX_PLANS)
+
+
+def get_deserialization_plan(schema: Type[Interface]) -> DeserializationPlan:
+    generation = get_component_registry().adapters.generation
+    plan = _plans.get(schema.__identifier__)
+    if plan is None or plan.schema is not schema or plan.generation != generation:
+        plan = _plans[schema.__identifier__] = DeserializationPlan(schema, generation)
+    return plan
+
+
+def clear_deserialization_plans():
+    _plans.clear()
+
 
 @configure.adapter(for_=(IResource, Interface), provides=IResourceDeserializeFromJson)
 class DeserializeFromJson:
@@ -90,30 +141,32 @@ class DeserializeFromJson:
         validate_all: bool = False,
         behavior: bool = False,
     ):
-        write_permissions = merged_tagged_value_dict(schema, write_permission.key)
-        changed = False
-        for name, field in get_fields(schema).items():
-            if name in RESERVED_ATTRS:
-                continue
-
-            if field.readonly:
-                continue
+        plan = get_deserialization_plan(schema)
+        if behavior:
+            sdata = data.get(schema.__identifier__)
+            if not isinstance(sdata, dict):
+                sdata = {}
+        else:
+            sdata = data
+        if validate_all:
+            names = plan.fields.keys()
+        else:
+            # only the fields in the payload are patched, in schema order
+            names = sorted((name for name in sdata if name in plan.order), key=plan.order.__getitem__)
+        # subclasses can customize how every value is converted
+        custom = type(self).get_value is not DeserializeFromJson.get_value
 
-            if behavior:
-                found = False
-                if data.get(schema.__identifier__):
-                    sdata = data[schema.__identifier__]
-                    data_value = sdata[name] if name in sdata else None
-                    found = True if name in sdata else False
-            else:
-                data_value = data[name] if name in data else None
-                found = True if name in data else False
+        changed = False
+        for name in names:
+            field, permission_name, converter = plan.fields[name]
+            found = name in sdata
+            data_value = sdata[name] if found else None
 
             # Only set missing_value when it's not present in 'data' and we are validating all fields
             must_set_mv = not found and validate_all and field.missing_value is not None
 
             if found or must_set_mv:
-                if found and not self.check_permission(write_permissions.get(name)):
+                if found and not self.check_permission(permission_name):
                     raise Unauthorized("Write permission not allowed")
 
                 if must_set_mv:
@@ -121,7 +174,10 @@ class DeserializeFromJson:
 
                 try:
                     field = field.bind(obj)
-                    value = await self.get_value(field, obj, data_value)
+                    if custom:
+                        value = await self.get_value(field, obj, data_value)
+                    else:
+                        value = await self.get_value(field, obj, data_value, converter)
                 except ValueError as e:
                     errors.append({"message": "Value error", "field": name, "error": e})
                 except ValidationError as e:
@@ -162,30 +218,34 @@ class DeserializeFromJson:
                         }
                     )
 
-        for error in await validate_invariants(schema, obj):
-            if isinstance(error, ValidationError):
-                errors.append(
-                    {
-                        "message": error.doc(),
-                        "value": error.value,
-                        "field": error.field_name,
-                        "error": error.errors,
-                    }
-                )
-            else:
-                if len(getattr(error, "args", [])) > 0 and isinstance(error.args[0], str):
-                    message = error.args[0]
+        if plan.invariants:
+            for error in await validate_invariants(schema, obj):
+                if isinstance(error, ValidationError):
+                    errors.append(
+                        {
+                            "message": error.doc(),
+                            "value": error.value,
+                            "field": error.field_name,
+                            "error": error.errors,
+                        }
+                    )
                 else:
-                    message = error.__doc__
-                errors.append({"message": message, "error": error})
+                    if len(getattr(error, "args", [])) > 0 and isinstance(error.args[0], str):
+                        message = error.args[0]
+                    else:
+                        message = error.__doc__
+                    errors.append({"message": message, "error": error})
 
         if changed:
             obj.register()
 
-    async def get_value(self, field: IField, obj: IResource, value: Any) -> Any:
+    async def get_value(self, field: IField, obj: IResource, value: Any, converter=None) -> Any:
         try:
             if value is not None:
-                value = get_adapter(field, IJSONToValue, args=[value, obj])
+                if converter is not None:
+                    value = converter(field, value, obj)
+                else:
+                    value = get_adapter(field, IJSONToValue, args=[value, obj])
                 if asyncio.iscoroutine(value):
                     value = await value
             field.validate(value)
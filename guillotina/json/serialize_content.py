@@ -1,7 +1,9 @@
 # -*- coding: utf-8 -*-
 import asyncio
 import logging
+from typing import List, Tuple
 
+from lru import LRU
 from zope.interface import Interface
 
 from guillotina import app_settings, configure
@@ -18,7 +20,7 @@ from guillotina.interfaces import (
 )
 from guillotina.json.serialize_value import json_compatible
 from guillotina.profile import profilable
-from guillotina.schema import get_fields
+from guillotina.schema import Field, get_fields
 from guillotina.utils import apply_coroutine, get_object_url, get_security_policy
 
 
@@ -26,6 +28,83 @@ logger = logging.getLogger("guillotina")
 
 
 MAX_ALLOWED = 20
+MAX_PLANS = 1000
+
+PRIMITIVE_TYPES = (str, bool, int, float)
+
+
+class SchemaPlan:
+    """
+    Fields of a schema to serialize with an include/omit filter as
+    ``(name, field, read permission, plain)`` tuples, plain fields are read
+    with ``getattr``.
+    """
+
+    def __init__(self, schema, behavior: bool, include: Tuple[str, ...], omit: Tuple[str, ...]):
+        self.schema = schema
+        read_permissions = merged_tagged_value_dict(schema, read_permission.key)
+        fields = []
+        for name, field in get_fields(schema).items():
+            if behavior:
+                # omit/include for behaviors need full name
+                dotted_name = schema.__identifier__ + "." + name
+            else:
+                dotted_name = name
+
+            if "*" not in include and (
+                dotted_name in omit
+                or (
+                    len(include) > 0 and (dotted_name not in include and schema.__identifier__ not in include)
+                )
+            ):
+                # make sure the fields aren't filtered
+                continue
+
+            plain = type(field).get is Field.get
+            fields.append((name, field, read_permissions.get(name), plain))
+        self.fields = tuple(fields)
+
+
+class SerializationPlan:
+    """
+    What does not change between the objects of a type serialized with the
+    same include/omit filter.
+    """
+
+    def __init__(self, factory, include: Tuple[str, ...]):
+        self.factory = factory
+        self.static_behaviors = tuple(
+            behavior_schema.__identifier__ for behavior_schema in factory.behaviors or ()
+        )
+        included_ifaces = [name for name in include if "." in name]
+        included_ifaces.extend([name.rsplit(".", 1)[0] for name in include if "." in name])
+        self.included_ifaces = frozenset(included_ifaces)
+
+
+# plans are checked against the factory and schemas in FACTORY_CACHE and
+# BEHAVIOR_CACHE, a type or behavior defined again gets a new plan
+_plans = LRU(MAX_PLANS)
+
+
+def get_serialization_plan(type_name: str, include: List[str], omit: List[str]) -> SerializationPlan:
+    factory = get_cached_factory(type_name)
+    key = (type_name, tuple(include), tuple(omit))
+    plan = _plans.get(key)
+    if plan is None or plan.factory is not factory:
+        plan = _plans[key] = SerializationPlan(factory, key[1])
+    return plan
+
+
+def get_schema_plan(schema, behavior: bool, include: List[str], omit: List[str]) -> SchemaPlan:
+    key = (schema.__identifier__, behavior, tuple(include), tuple(omit))
+    plan = _plans.get(key)
+    if plan is None or plan.schema is not schema:
+        plan = _plans[key] = SchemaPlan(schema, behavior, key[2], key[3])
+    return plan
+
+
+def clear_serialization_plans():
+    _plans.clear()
 
 
 @configure.adapter(for_=(IResource, Interface), provides=IResourceSerializeToJson)
@@ -52,32 +131,27 @@ class SerializeToJson(object):
         else:
             parent_summary = {}
 
-        factory = get_cached_factory(self.context.type_name)
-        behaviors = []
-        for behavior_schema in factory.behaviors or ():
-            behaviors.append(behavior_schema.__identifier__)
+        plan = get_serialization_plan(self.context.type_name, self.include, self.omit)
 
         result = {
             "@id": get_object_url(self.context, self.request),
             "@type": self.context.type_name,
             "@name": self.context.__name__,
             "@uid": self.context.uuid,
-            "@static_behaviors": behaviors,
+            "@static_behaviors": list(plan.static_behaviors),
             "parent": parent_summary,  # should be @parent
             "is_folderish": IFolder.providedBy(self.context),  # eek, should be @folderish?
             "creation_date": json_compatible(self.context.creation_date),
             "modification_date": json_compatible(self.context.modification_date),
         }
 
-        main_schema = factory.schema
-        await self.get_schema(main_schema, self.context, result, False)
+        await self.get_schema(plan.factory.schema, self.context, result, False)
 
         # include can be one of:
         # - <field name> on content schema
         # - namespace.IBehavior
         # - namespace.IBehavior.field_name
-        included_ifaces = [name for name in self.include if "." in name]
-        included_ifaces.extend([name.rsplit(".", 1)[0] for name in self.include if "." in name])
+        included_ifaces = plan.included_ifaces
         for behavior_schema, behavior in await get_all_behaviors(self.context, load=False):
             if "*" not in self.include:
                 dotted_name = behavior_schema.__identifier__
@@ -100,30 +174,29 @@ class SerializeToJson(object):
 
     @profilable
     async def get_schema(self, schema, context, result, behavior):
-        read_permissions = merged_tagged_value_dict(schema, read_permission.key)
+        plan = get_schema_plan(schema, behavior, self.include, self.omit)
+        # subclasses can customize how every field is serialized
+        custom = type(self).serialize_field is not SerializeToJson.serialize_field
         schema_serial = {}
-        for name, field in get_fields(schema).items():
-
-            if not self.check_permission(read_permissions.get(name)):
+        for name, field, permission_name, plain in plan.fields:
+            if permission_name is not None and not self.check_permission(permission_name):
                 continue
 
-            if behavior:
-                # omit/include for behaviors need full name
-                dotted_name = schema.__identifier__ + "." + name
+            if custom:
+                value = await self.serialize_field(context, field)
+            elif plain:
+                try:
+                    value = getattr(context, name)
+                except Exception:
+                    value = await self.serialize_field(context, field)
+                else:
+                    if value is not None and type(value) not in PRIMITIVE_TYPES:
+                        value = json_compatible(value)
+                        if asyncio.iscoroutine(value):
+                            value = await value
             else:
-                dotted_name = name
-
-            if "*" not in self.include and (
-                dotted_name in self.omit
-                or (
-                    len(self.include) > 0
-                    and (dotted_name not in self.include and schema.__identifier__ not in self.include)
-                )
-            ):
-                # make sure the fields aren't filtered
-                continue
+                value = await self.serialize_field(context, field)
 
-            value = await self.serialize_field(context, field)
             if not behavior:
                 result[name] = value
             else:
@@ -2,3 +2,4 @@ from . import cache
 
 
 security_map_cache = cache.SecurityMapCacheManager()
+decision_cache = cache.SecurityDecisionCache()
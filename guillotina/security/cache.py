@@ -1,3 +1,6 @@
+from lru import LRU
+
+
 class SecurityMapCacheManager:
     def __init__(self):
         self._cache = {}
@@ -14,3 +17,78 @@ class SecurityMapCacheManager:
 
     def put(self, key, security_map):
         self._cache[key] = {"byrow": security_map._byrow, "bycol": security_map._bycol}
+
+
+class SecurityDecisionCache:
+    """
+    Process wide cache of security decisions.
+
+    Decisions are grouped by the oid of the object they were taken on and keyed
+    with the serials of the object and all its parents, the principal and the
+    permission. Committing a change on any object of the chain makes previous
+    decisions unreachable, so invalidating is only needed to release memory.
+    """
+
+    max_decisions_per_object = 1000
+
+    def __init__(self, size=None):
+        self._size = size
+        self._cache = None
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def size(self):
+        if self._size is not None:
+            return self._size
+        from guillotina import app_settings
+
+        return app_settings.get("security_decision_cache_size", 0)
+
+    def _get_cache(self):
+        if self._cache is None:
+            size = self.size
+            if not size:
+                return None
+            self._cache = LRU(size)
+        return self._cache
+
+    def get(self, oid, key):
+        cache = self._get_cache()
+        if cache is None:
+            return None
+        decisions = cache.get(oid)
+        if decisions is not None:
+            decision = decisions.get(key)
+            if decision is not None:
+                self.hits += 1
+                return decision
+        self.misses += 1
+        return None
+
+    def set(self, oid, key, decision):
+        cache = self._get_cache()
+        if cache is None:
+            return
+        decisions = cache.get(oid)
+        if decisions is None or len(decisions) >= self.max_decisions_per_object:
+            decisions = cache[oid] = {}
+        decisions[key] = decision
+
+    def invalidate(self, oids):
+        if not self._cache:
+            return
+        for oid in oids:
+            try:
+                del self._cache[oid]
+            except KeyError:
+                pass
+
+    def clear(self):
+        # size is read again on next use
+        self._cache = None
+
+    def __len__(self):
+        if self._cache is None:
+            return 0
+        return len(self._cache)
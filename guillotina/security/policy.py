@@ -12,6 +12,7 @@ from guillotina.interfaces import (
     Deny,
     IGroups,
     IInheritPermissionMap,
+    IObjectPermissionsModifiedEvent,
     IPrincipal,
     IPrincipalPermissionMap,
     IPrincipalRoleMap,
@@ -22,6 +23,7 @@ from guillotina.interfaces import (
     Unset,
 )
 from guillotina.profile import profilable
+from guillotina.security import decision_cache
 from guillotina.security.security_code import (
     principal_permission_manager,
     principal_role_manager,
@@ -52,14 +54,64 @@ class CacheEntry:
     pass
 
 
+def _settings_key(settings) -> frozenset:
+    return frozenset((settings or {}).items())
+
+
+def chain_key(obj) -> Optional[tuple]:
+    """
+    Key of the committed state of an object and its parents, None when
+    any of them has changes that are not committed yet
+    """
+    key = []
+    while obj is not None:
+        oid = getattr(obj, "__uuid__", None)
+        serial = getattr(obj, "__serial__", None)
+        if oid is None or serial is None or getattr(obj, "__new_marker__", False):
+            return None
+        txn = getattr(obj, "__txn__", None)
+        if txn is not None and (oid in txn.modified or oid in txn.added):
+            return None
+        key.append((oid, serial))
+        obj = getattr(obj, "__parent__", None)
+    return tuple(key)
+
+
+@configure.subscriber(for_=(IBaseObject, IObjectPermissionsModifiedEvent))
+async def invalidate_decision_cache(obj, event):
+    decision_cache.clear()
+
+
 @configure.adapter(for_=IPrincipal, provides=ISecurityPolicy)
 class SecurityPolicy:
     def __init__(self, principal: IPrincipal):
         self.principal = principal
         self._cache = LRU(100)
+        self._principal_key = None
 
     def invalidate_cache(self):
         self._cache.clear()
+        self._principal_key = None
+
+    @property
+    def principal_key(self) -> tuple:
+        # everything about the principal a decision depends on
+        if self._principal_key is None:
+            principal = self.principal
+            groups = tuple(getattr(principal, "groups", None) or [])
+            key = [
+                principal.id,
+                groups,
+                _settings_key(getattr(principal, "roles", None)),
+                _settings_key(getattr(principal, "permissions", None)),
+            ]
+            if groups:
+                groups_utility = get_utility(IGroups)
+                for group_id in groups:
+                    group = groups_utility.get_principal(group_id, principal)
+                    key.append((_settings_key(group.roles), _settings_key(group.permissions)))
+            self._principal_key = tuple(key)
+        return self._principal_key
 
     @profilable
     def check_permission(self, permission, obj):
@@ -78,10 +130,21 @@ class SecurityPolicy:
             if self.principal is SystemUser:
                 return True
 
+            # Decisions on committed objects are shared between requests
+            chain = chain_key(obj)
+            if chain:
+                oid = chain[0][0]
+                key = (chain, self.principal_key, permission)
+                decision = decision_cache.get(oid, key)
+                if decision is not None:
+                    return decision
+
             # Check the permission
             groups = getattr(self.principal, "groups", None) or []
-            if self.cached_decision(obj, self.principal.id, groups, permission):
-                return True
+            decision = bool(self.cached_decision(obj, self.principal.id, groups, permission))
+            if chain:
+                decision_cache.set(oid, key, decision)
+            return decision
 
         return False
 
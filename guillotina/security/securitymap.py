@@ -1,4 +1,5 @@
 from guillotina import task_vars
+from guillotina.security import decision_cache
 
 
 class SecurityMap:
@@ -36,6 +37,7 @@ class SecurityMap:
     def _invalidated_policy_cache(self):
         policies = task_vars.security_policies.get() or {}
         policies.clear()
+        decision_cache.clear()
 
     def del_cell(self, rowentry, colentry):
         row = self._byrow.get(rowentry)
@@ -303,6 +303,13 @@ async def matching_service(context, request):
     return request.matchdict
 
 
+@configure.service(context=IContainer, method="GET", permission="guillotina.AccessContent", name="@sleep")
+async def sleep_service(context, request):
+    seconds = float(request.query.get("seconds", 0))
+    await asyncio.sleep(seconds)
+    return {"seconds": seconds}
+
+
 @configure.service(
     context=IApplication,
     method="GET",
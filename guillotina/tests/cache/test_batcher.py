@@ -0,0 +1,78 @@
+import asyncio
+from unittest import mock
+
+import pytest
+
+from guillotina.contrib.cache.batcher import InvalidationBatcher
+from guillotina.contrib.cache.utility import CacheUtility
+
+
+pytestmark = pytest.mark.asyncio
+
+
+def _get_utility():
+    utility = mock.Mock()
+    utility.updates_channel = "guillotina"
+    utility._subscriber.publish = mock.AsyncMock()
+    return utility
+
+
+async def test_coalesce_commits():
+    utility = _get_utility()
+    batcher = InvalidationBatcher(utility, window=10)
+    await batcher.add("tid1", ["a", "b"], {"a": "a1"})
+    await batcher.add("tid2", ["b", "c"], {"b": "b2"})
+    await batcher.add("tid3", ["a"])
+    assert len(batcher) == 3
+    utility._subscriber.publish.assert_not_called()
+
+    await asyncio.sleep(0.05)
+    utility._subscriber.publish.assert_called_once()
+    channel, tid, data = utility._subscriber.publish.call_args[0]
+    assert channel == "guillotina"
+    assert data == {"tid": tid, "keys": ["a", "b", "c"], "push": {"b": "b2"}}
+    # own message is ignored when it comes back
+    utility.ignore_tid.assert_called_once_with(tid)
+    assert batcher.commits == 3
+    assert batcher.batches == 1
+    assert len(batcher) == 0
+
+
+async def test_publish_when_batch_is_full():
+    utility = _get_utility()
+    batcher = InvalidationBatcher(utility, window=1000, max_keys=3)
+    await batcher.add("tid1", ["a", "b"])
+    utility._subscriber.publish.assert_not_called()
+    await batcher.add("tid2", ["c"])
+    utility._subscriber.publish.assert_called_once()
+    await batcher.close()
+    utility._subscriber.publish.assert_called_once()
+
+
+async def test_no_window_publishes_every_commit():
+    utility = _get_utility()
+    batcher = InvalidationBatcher(utility, window=0)
+    await batcher.add("tid1", ["a"])
+    utility._subscriber.publish.assert_called_once_with(
+        "guillotina", "tid1", {"tid": "tid1", "keys": ["a"], "push": {}}
+    )
+    utility.ignore_tid.assert_called_once_with("tid1")
+
+
+async def test_batched_message_is_ignored_by_sender():
+    utility = CacheUtility()
+    utility._memory_cache = mock.MagicMock()
+    utility._memory_cache.__contains__.return_value = True
+    utility._subscriber = mock.Mock()
+    utility._subscriber.publish = mock.AsyncMock()
+    batcher = InvalidationBatcher(utility, window=0)
+    await batcher.add("tid1", ["a"])
+    data = utility._subscriber.publish.call_args[0][2]
+
+    await utility.invalidate(data=data, sender="tid1")
+    utility._memory_cache.__delitem__.assert_not_called()
+    assert utility._ignored_tids == []
+
+    # messages of other processes invalidate
+    await utility.invalidate(data={"tid": "other", "keys": ["a"]}, sender="other")
+    utility._memory_cache.__delitem__.assert_called_once_with("a")
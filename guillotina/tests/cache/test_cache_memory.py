@@ -5,6 +5,7 @@ from unittest.mock import MagicMock, Mock
 import pytest
 
 from guillotina.component import get_utility
+from guillotina.contrib.cache import serialize
 from guillotina.contrib.cache.strategy import BasicCache
 from guillotina.db.transaction import Transaction
 from guillotina.interfaces import ICacheUtility
@@ -71,6 +72,27 @@ async def test_cache_clear(guillotina_main):
     assert await rcache.get(oid="foo") is None
 
 
+@pytest.mark.app_settings(DEFAULT_SETTINGS)
+async def test_cache_set_accounts_every_key(guillotina_main):
+    util = get_utility(ICacheUtility)
+    await util.clear()
+    value = {"state": b"x" * 1000, "zoid": "foo"}
+    await util.set(["foo", "bar"], value)
+    size = util.get_size(value)
+    memory = util.get_entry_size("foo", size) + util.get_entry_size("bar", size)
+    assert util._memory_cache.get_memory() == memory
+
+    stats = (await util.get_stats())["in-memory"]
+    assert stats["size"] == 2
+    assert stats["memory"] == memory
+    assert stats["memory_budget"] == util._memory_cache.get_size()
+    assert stats["rejected"] == 0
+
+    # pushed values are accounted too
+    await util.invalidate(data={"tid": 1, "keys": ["foo", "bar"], "push": {"foo": value}})
+    assert util._memory_cache.get_memory() == util.get_entry_size("foo", size)
+
+
 @pytest.mark.app_settings(DEFAULT_SETTINGS)
 async def test_invalidate_object(guillotina_main):
     util = get_utility(ICacheUtility)
@@ -89,6 +111,19 @@ async def test_invalidate_object(guillotina_main):
     assert await rcache.get(oid=content.__uuid__) is None
 
 
+@pytest.mark.app_settings(
+    {
+        "applications": ["guillotina", "guillotina.contrib.cache"],
+        "cache": {"updates_channel": None, "driver": None, "wire_format": "framed"},
+    }
+)
+async def test_invalidate_with_framed_push(guillotina_main):
+    util = get_utility(ICacheUtility)
+    record = {"state": b"foobar", "zoid": "foo", "tid": 1, "id": "foo"}
+    await util.invalidate(data={"tid": 1, "keys": [], "push": {"root-foo": serialize.dumps(record)}})
+    assert util._memory_cache.get("root-foo") == record
+
+
 @pytest.mark.app_settings(DEFAULT_SETTINGS)
 async def test_cache_object(guillotina_main):
     tm = mocks.MockTransactionManager()
@@ -109,6 +144,95 @@ async def test_cache_object(guillotina_main):
     assert cache._hits == 1
 
 
+@pytest.mark.app_settings(DEFAULT_SETTINGS)
+async def test_cache_get_many(guillotina_main):
+    tm = mocks.MockTransactionManager()
+    storage = tm._storage
+    txn = Transaction(tm)
+    cache = BasicCache(txn)
+    txn._cache = cache
+    obs = [create_content() for _ in range(3)]
+    for ob in obs:
+        storage.store(None, None, None, ob, txn)
+    await txn.get(obs[0].__uuid__)
+    assert cache._misses == 1
+
+    with mock.patch.object(storage, "load_many", wraps=storage.load_many) as load_many:
+        loaded = await txn.get_many([ob.__uuid__ for ob in obs] + ["missing"])
+        load_many.assert_called_once_with(txn, [obs[1].__uuid__, obs[2].__uuid__, "missing"])
+    assert [ob.__uuid__ for ob in loaded] == [ob.__uuid__ for ob in obs]
+    assert cache._hits == 1
+
+    # everything in cache now
+    with mock.patch.object(storage, "load_many", wraps=storage.load_many) as load_many:
+        loaded = await txn.get_many([ob.__uuid__ for ob in obs])
+        load_many.assert_not_called()
+    assert len(loaded) == 3
+    assert cache._hits == 4
+
+
+@pytest.mark.app_settings(DEFAULT_SETTINGS)
+async def test_cache_concurrent_misses_load_once(guillotina_main):
+    tm = mocks.MockTransactionManager()
+    storage = tm._storage
+    ob = create_content()
+    storage.store(None, None, None, ob, None)
+
+    txns = []
+    for _ in range(3):
+        txn = Transaction(tm)
+        txn._cache = BasicCache(txn)
+        txns.append(txn)
+
+    original_load = storage.load
+
+    async def slow_load(txn, oid):
+        await asyncio.sleep(0.01)
+        return await original_load(txn, oid)
+
+    with mock.patch.object(storage, "load", side_effect=slow_load) as load:
+        loaded = await asyncio.gather(*[txn.get(ob.__uuid__) for txn in txns])
+        assert load.call_count == 1
+    assert [o.__uuid__ for o in loaded] == [ob.__uuid__] * 3
+    assert [o.__txn__ for o in loaded] == txns
+
+
+@pytest.mark.app_settings(DEFAULT_SETTINGS)
+async def test_replica_loads_do_not_fill_cache(guillotina_main):
+    util = get_utility(ICacheUtility)
+    tm = mocks.MockTransactionManager()
+    storage = tm._storage
+    storage.replicas = Mock()
+    ob = create_content()
+    storage.store(None, None, None, ob, None)
+
+    txn = Transaction(tm)
+    txn._cache = BasicCache(txn)
+    await txn.get(ob.__uuid__)
+    key = txn._cache.get_key(oid=ob.__uuid__)
+    assert util._memory_cache.get(key) is not None
+
+    # a commit invalidates the object
+    await util.invalidate(data={"tid": 2, "keys": [key]})
+    assert util._memory_cache.get(key) is None
+
+    txns = []
+    for _ in range(2):
+        txn = Transaction(tm, read_only=True)
+        txn._cache = BasicCache(txn)
+        txns.append(txn)
+    assert txns[0].reads_from_replica
+
+    with mock.patch.object(storage, "load", wraps=storage.load) as load:
+        loaded = await asyncio.gather(*[txn.get(ob.__uuid__) for txn in txns])
+        # replica loads are not shared with other transactions
+        assert load.call_count == 2
+    assert [o.__uuid__ for o in loaded] == [ob.__uuid__] * 2
+    assert util._memory_cache.get(key) is None
+    await txns[0].get_many([ob.__uuid__])
+    assert util._memory_cache.get(key) is None
+
+
 @pytest.mark.app_settings(DEFAULT_SETTINGS)
 async def test_cache_object_from_child(guillotina_main):
     tm = mocks.MockTransactionManager()
@@ -148,7 +272,7 @@ async def test_do_not_cache_large_object(guillotina_main):
 
 @pytest.fixture(scope="function")
 def mocked_cache_set():
-    with mock.patch("guillotina.contrib.cache.strategy.BasicCache.set") as mock_set:
+    with mock.patch("guillotina.contrib.cache.strategy.BasicCache.set_many") as mock_set:
         f = asyncio.Future()
         f.set_result(None)
         mock_set.return_value = f
@@ -176,10 +300,40 @@ async def test_fill_cache_doesnt_cache_large_objects(guillotina_main, mocked_cac
     # Call fill_cache and check that caching was skipped
     await cache.fill_cache()
 
-    cache.set.assert_not_called()
+    cache.set_many.assert_not_called()
 
     # Now add smaller object and check that is cached
     pickled.__len__.return_value = 1
     await cache.store_object(obj, pickled)
     await cache.fill_cache()
-    cache.set.assert_called_once()
+    cache.set_many.assert_called_once()
+
+
+@pytest.mark.app_settings(DEFAULT_SETTINGS)
+async def test_close_uses_one_network_request(guillotina_main):
+    util = get_utility(ICacheUtility)
+    driver = mock.AsyncMock()
+    driver.get_many.side_effect = lambda keys: [None] * len(keys)
+    util._obj_driver = driver
+    try:
+        tm = mocks.MockTransactionManager()
+        txn = Transaction(tm)
+        cache = BasicCache(txn)
+        obs = [create_content() for _ in range(3)]
+        for ob in obs:
+            txn.modified[ob.__uuid__] = ob
+            await cache.store_object(ob, b"state")
+        await cache.close()
+        driver.delete_all.assert_called_once()
+        assert len(driver.delete_all.call_args[0][0]) == 6
+        driver.set_many.assert_called_once()
+        assert len(driver.set_many.call_args[0][0]) == 3
+        driver.set.assert_not_called()
+
+        # stored objects are in memory, the rest is asked with one request
+        results = await cache.get_many([{"oid": ob.__uuid__} for ob in obs] + [{"oid": "missing"}])
+        assert [r["zoid"] for r in results[:3]] == [ob.__uuid__ for ob in obs]
+        assert results[3] is None
+        driver.get_many.assert_called_once_with(["gcache2-root-missing"])
+    finally:
+        util._obj_driver = None
@@ -74,3 +74,26 @@ def test_cache_clear_resets_memory():
     m.clear()
     assert m.get_memory() == 0
     assert "a" not in m.keys()
+
+
+def test_setting_a_bigger_value_drops_previous_value():
+    from guillotina.contrib.cache.lru import LRU
+
+    m = LRU(10)
+    m.set("a", "v", 5)
+    m.set("a", "v2", 100)
+    assert "a" not in m.keys()
+    assert m.get_memory() == 0
+    assert m.get_rejected() == 1
+
+
+def test_set_size_evicts_by_memory():
+    from guillotina.contrib.cache.lru import LRU
+
+    m = LRU(20)
+    for k in range(4):
+        m.set(k, k, 5)
+    m.set_size(10)
+    assert m.keys() == [3, 2]
+    assert m.get_memory() == 10
+    assert m.get_stats() == (0, 0, 2)
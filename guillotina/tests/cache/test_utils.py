@@ -1,6 +1,12 @@
+import asyncio
+from unittest import mock
+
 import pytest
 
+from guillotina import app_settings
+from guillotina.contrib.cache import serialize
 from guillotina.contrib.cache.utility import CacheUtility
+from guillotina.db.cache.singleflight import SingleFlight
 
 
 @pytest.mark.asyncio
@@ -10,10 +16,103 @@ async def test_get_size_of_item():
 
     from guillotina.contrib.cache.utility import _default_size
 
-    assert rcache.get_size(dict(a=1)) == _default_size
+    assert rcache.get_size(dict(a=1)) == sys.getsizeof(dict(a=1)) + sys.getsizeof("a") + sys.getsizeof(1)
     assert rcache.get_size(1) == sys.getsizeof(1)
-    assert rcache.get_size(dict(state=b"x" * 10)) == 10
+    assert rcache.get_size(dict(state=b"x" * 10)) > 10
+    assert rcache.get_size(object()) == _default_size
 
     item = ["x" * 10, "x" * 10, "x" * 10]
 
-    assert rcache.get_size(item) == sys.getsizeof("x" * 10) * 3
+    assert rcache.get_size(item) == sys.getsizeof(item) + sys.getsizeof("x" * 10) * 3
+
+    # nested values are accounted
+    record = {"state": b"x" * 1000, "zoid": "foo", "keys": ["a" * 100, "b" * 100]}
+    assert rcache.get_size(record) > 1200
+
+
+def test_serialize_framed_record():
+    record = {"state": b"x" * 100, "zoid": "foo", "tid": 5, "id": "bar", "parent_id": None}
+    with mock.patch.dict(app_settings, {"cache": {"wire_format": "framed"}}):
+        value = serialize.dumps(record)
+        assert value[:2] == serialize.MAGIC
+        # state is written as is
+        assert value.endswith(record["state"])
+        assert serialize.loads(value) == record
+
+        # non records are still pickled
+        assert serialize.loads(serialize.dumps(["foo", "bar"])) == ["foo", "bar"]
+        assert serialize.dumps("foo")[:2] != serialize.MAGIC
+
+    settings = {"cache": {"wire_format": "framed", "compression": "zlib", "compression_threshold": 50}}
+    with mock.patch.dict(app_settings, settings):
+        value = serialize.dumps(record)
+        assert len(value) < 100
+        assert serialize.loads(value) == record
+
+        small = dict(record, state=b"x" * 10)
+        assert serialize.dumps(small).endswith(small["state"])
+        assert serialize.loads(serialize.dumps(small)) == small
+
+    # pickled values are still readable and default is pickle
+    with mock.patch.dict(app_settings, {"cache": {}}):
+        value = serialize.dumps(record)
+        assert value[:2] != serialize.MAGIC
+        assert serialize.loads(value) == record
+
+
+@pytest.mark.asyncio
+async def test_single_flight_coalesces_concurrent_loads():
+    flights = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return "foo"
+
+    results = await asyncio.gather(*[flights.run("test", "key", load) for _ in range(5)])
+    assert results == ["foo"] * 5
+    assert len(calls) == 1
+    assert flights.waits == 4
+    assert len(flights) == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_waiters_load_when_leader_fails():
+    flights = SingleFlight()
+    calls = []
+
+    async def failing_load():
+        calls.append("fail")
+        await asyncio.sleep(0.01)
+        raise KeyError("key")
+
+    async def load():
+        calls.append("load")
+        return "foo"
+
+    leader = asyncio.ensure_future(flights.run("test", "key", failing_load))
+    await asyncio.sleep(0)
+    assert await flights.run("test", "key", load) == "foo"
+    with pytest.raises(KeyError):
+        await leader
+    assert calls == ["fail", "load"]
+    assert flights.waits == 0
+
+
+@pytest.mark.asyncio
+async def test_single_flight_forget():
+    flights = SingleFlight()
+    calls = []
+
+    async def load():
+        calls.append(1)
+        await asyncio.sleep(0.01)
+        return len(calls)
+
+    leader = asyncio.ensure_future(flights.run("test", "key", load))
+    await asyncio.sleep(0)
+    flights.forget(["key"])
+    # invalidated while loading, a new load is started
+    assert await flights.run("test", "key", load) == 2
+    assert await leader == 2
@@ -1,8 +1,13 @@
+import asyncio
 import json
+from unittest import mock
 
 import pytest
 
-from guillotina import configure
+from guillotina import configure, task_vars
+from guillotina.contrib.dbusers.cache import PrincipalCache, principal_cache
+from guillotina.contrib.dbusers.users import DBUserIdentifier
+from guillotina.db.transaction import Transaction
 from guillotina.interfaces import IFolder
 
 from . import settings
@@ -104,3 +109,133 @@ async def test_roles_in_groups(dbusers_requester):
             "GET", "/db/guillotina/secrets/@top-secret", token=resp["token"], auth_type="Bearer"
         )
         assert status == 200
+
+
+@pytest.mark.app_settings(
+    {
+        **settings.DEFAULT_SETTINGS,
+        "applications": ["guillotina.contrib.dbusers", "guillotina.contrib.cache"],
+        "cache": {"driver": None, "updates_channel": None},
+    }
+)
+async def test_principal_cache_is_invalidated(dbusers_requester):
+    async with dbusers_requester as requester:
+        resp, status = await requester(
+            "POST",
+            "/db/guillotina/groups",
+            data=json.dumps({"id": "top-agents", "@type": "Group", "user_roles": ["dbusers.DoubleO"]}),
+        )
+        assert status == 201
+        _, status = await requester(
+            "POST",
+            "/db/guillotina/@sharing",
+            data=json.dumps(
+                {
+                    "roleperm": [
+                        {
+                            "role": "dbusers.DoubleO",
+                            "permission": "guillotina.AccessContent",
+                            "setting": "Allow",
+                        }
+                    ]
+                }
+            ),
+        )
+        assert status == 200
+        resp, status = await requester(
+            "POST",
+            "/db/guillotina/users",
+            data=json.dumps(
+                {"@type": "User", "id": "007", "password": "secret", "user_groups": ["top-agents"]}
+            ),
+        )
+        assert status == 201
+        resp, status = await requester(
+            "POST", "/db/guillotina/", data=json.dumps({"@type": "Folder", "id": "secrets"})
+        )
+        assert status == 201
+        resp, status = await requester(
+            "POST", "/db/guillotina/@login", data=json.dumps({"username": "007", "password": "secret"})
+        )
+        assert status == 200
+        token = resp["token"]
+
+        for _ in range(2):
+            _, status = await requester(
+                "GET", "/db/guillotina/secrets/@top-secret", token=token, auth_type="Bearer"
+            )
+            assert status == 200
+        assert principal_cache.hits > 0
+
+        async def get_user():
+            # in a task of its own, so the task vars it sets do not leak
+            tm = requester.db.get_transaction_manager()
+            task_vars.db.set(requester.db)
+            txn = await tm.begin()
+            try:
+                task_vars.container.set(await requester.db.async_get("guillotina"))
+                user = await DBUserIdentifier().get_user({"id": "007"})
+            finally:
+                await tm.abort(txn=txn)
+            return user, txn
+
+        # every transaction gets its own user and groups
+        users = []
+        for _ in range(2):
+            user, txn = await asyncio.create_task(get_user())
+            assert user.__txn__ is txn
+            assert user._groups_cache["top-agents"].__txn__ is txn
+            users.append(user)
+        assert users[0] is not users[1]
+        assert users[0]._groups_cache["top-agents"] is not users[1]._groups_cache["top-agents"]
+
+        # users loaded from read replicas are not cached
+        principal_cache.clear()
+        with mock.patch.object(
+            Transaction, "reads_from_replica", new_callable=mock.PropertyMock, return_value=True
+        ):
+            await asyncio.create_task(get_user())
+        assert len(principal_cache) == 0
+
+        # changing the group drops the cached user
+        await asyncio.create_task(get_user())
+        assert len(principal_cache) == 1
+        _, status = await requester(
+            "PATCH", "/db/guillotina/groups/top-agents", data=json.dumps({"user_roles": []})
+        )
+        assert status == 204
+        assert len(principal_cache) == 0
+        user, _ = await asyncio.create_task(get_user())
+        assert user._groups_cache["top-agents"].user_roles == []
+
+        _, status = await requester(
+            "PATCH", "/db/guillotina/groups/top-agents", data=json.dumps({"user_roles": ["dbusers.DoubleO"]})
+        )
+        assert status == 204
+        user, _ = await asyncio.create_task(get_user())
+        assert user._groups_cache["top-agents"].user_roles == ["dbusers.DoubleO"]
+
+        # and so does changing the user
+        _, status = await requester("PATCH", "/db/guillotina/users/007", data=json.dumps({"disabled": True}))
+        assert status == 204
+        user, _ = await asyncio.create_task(get_user())
+        assert user is None
+        _, status = await requester(
+            "GET", "/db/guillotina/secrets/@top-secret", token=token, auth_type="Bearer"
+        )
+        assert status == 401
+
+
+async def test_principal_cache_drops_users_invalidated_while_loaded():
+    cache = PrincipalCache(size=10)
+    key = ("db", "container", "007")
+    with cache.loading() as counter:
+        cache.invalidate(["group"])
+        cache.set(key, {}, ["user", "group"], counter)
+    assert cache.get(key) is None
+
+    with cache.loading() as counter:
+        cache.invalidate(["other"])
+        cache.set(key, {}, ["user", "group"], counter)
+    assert cache.get(key) == {}
+    assert cache._invalidated == {}
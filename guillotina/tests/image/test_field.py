@@ -1,5 +1,6 @@
 import json
 import os
+from unittest import mock
 
 import pytest
 
@@ -8,7 +9,10 @@ from guillotina.contrib.image.behaviors import (
     IMultiImageAttachment,
     IMultiImageOrderedAttachment,
 )
+from guillotina.contrib.image.utils import get_executor, get_scale_cache
 from guillotina.directives import index_field
+from guillotina.event import notify
+from guillotina.events import ApplicationCleanupEvent
 from guillotina.test_package import IExample
 from guillotina.tests.image import TEST_DATA_LOCATION
 from guillotina.utils import get_behavior
@@ -117,6 +121,58 @@ async def test_image_field_with_behavior(redis_container, container_requester):
         assert status == 404
 
 
+@pytest.mark.app_settings(
+    {"applications": ["guillotina", "guillotina.contrib.image"], "cloud_datamanager": "db"}
+)
+async def test_image_scales_are_cached(container_requester):
+    async with container_requester as requester:
+        _, status = await requester("POST", "/db/guillotina/@addons", data=json.dumps({"id": "image"}))
+        assert status == 200
+        response, status = await requester(
+            "POST",
+            "/db/guillotina/",
+            data=json.dumps(
+                {"@type": "Item", "@behaviors": [IImageAttachment.__identifier__], "id": "foobar"}
+            ),
+        )
+        assert status == 201
+
+        with open(os.path.join(TEST_DATA_LOCATION, "profile.jpg"), "rb") as image:
+            data = image.read()
+        response, status = await requester(
+            "PATCH",
+            "/db/guillotina/foobar/@upload/image",
+            data=data,
+            headers={"x-upload-size": f"{len(data)}"},
+        )
+        assert status == 200
+
+        response, status = await requester("PATCH", "/db/guillotina/foobar/@images/image/thumb")
+        assert status == 200
+        response, status = await requester("GET", "/db/guillotina/foobar/@images/image/thumb")
+        assert len(response) == 5260
+        assert len(get_scale_cache()) > 0
+
+        with mock.patch("guillotina.contrib.image.api.scale_image", side_effect=Exception("not cached")):
+            response, status = await requester("PATCH", "/db/guillotina/foobar/@images/image/thumb")
+            assert status == 200
+        response, status = await requester("GET", "/db/guillotina/foobar/@images/image/thumb")
+        assert len(response) == 5260
+
+
+@pytest.mark.app_settings({"applications": ["guillotina", "guillotina.contrib.image"]})
+async def test_image_executor_is_shut_down_on_cleanup(dummy_guillotina):
+    executor = get_executor()
+    assert executor is not None
+    assert executor.submit(len, b"foo").result() == 3
+    await notify(ApplicationCleanupEvent(dummy_guillotina))
+    with pytest.raises(RuntimeError):
+        executor.submit(len, b"foo")
+    # a new pool is started when scaling again
+    assert get_executor() is not executor
+    await notify(ApplicationCleanupEvent(dummy_guillotina))
+
+
 @pytest.mark.app_settings(
     {"applications": ["guillotina", "guillotina.contrib.image"], "cloud_datamanager": "db"}
 )
@@ -0,0 +1,110 @@
+import asyncio
+import os
+
+import pytest
+
+from guillotina import task_vars
+from guillotina.component import get_utility
+from guillotina.interfaces import IDurableQueueUtility, IQueueUtility
+from guillotina.utils import execute, get_current_container
+
+
+pytestmark = pytest.mark.asyncio
+
+DATABASE = os.environ.get("DATABASE", "DUMMY")
+
+JOBS_SETTINGS = {
+    "applications": ["guillotina", "guillotina.contrib.jobs"],
+    "jobs": {"retry_delay": 0.1, "poll_interval": 0.2},
+}
+
+calls = []
+
+
+async def record_call(value):
+    calls.append((value, get_current_container().id))
+
+
+async def fail_once(value):
+    calls.append(value)
+    if len(calls) == 1:
+        raise ValueError("first attempt fails")
+
+
+async def always_fail(value):
+    calls.append(value)
+    raise ValueError("always fails")
+
+
+async def _wait_for_calls(number):
+    for _ in range(50):
+        if len(calls) >= number:
+            return
+        await asyncio.sleep(0.1)
+
+
+async def _get_utility():
+    util = get_utility(IDurableQueueUtility)
+    for _ in range(50):
+        if util.initialized:
+            break
+        await asyncio.sleep(0.1)
+    async with util._storage.pool.acquire() as conn:
+        await conn.execute(f"DELETE FROM {util.settings['table_name']}")
+    calls.clear()
+    return util
+
+
+@pytest.mark.app_settings(JOBS_SETTINGS)
+@pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
+async def test_in_durable_queue_stores_jobs(container_requester):
+    async with container_requester as requester:
+        util = await _get_utility()
+        async with requester.db.get_transaction_manager() as tm:
+            task_vars.db.set(requester.db)
+            txn = await tm.begin()
+            task_vars.container.set(await requester.db.async_get("guillotina"))
+            ctx = execute.in_durable_queue(record_call, "foo")
+            # the other helpers keep running jobs in memory
+            assert execute.in_queue(record_call, "foo").func == get_utility(IQueueUtility).add
+            await tm.abort(txn=txn)
+        assert ctx.func == util.add
+        job_id = await ctx.func(*ctx.args, **ctx.kwargs)
+        assert job_id > 0
+
+        await _wait_for_calls(1)
+        assert calls == [("foo", "guillotina")]
+
+        # jobs that can not be stored
+        with pytest.raises(ValueError):
+            execute.in_durable_queue(lambda: None)
+
+
+@pytest.mark.app_settings(JOBS_SETTINGS)
+@pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
+async def test_failed_jobs_are_retried(container_requester):
+    async with container_requester:
+        util = await _get_utility()
+        await util.add(fail_once, ["bar"], max_attempts=3)
+        await _wait_for_calls(2)
+        assert calls == ["bar", "bar"]
+        await asyncio.sleep(0.1)
+        async with util._storage.pool.acquire() as conn:
+            assert await conn.fetchval(f"SELECT count(*) FROM {util.settings['table_name']}") == 0
+
+        await util.add(always_fail, ["baz"], max_attempts=2)
+        await _wait_for_calls(4)
+        await asyncio.sleep(0.1)
+        async with util._storage.pool.acquire() as conn:
+            row = await conn.fetchrow(f"SELECT status, attempts, error FROM {util.settings['table_name']}")
+        assert row["status"] == "failed"
+        assert row["attempts"] == 2
+        assert "always fails" in row["error"]
+
+
+@pytest.mark.app_settings(JOBS_SETTINGS)
+@pytest.mark.skipif(DATABASE != "DUMMY", reason="Only for dummy db")
+async def test_in_durable_queue_without_postgresql(container_requester):
+    async with container_requester:
+        with pytest.raises(ValueError, match="not initialized"):
+            execute.in_durable_queue(record_call, "foo")
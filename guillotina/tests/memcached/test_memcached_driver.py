@@ -184,6 +184,28 @@ async def test_delete_all_empty_keys():
             watch_mocked.assert_not_called()
 
 
+@pytest.mark.skipif(emcache is None, reason="emcache not installed")
+async def test_get_many():
+    driver = MemcachedDriver()
+    driver._client = mock.AsyncMock()
+    driver._client.get_many.return_value = {safe_key("foo"): mock.Mock(value=b"data")}
+    assert await driver.get_many(["foo", "bar"]) == [b"data", None]
+    driver._client.get_many.assert_called_once_with([safe_key("foo"), safe_key("bar")])
+
+
+@pytest.mark.skipif(emcache is None, reason="emcache not installed")
+async def test_set_many():
+    driver = MemcachedDriver()
+    driver._client = mock.AsyncMock()
+    await driver.set_many({"foo": b"1", "bar": b"2"}, expire=10)
+    driver._client.set.assert_has_calls(
+        [
+            mock.call(safe_key("foo"), b"1", noreply=True, exptime=10),
+            mock.call(safe_key("bar"), b"2", noreply=True, exptime=10),
+        ]
+    )
+
+
 @pytest.mark.skipif(emcache is None, reason="emcache not installed")
 class TestUpdateConnectionPoolMetrics:
     @pytest.fixture
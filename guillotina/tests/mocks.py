@@ -111,6 +111,9 @@ class MockStorage:  # type: ignore
     async def load(self, txn, oid):
         return self._objects[oid]
 
+    async def load_many(self, txn, oids):
+        return [self._objects[oid] for oid in oids if oid in self._objects]
+
     async def get_child(self, txn, container_uid, key):
         if container_uid not in self._objects:
             return
@@ -52,6 +52,43 @@ async def test_redis_ops(redis_container, guillotina_main):
     assert driver.initialized is False
 
 
+@pytest.mark.app_settings({"applications": ["guillotina", "guillotina.contrib.redis"]})
+async def test_redis_multi_key_ops(redis_container, guillotina_main):
+    driver = await resolve_dotted_name("guillotina.contrib.redis").get_driver()
+    assert driver.initialized
+
+    await driver.set_many({"many1": b"data1", "many2": b"data2", "many3": b"data3"}, expire=10)
+    result = await driver.get_many(["many1", "missing", "many3"])
+    assert result == [b"data1", None, b"data3"]
+
+    await driver.delete_many(["many1", "many2"])
+    result = await driver.get_many(["many1", "many2", "many3"])
+    assert result == [None, None, b"data3"]
+
+    await driver.flushall()
+    await driver.finalize()
+
+
+@pytest.mark.app_settings({"applications": ["guillotina", "guillotina.contrib.redis"]})
+async def test_redis_scan_prefix(redis_container, guillotina_main):
+    driver = await resolve_dotted_name("guillotina.contrib.redis").get_driver()
+    assert driver.initialized
+
+    await driver.set_many({f"scan:{idx}": b"data" for idx in range(25)}, expire=10)
+    await driver.set_many({"scan*:1": b"data", "other:1": b"data"}, expire=10)
+
+    keys = {key async for key in driver.scan_prefix("scan:", count=10)}
+    assert len(keys) == 25
+    assert {key async for key in driver.scan_prefix("scan*")} == {b"scan*:1"}
+
+    assert await driver.delete_prefix("scan:", batch_size=10) == 25
+    assert await driver.keys_startswith("scan:") == []
+    assert await driver.get("other:1") == b"data"
+
+    await driver.flushall()
+    await driver.finalize()
+
+
 @pytest.mark.app_settings({"applications": ["guillotina", "guillotina.contrib.redis"]})
 async def test_redis_pubsub(redis_container, guillotina_main):
     driver = await resolve_dotted_name("guillotina.contrib.redis").get_driver()
@@ -902,6 +902,108 @@ async def test_items(container_requester):
         assert "guillotina.behaviors.dublincore.IDublinCore" not in item
 
 
+async def test_items_cursor(container_requester):
+    async with container_requester as requester:
+        for _ in range(5):
+            await requester("POST", "/db/guillotina", data=json.dumps({"@type": "Item"}))
+
+        items = []
+        cursor = ""
+        pages = 0
+        while cursor is not None:
+            response, status = await requester("GET", f"/db/guillotina/@items?page_size=2&cursor={cursor}")
+            assert status == 200
+            assert response["total"] == 5
+            assert "page" not in response
+            items.extend([i["@uid"] for i in response["items"]])
+            cursor = response["cursor"]
+            pages += 1
+        assert pages == 3
+        assert len(set(items)) == 5
+
+        # same order as offset pages
+        response, _ = await requester("GET", "/db/guillotina/@items?page_size=2&page=2")
+        assert [i["@uid"] for i in response["items"]] == items[2:4]
+
+        # offset pagination without a cursor
+        response, _ = await requester("GET", "/db/guillotina/@items?page_size=2")
+        assert response["page"] == 1
+        assert "cursor" not in response
+        assert [i["@uid"] for i in response["items"]] == items[:2]
+
+        _, status = await requester("GET", "/db/guillotina/@items?cursor=@@@")
+        assert status == 412
+
+
+async def test_bulk_operations(container_requester):
+    def get_results(value):
+        if isinstance(value, dict):
+            return [value]
+        return [json.loads(line) for line in value.splitlines()]
+
+    async with container_requester as requester:
+        await requester("POST", "/db/guillotina", data=json.dumps({"@type": "Item", "id": "item1"}))
+        operations = [
+            {"op": "create", "data": {"@type": "Item", "id": "item2", "title": "Item 2"}},
+            {"op": "patch", "path": "item1", "data": {"title": "Item 1"}},
+            {"op": "create", "data": {"@type": "Folder", "id": "folder"}},
+            {"op": "create", "path": "folder", "data": {"@type": "Item", "id": "item3"}},
+        ]
+        value, status, headers = await requester.make_request(
+            "POST", "/db/guillotina/@bulk", data=json.dumps(operations)
+        )
+        assert status == 200
+        assert headers["Content-Type"] == "application/x-ndjson"
+        results = get_results(value)
+        assert [r["status"] for r in results] == [201, 204, 201, 201]
+        assert results[0]["@name"] == "item2"
+        assert results[3]["@id"].endswith("/folder/item3")
+        response, _ = await requester("GET", "/db/guillotina/item1")
+        assert response["title"] == "Item 1"
+        response, _ = await requester("GET", "/db/guillotina/folder/item3")
+        assert response["@type"] == "Item"
+
+        # a failing operation aborts the transaction
+        ndjson = "\n".join(
+            json.dumps(op)
+            for op in [
+                {"op": "patch", "path": "item1", "data": {"title": "Changed"}},
+                {"op": "delete", "path": "missing"},
+                {"op": "create", "data": {"@type": "Item", "id": "item4"}},
+            ]
+        )
+        value, status, _ = await requester.make_request(
+            "POST",
+            "/db/guillotina/@bulk",
+            data=ndjson,
+            headers={"Content-Type": "application/x-ndjson"},
+        )
+        assert status == 200
+        assert [r["status"] for r in get_results(value)] == [424, 404, 424]
+        response, _ = await requester("GET", "/db/guillotina/item1")
+        assert response["title"] == "Item 1"
+        _, status = await requester("GET", "/db/guillotina/item4")
+        assert status == 404
+
+        # only the failing batch is aborted
+        operations = [
+            {"op": "delete", "path": "item2"},
+            {"op": "create", "data": {"id": "item5"}},
+            {"op": "create", "data": {"@type": "Item", "id": "item6"}},
+        ]
+        value, status, _ = await requester.make_request(
+            "POST", "/db/guillotina/@bulk?batch_size=1", data=json.dumps(operations)
+        )
+        assert [r["status"] for r in get_results(value)] == [200, 412, 201]
+        _, status = await requester("GET", "/db/guillotina/item2")
+        assert status == 404
+        _, status = await requester("GET", "/db/guillotina/item6")
+        assert status == 200
+
+        _, status = await requester("POST", "/db/guillotina/@bulk", data=json.dumps({"op": "create"}))
+        assert status == 412
+
+
 async def test_debug_headers(container_requester):
     async with container_requester as requester:
         _, _, headers = await requester.make_request("GET", "/db/guillotina", headers={"X-Debug": "1"})
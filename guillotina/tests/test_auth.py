@@ -1,3 +1,4 @@
+import time
 from datetime import datetime, timedelta
 
 import jwt
@@ -61,3 +62,52 @@ async def test_sha512_hashing(dummy_guillotina):
     hashed = validators.hash_password("foobar", algorithm="sha512")
     assert validators.check_password(hashed, "foobar")
     assert not validators.check_password(hashed, "barfoo")
+
+
+async def test_verified_token_cache(dummy_guillotina):
+    from guillotina.auth.cache import VerifiedTokenCache
+
+    cache = VerifiedTokenCache(size=10, ttl=60)
+    claims = {"exp": time.time() + 60, "id": "foo", "session": "bar"}
+    assert cache.get("token") is None
+    cache.set("token", claims)
+    assert cache.get("token") == claims
+    assert (cache.hits, cache.misses) == (1, 1)
+
+    # not served after the token expires
+    cache.set("expired", {"exp": time.time() - 1, "id": "foo"})
+    assert cache.get("expired") is None
+    assert len(cache) == 1
+
+    # sessions are only cached while revocations are received
+    cache.set_session("token", "foo", "bar")
+    assert not cache.has_session("token")
+    cache.sessions_revocable = True
+    cache.set_session("token", "foo", "bar")
+    assert cache.has_session("token")
+    cache.revoke_session("foo", "bar")
+    assert not cache.has_session("token")
+    assert cache.get("token") is None
+
+
+async def test_jwt_auth_uses_token_cache(container_requester):
+    from guillotina.auth.cache import token_cache
+    from guillotina.auth.users import ROOT_USER_ID
+
+    async with container_requester as requester:
+        jwt_token = jwt.encode(
+            {"exp": datetime.utcnow() + timedelta(seconds=60), "id": ROOT_USER_ID},
+            app_settings["jwt"]["secret"],
+            algorithm=app_settings["jwt"]["algorithm"],
+        )
+        hits = token_cache.hits
+        for _ in range(2):
+            _, status = await requester("GET", "/db/guillotina/@addons", token=jwt_token, auth_type="Bearer")
+            assert status == 200
+        assert token_cache.hits == hits + 1
+
+        # a token with an invalid signature is never cached
+        _, status = await requester(
+            "GET", "/db/guillotina/@addons", token=jwt_token + "x", auth_type="Bearer"
+        )
+        assert status == 401
@@ -184,3 +184,37 @@ async def test_read_data_range_errors(db, guillotina_main, dummy_request):
 
         with pytest.raises(RangeNotFound):
             assert await _gather_all(fm.file_storage_manager.read_range(0, 1024 * 1024 * 3))
+
+
+async def test_read_blob_chunks_ahead(db, guillotina_main):
+    db = await get_database("db")
+    login()
+
+    async with transaction(db=db):
+        container = await db.async_get("container")
+        if container is None:
+            container = await create_content_in_container(db, "Container", "container", title="Container")
+
+        blob = Blob(container)
+        container.blob = blob
+        blobfi = blob.open("w")
+        for idx in range(5):
+            await blobfi.async_write_chunk(str(idx).encode() * (idx + 1))
+
+    async with transaction(db=db):
+        container = await db.async_get("container")
+        bfile = container.blob.open()
+        chunks = [c async for c in bfile.iter_async_read(prefetch=2)]
+        assert chunks == [b"0", b"11", b"222", b"3333", b"44444"]
+        assert [c async for c in bfile.iter_async_read(1, 4, prefetch=2)] == [b"11", b"222", b"3333"]
+
+        assert bfile.chunk_offsets() == [0, 1, 3, 6, 10, 15]
+        assert bfile.find_chunk(0) == (0, 0)
+        assert bfile.find_chunk(5) == (2, 3)
+        assert bfile.find_chunk(14) == (4, 10)
+        with pytest.raises(BlobChunkNotFound):
+            bfile.find_chunk(15)
+        with pytest.raises(BlobChunkNotFound):
+            await bfile.async_read_chunks(4, 6)
+
+        await db.async_del("container")
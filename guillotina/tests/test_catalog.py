@@ -1,14 +1,16 @@
 import json
 import os
 from datetime import datetime
+from unittest import mock
 
 import pytest
 
-from guillotina import configure, task_vars
+from guillotina import app_settings, configure, task_vars
 from guillotina.catalog import index
 from guillotina.catalog.utils import get_index_fields, get_metadata_fields, parse_query
 from guillotina.component import get_adapter, query_utility
 from guillotina.content import Container, Resource, create_content
+from guillotina.db.transaction import Transaction
 from guillotina.directives import index_field
 from guillotina.event import notify
 from guillotina.events import ObjectModifiedEvent
@@ -212,6 +214,23 @@ async def test_search_count_endpoint(container_requester):
         assert response == 0
 
 
+@pytest.mark.app_settings(PG_CATALOG_SETTINGS)
+@pytest.mark.skipif(NOT_POSTGRES, reason="Only PG")
+async def test_bulk_operations_are_indexed(container_requester):
+    async with container_requester as requester:
+        operations = [{"op": "create", "data": {"@type": "Item", "id": f"item{i}"}} for i in range(5)]
+        _, status = await requester("POST", "/db/guillotina/@bulk?batch_size=2", data=json.dumps(operations))
+        assert status == 200
+        response, status = await requester("GET", "/db/guillotina/@count?type_name=Item")
+        assert response == 5
+
+        operations = [{"op": "delete", "path": f"item{i}"} for i in range(3)]
+        _, status = await requester("POST", "/db/guillotina/@bulk", data=json.dumps(operations))
+        assert status == 200
+        response, status = await requester("GET", "/db/guillotina/@count?type_name=Item")
+        assert response == 2
+
+
 @pytest.mark.skipif(not NOT_POSTGRES, reason="Only not PG")
 async def test_search_count_endpoint_no_pg(container_requester):
     async with container_requester as requester:
@@ -304,6 +323,74 @@ async def test_search_endpoint_or_operator(container_requester):
         assert response["items_total"] == 2
 
 
+@pytest.mark.app_settings(PG_CATALOG_SETTINGS)
+@pytest.mark.skipif(NOT_POSTGRES, reason="Only PG")
+async def test_search_endpoint_total_modes(container_requester):
+    async with container_requester as requester:
+        for idx in range(23):
+            await requester(
+                "POST", "/db/guillotina", data=json.dumps({"@type": "Item", "title": f"Item {idx}"})
+            )
+
+        response, status = await requester("GET", "/db/guillotina/@search?_size=10")
+        assert status == 200
+        assert len(response["items"]) == 10
+        assert response["items_total"] == 23
+
+        response, status = await requester("GET", "/db/guillotina/@search?_size=10&_from=20")
+        assert len(response["items"]) == 3
+        assert response["items_total"] == 23
+
+        # page past the end of the results
+        response, status = await requester("GET", "/db/guillotina/@search?_size=10&_from=30")
+        assert len(response["items"]) == 0
+        assert response["items_total"] == 23
+
+        response, status = await requester("GET", "/db/guillotina/@search?_size=10&_total=none")
+        assert len(response["items"]) == 10
+        assert "items_total" not in response
+
+        # planner estimate is under the threshold, exact total is used
+        response, status = await requester("GET", "/db/guillotina/@search?_size=10&_total=estimate")
+        assert len(response["items"]) == 10
+        assert response["items_total"] == 23
+
+        async with requester.db.get_transaction_manager() as tm, await tm.begin():
+            test_utils.login()
+            root = await tm.get_root()
+            container = await root.async_get("guillotina")
+
+            util = query_utility(ICatalogUtility)
+            query = parse_query(container, {"_total": "estimate"}, util)
+            assert query["total"] == "estimate"
+            assert await util.get_estimated_total(container, query) > 0
+
+            with mock.patch.dict(app_settings, {"catalog_estimate_threshold": 1}):
+                results = await util.search(container, {"_total": "estimate", "_size": "10"})
+                assert len(results["items"]) == 10
+                assert results["items_total"] > 0
+
+
+@pytest.mark.app_settings(PG_CATALOG_SETTINGS)
+@pytest.mark.skipif(NOT_POSTGRES, reason="Only PG")
+async def test_search_endpoint_fullobjects(container_requester):
+    async with container_requester as requester:
+        for idx in range(5):
+            await requester("POST", "/db/guillotina", data=json.dumps({"@type": "Item", "id": f"item{idx}"}))
+
+        with mock.patch.object(
+            Transaction, "get_many", autospec=True, side_effect=Transaction.get_many
+        ) as get_many:
+            response, status = await requester(
+                "GET", "/db/guillotina/@search?type_name=Item&_fullobjects&_sort_asc=id"
+            )
+            assert get_many.call_count == 1
+        assert status == 200
+        assert response["items_total"] == 5
+        assert [item["@name"] for item in response["items"]] == [f"item{idx}" for idx in range(5)]
+        assert all(item["@type"] == "Item" for item in response["items"])
+
+
 @pytest.mark.app_settings(PG_CATALOG_SETTINGS)
 @pytest.mark.skipif(NOT_POSTGRES, reason="Only PG")
 async def test_search_endpoint_null_operator(container_requester):
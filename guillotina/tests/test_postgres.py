@@ -8,12 +8,12 @@ import pytest
 
 from guillotina.api.container import create_container
 from guillotina.component import get_adapter
-from guillotina.content import Folder
+from guillotina.content import Folder, Item
 from guillotina.db.interfaces import IVacuumProvider
 from guillotina.db.storages.cockroach import CockroachStorage
-from guillotina.db.storages.pg import PostgresqlStorage
+from guillotina.db.storages.pg import PostgresqlStorage, TIDBlockAllocator
 from guillotina.db.transaction_manager import TransactionManager
-from guillotina.exceptions import ConflictError, ConflictIdOnContainer
+from guillotina.exceptions import ConflictError, ConflictIdOnContainer, TIDConflictError
 from guillotina.tests import mocks
 from guillotina.tests.utils import create_content
 
@@ -108,6 +108,107 @@ async def test_restart_connection(db, dummy_guillotina):
         await cleanup(aps)
 
 
+@pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
+async def test_tid_block_allocation(db, dummy_guillotina):
+    aps = await get_aps(db)
+    aps._tid_allocator = TIDBlockAllocator(aps, 5)
+    with TransactionManager(aps) as tm:
+        txn = await tm.begin()
+        ob = create_content()
+        txn.register(ob)
+        await tm.commit(txn=txn)
+        first_tid = ob.__serial__
+        assert len(aps._tid_allocator) == 4
+
+        txn = await tm.begin()
+        txn.register(create_content())
+        await tm.commit(txn=txn)
+        assert len(aps._tid_allocator) == 3
+
+        # object committed by another process with a greater tid
+        other_tid = (await aps.get_next_tids(10))[-1]
+        async with aps.pool.acquire() as conn:
+            await conn.execute("UPDATE objects SET tid = $1 WHERE zoid = $2", other_tid, ob.__uuid__)
+
+        txn = await tm.begin()
+        ob = await txn.get(ob.__uuid__)
+        assert ob.__serial__ == other_tid
+        ob.title = "foobar"
+        txn.register(ob)
+        await tm.commit(txn=txn)
+        assert ob.__serial__ > other_tid > first_tid
+        assert len(aps._tid_allocator) == 4
+
+        await aps.remove()
+        await cleanup(aps)
+
+
+@pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
+async def test_get_conflicts_in_batches(db, dummy_guillotina):
+    aps = await get_aps(db)
+    aps._conflict_check_batch_size = 2
+    with TransactionManager(aps) as tm:
+        txn = await tm.begin()
+        obs = [create_content() for _ in range(5)]
+        for ob in obs:
+            txn.register(ob)
+        await tm.commit(txn=txn)
+        tid = obs[0].__serial__
+
+        txn = Mock()
+        txn.modified = {ob.__uuid__: ob for ob in obs}
+        txn.modified["foobar"] = create_content()
+        txn._tid = tid - 1
+        conflicts = await aps.get_conflicts(txn)
+        assert sorted(c["zoid"] for c in conflicts) == sorted(ob.__uuid__ for ob in obs)
+
+        txn._tid = tid
+        assert await aps.get_conflicts(txn) == []
+
+        await aps.remove()
+        await cleanup(aps)
+
+
+@pytest.mark.skipif(DATABASE != "postgres", reason="Only for postgresql")
+async def test_read_only_transactions_use_replicas(db, dummy_guillotina):
+    aps = await get_aps(db)
+    dsn = "postgres://postgres:postgres@{}:{}/guillotina".format(db[0], db[1])
+    replica_aps = PostgresqlStorage(
+        dsn=dsn, name="db", read_replicas=[dsn], replica_max_lag=5, connection_manager=aps.connection_manager
+    )
+    await replica_aps.initialize()
+    replica = replica_aps.replicas.replicas[0]
+    assert replica.healthy
+    assert replica.lag == 0
+
+    with TransactionManager(replica_aps) as tm:
+        txn = await tm.begin()
+        ob = create_content()
+        txn.register(ob)
+        await tm.commit(txn=txn)
+
+        txn = await tm.begin(read_only=True)
+        conn = await txn.get_connection()
+        assert id(conn) in replica_aps.replicas._acquired
+        assert (await txn.get(ob.__uuid__)).__uuid__ == ob.__uuid__
+        await tm.abort(txn=txn)
+        assert len(replica_aps.replicas._acquired) == 0
+
+        # lagging replica, use primary
+        replica.set_status(False, 10)
+        txn = await tm.begin(read_only=True)
+        conn = await txn.get_connection()
+        assert id(conn) not in replica_aps.replicas._acquired
+        await tm.abort(txn=txn)
+
+        await replica_aps.replicas.check()
+        assert replica.healthy
+
+    await replica_aps.replicas.finalize()
+    await aps.remove()
+    await cleanup(aps)
+
+
 @pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
 async def test_restart_connection_pg(db, dummy_guillotina):
     aps = await get_aps(db)
@@ -527,6 +628,38 @@ async def test_iterate_keys(db, dummy_guillotina):
         await tm.abort(txn=txn)
 
 
+@pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
+async def test_get_page_of_children(db, dummy_guillotina):
+    aps = await get_aps(db)
+    with TransactionManager(aps) as tm, await tm.begin() as txn:
+        parent = create_content()
+        txn.register(parent)
+        original_keys = []
+        for _ in range(5):
+            item = create_content()
+            original_keys.append(item.id)
+            item.__parent__ = parent
+            txn.register(item)
+
+        await tm.commit(txn=txn)
+        txn = await tm.begin()
+
+        keys = []
+        pages = 0
+        after = None
+        while True:
+            children, after = await txn.get_page_of_children(parent, after=after, page_size=2)
+            pages += 1
+            assert all(child.__parent__ is parent for child in children)
+            keys.extend([child.__name__ for child in children])
+            if after is None:
+                break
+
+        assert pages == 3
+        assert sorted(keys) == sorted(original_keys)
+        await tm.abort(txn=txn)
+
+
 @pytest.mark.skipif(DATABASE in ("cockroachdb", "DUMMY"), reason="Cockroach does not like this test...")
 async def test_handles_asyncpg_trying_savepoints(db, dummy_guillotina):
     aps = await get_aps(db)
@@ -669,3 +802,151 @@ values(0, 0, 0, $1, $2, $3, $4, $5)""",
 
     await aps.remove()
     await cleanup(aps)
+
+
+@pytest.mark.skipif(DATABASE in ("cockroachdb", "DUMMY"), reason="Batched store only for postgresql")
+async def test_store_many_objects_in_batches(db, dummy_guillotina):
+    aps = await get_aps(db, autovacuum=False)
+    aps._store_batch_size = 20
+    with TransactionManager(aps) as tm, await tm.begin() as txn:
+        parent = create_content()
+        txn.register(parent)
+        obs = []
+        for _ in range(50):
+            item = create_content()
+            item.__parent__ = parent
+            txn.register(item)
+            obs.append(item)
+
+        await tm.commit(txn=txn)
+        tid = txn._tid
+        for ob in [parent] + obs:
+            assert ob.__serial__ == tid
+            assert not ob.__new_marker__
+
+        txn = await tm.begin()
+        assert await txn.len(parent.__uuid__) == 50
+        for ob in obs:
+            ob = await txn.get(ob.__uuid__)
+            ob.title = "foobar"
+            txn.register(ob)
+        await tm.commit(txn=txn)
+        assert txn._tid > tid
+
+        txn = await tm.begin()
+        for ob in obs:
+            ob = await txn.get(ob.__uuid__)
+            assert ob.title == "foobar"
+            assert ob.__serial__ > tid
+        await tm.abort(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
+
+
+@pytest.mark.skipif(DATABASE in ("cockroachdb", "DUMMY"), reason="Batched store only for postgresql")
+async def test_store_many_mismatched_tid_causes_conflict_error(db, dummy_guillotina):
+    aps = await get_aps(db, autovacuum=False)
+    with TransactionManager(aps) as tm, await tm.begin() as txn:
+        obs = [create_content() for _ in range(5)]
+        for ob in obs:
+            txn.register(ob)
+        await tm.commit(txn=txn)
+
+        txn = await tm.begin()
+        for idx, ob in enumerate(obs):
+            ob = await txn.get(ob.__uuid__)
+            if idx == 3:
+                ob.__serial__ = 3242432
+            txn.register(ob)
+
+        with pytest.raises(TIDConflictError):
+            await tm.commit(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
+
+
+@pytest.mark.skipif(DATABASE in ("cockroachdb", "DUMMY"), reason="Batched store only for postgresql")
+async def test_store_many_raises_conflict_id_on_container(db, dummy_guillotina):
+    aps = await get_aps(db, autovacuum=False)
+    with TransactionManager(aps) as tm, await tm.begin() as txn:
+        parent = create_content()
+        txn.register(parent)
+        await tm.commit(txn=txn)
+
+        txn = await tm.begin()
+        ob = create_content(parent=parent)
+        ob_bis = create_content(id=ob.id, parent=parent)
+        txn.register(ob)
+        txn.register(ob_bis)
+
+        with pytest.raises(ConflictIdOnContainer):
+            await tm.commit(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
+
+
+@pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
+async def test_get_path(db, dummy_guillotina):
+    aps = await get_aps(db, autovacuum=False)
+    with TransactionManager(aps) as tm, await tm.begin() as txn:
+        parent = create_content(Folder, "Folder")
+        txn.register(parent)
+        folder = parent
+        obs = []
+        for idx in range(4):
+            ob = create_content(Folder, "Folder", id=f"folder{idx}", parent=folder)
+            txn.register(ob)
+            obs.append(ob)
+            folder = ob
+        await tm.commit(txn=txn)
+
+        txn = await tm.begin()
+        path = [ob.id for ob in obs]
+        records = await aps.get_path(txn, parent.__uuid__, path)
+        assert [r["zoid"] for r in records] == [ob.__uuid__ for ob in obs]
+
+        records = await aps.get_path(txn, parent.__uuid__, path[:2] + ["missing"] + path[3:])
+        assert [r["zoid"] for r in records] == [ob.__uuid__ for ob in obs[:2]]
+
+        parent = await txn.get(parent.__uuid__)
+        resolved = await txn.get_path(parent, path)
+        assert [ob.__uuid__ for ob in resolved] == [ob.__uuid__ for ob in obs]
+        assert resolved[0].__parent__ is parent
+        for idx, ob in enumerate(resolved[1:]):
+            assert ob.__parent__ is resolved[idx]
+        await tm.abort(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
+
+
+@pytest.mark.skipif(DATABASE == "DUMMY", reason="Not for dummy db")
+async def test_get_many(db, dummy_guillotina):
+    aps = await get_aps(db, autovacuum=False)
+    with TransactionManager(aps) as tm, await tm.begin() as txn:
+        parent = create_content(Folder, "Folder")
+        txn.register(parent)
+        obs = []
+        for idx in range(5):
+            ob = create_content(Item, "Item", id=f"item{idx}", parent=parent)
+            txn.register(ob)
+            obs.append(ob)
+        await tm.commit(txn=txn)
+
+        txn = await tm.begin()
+        oids = [ob.__uuid__ for ob in obs]
+        records = await aps.load_many(txn, oids + ["missing"])
+        assert sorted(r["zoid"] for r in records) == sorted(oids)
+
+        # one in cache, rest loaded at once
+        await txn.get(oids[2])
+        loaded = await txn.get_many(list(reversed(oids)) + ["missing"])
+        assert [ob.__uuid__ for ob in loaded] == list(reversed(oids))
+        assert all(ob.__txn__ is txn for ob in loaded)
+        await tm.abort(txn=txn)
+
+    await aps.remove()
+    await cleanup(aps)
@@ -5,8 +5,9 @@ import pytest
 from guillotina.api.container import create_container
 from guillotina.auth.users import GuillotinaUser
 from guillotina.content import create_content_in_container
-from guillotina.interfaces import Allow, IRolePermissionManager
-from guillotina.security.policy import cached_roles
+from guillotina.interfaces import Allow, IPrincipalPermissionManager, IRolePermissionManager
+from guillotina.security import decision_cache
+from guillotina.security.policy import SecurityPolicy, cached_roles
 from guillotina.security.utils import (
     get_principals_with_access_content,
     get_roles_with_access_content,
@@ -533,6 +534,55 @@ async def test_cached_access_roles(dummy_guillotina):
         assert roles.get("guillotina.ContainerCreator") == 1
 
 
+async def test_shared_decision_cache(container_requester):
+    async with container_requester as requester:
+        response, status = await requester(
+            "POST", "/db/guillotina/", data=json.dumps({"@type": "Item", "id": "testing"})
+        )
+        assert status == 201
+        decision_cache.clear()
+        user = GuillotinaUser("user1")
+
+        for hits in (0, 1):
+            root = await utils.get_root(db=requester.db)
+            async with transaction(db=requester.db, abort_when_done=True):
+                container = await root.async_get("guillotina")
+                testing_object = await container.async_get("testing")
+                # a new policy for every request
+                policy = SecurityPolicy(user)
+                start = decision_cache.hits
+                assert not policy.check_permission("guillotina.ViewContent", testing_object)
+                assert decision_cache.hits - start == hits
+
+        root = await utils.get_root(db=requester.db)
+        async with transaction(db=requester.db, abort_when_done=True):
+            container = await root.async_get("guillotina")
+            testing_object = await container.async_get("testing")
+            # not committed changes are not shared
+            IPrincipalPermissionManager(testing_object).grant_permission_to_principal(
+                "guillotina.ViewContent", "user1"
+            )
+            assert SecurityPolicy(user).check_permission("guillotina.ViewContent", testing_object)
+
+        response, status = await requester(
+            "POST",
+            "/db/guillotina/@sharing",
+            data=json.dumps(
+                {
+                    "prinperm": [
+                        {"principal": "user1", "permission": "guillotina.ViewContent", "setting": "Allow"}
+                    ]
+                }
+            ),
+        )
+        assert status == 200
+        root = await utils.get_root(db=requester.db)
+        async with transaction(db=requester.db, abort_when_done=True):
+            container = await root.async_get("guillotina")
+            testing_object = await container.async_get("testing")
+            assert SecurityPolicy(user).check_permission("guillotina.ViewContent", testing_object)
+
+
 async def test_bad_sharing_request_array(container_requester):
     async with container_requester as requester:
         for utype in ("perminhe", "prinrole", "prinperm", "roleperm"):
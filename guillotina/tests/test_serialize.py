@@ -1,3 +1,4 @@
+import copy
 import uuid
 from datetime import datetime, time
 
@@ -71,6 +72,60 @@ async def test_serialize_omit_main_interface_field(dummy_request, mock_txn):
     assert "file" in result
 
 
+async def test_serialization_plans(dummy_request, mock_txn):
+    from guillotina import FACTORY_CACHE
+    from guillotina.json import serialize_content
+
+    content = create_content()
+    content.title = "Foobar"
+    serializer = get_multi_adapter((content, dummy_request), IResourceSerializeToJson)
+    result = await serializer(omit=["description"])
+    assert result["title"] == "Foobar"
+    assert "description" not in result
+
+    plan = serialize_content.get_serialization_plan("Item", [], ["description"])
+    assert plan is serialize_content.get_serialization_plan("Item", [], ["description"])
+    schema_plan = serialize_content.get_schema_plan(plan.factory.schema, False, [], ["description"])
+    assert "title" in [name for name, *_ in schema_plan.fields]
+    assert "description" not in [name for name, *_ in schema_plan.fields]
+
+    # a type defined again gets a new plan
+    factory = FACTORY_CACHE.pop("Item")
+    try:
+        FACTORY_CACHE["Item"] = copy.copy(factory)
+        new_plan = serialize_content.get_serialization_plan("Item", [], ["description"])
+        assert new_plan is not plan
+        assert new_plan.factory is FACTORY_CACHE["Item"]
+    finally:
+        FACTORY_CACHE["Item"] = factory
+
+
+async def test_deserialization_plans(dummy_request, mock_txn):
+    from guillotina.component import get_global_components
+    from guillotina.json import deserialize_content
+
+    login()
+    plan = deserialize_content.get_deserialization_plan(ITestValidation)
+    assert plan is deserialize_content.get_deserialization_plan(ITestValidation)
+    assert list(plan.fields) == list(plan.order)
+    assert plan.invariants
+
+    content = create_content()
+    deserializer = get_multi_adapter((content, dummy_request), IResourceDeserializeFromJson)
+    errors = []
+    await deserializer.set_schema(ITestValidation, content, {"bar": "bar", "unknown": "foo"}, errors)
+    assert errors == []
+    assert content.bar == "bar"
+
+    # converters are resolved again when the registrations change
+    registry = get_global_components()
+    registry.registerAdapter(dict, (Interface,), IJSONToValue, name="foobar")
+    try:
+        assert deserialize_content.get_deserialization_plan(ITestValidation) is not plan
+    finally:
+        registry.unregisterAdapter(dict, (Interface,), IJSONToValue, name="foobar")
+
+
 async def test_serialize_cloud_file(dummy_request, mock_txn):
     from guillotina.interfaces import IFileManager
     from guillotina.test_package import FileContent, IFileContent
@@ -1,5 +1,9 @@
+import json
+from unittest.mock import patch
+
 import pytest
 
+from guillotina.db.transaction import Transaction
 from guillotina.response import Response
 from guillotina.tests.utils import get_mocked_request
 from guillotina.traversal import apply_cors
@@ -40,3 +44,31 @@ async def test_apply_cors(guillotina_main):
     assert resp.headers["Access-Control-Allow-Credentials"] == "true"
     assert resp.headers["Access-Control-Max-Age"] == "3660"
     assert resp.headers["Location"] == "/test"
+
+
+@pytest.mark.asyncio
+async def test_traverse_nested_path(container_requester):
+    async with container_requester as requester:
+        parent = "/db/guillotina"
+        for id_ in ("a", "b", "c"):
+            _, status = await requester("POST", parent, data=json.dumps({"@type": "Folder", "id": id_}))
+            assert status == 201
+            parent += "/" + id_
+
+        with patch.object(
+            Transaction, "get_path", side_effect=Transaction.get_path, autospec=True
+        ) as get_path:
+            response, status = await requester("GET", "/db/guillotina/a/b/c")
+            assert status == 200
+            assert response["@id"].endswith("/db/guillotina/a/b/c")
+            # the whole path is resolved at once from the database root
+            assert get_path.call_count == 1
+            assert get_path.call_args[0][2] == ["guillotina", "a", "b", "c"]
+
+        response, status = await requester("GET", "/db/guillotina/a/b/@sharing")
+        assert status == 200
+
+        _, status = await requester("GET", "/db/guillotina/a/b/missing")
+        assert status == 404
+        _, status = await requester("GET", "/db/guillotina/a/missing/c")
+        assert status == 404
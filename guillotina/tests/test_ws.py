@@ -19,7 +19,38 @@ async def test_hello(guillotina, container_requester):
 
             await ws.send_str(json.dumps(sending))
             message = await ws.receive_json()
-            assert message == {"data": '{"value":[]}', "id": "0"}
+            assert message == {"data": {"value": []}, "id": "0"}
+
+
+async def test_concurrent_frames(guillotina, container_requester):
+    async with container_requester as requester:
+        headers = {"AUTHORIZATION": "Basic %s" % ADMIN_TOKEN}
+        async with requester.client.websocket_connect("db/guillotina/@ws", headers=headers) as ws:
+            await ws.send_str(json.dumps({"op": "GET", "value": "/@sleep?seconds=0.5", "id": "slow"}))
+            await ws.send_str(json.dumps({"op": "GET", "value": "/@sleep?seconds=0", "id": "fast"}))
+            # frames with the same id are handled in order
+            await ws.send_str(json.dumps({"op": "GET", "value": "/@sleep?seconds=0.2", "id": "same"}))
+            await ws.send_str(json.dumps({"op": "GET", "value": "/@sleep?seconds=0.1", "id": "same"}))
+            messages = [await ws.receive_json() for _ in range(4)]
+            assert messages == [
+                {"data": {"seconds": 0}, "id": "fast"},
+                {"data": {"seconds": 0.2}, "id": "same"},
+                {"data": {"seconds": 0.1}, "id": "same"},
+                {"data": {"seconds": 0.5}, "id": "slow"},
+            ]
+
+
+@pytest.mark.app_settings({"websocket_concurrency": 1})
+async def test_frames_concurrency_limit(guillotina, container_requester):
+    async with container_requester as requester:
+        headers = {"AUTHORIZATION": "Basic %s" % ADMIN_TOKEN}
+        async with requester.client.websocket_connect("db/guillotina/@ws", headers=headers) as ws:
+            await ws.send_str(json.dumps({"op": "GET", "value": "/@sleep?seconds=0.2", "id": "slow"}))
+            await ws.send_str(json.dumps({"op": "GET", "value": "/@sleep?seconds=0", "id": "fast"}))
+            message = await ws.receive_json()
+            assert message["id"] == "slow"
+            message = await ws.receive_json()
+            assert message["id"] == "fast"
 
 
 async def test_send_close(guillotina, container_requester):
@@ -3,7 +3,7 @@
 import asyncio
 import traceback
 from contextlib import contextmanager
-from typing import Optional, Tuple
+from typing import List, Optional, Tuple
 
 from zope.interface import alsoProvides
 
@@ -14,6 +14,7 @@ from guillotina.auth.users import AnonymousUser
 from guillotina.auth.utils import authenticate_request, set_authenticated_user
 from guillotina.browser import View
 from guillotina.component import get_utility, query_adapter, query_multi_adapter
+from guillotina.content import Folder
 from guillotina.contentnegotiation import get_acceptable_content_types, get_acceptable_languages
 from guillotina.db.orm.interfaces import IBaseObject
 from guillotina.event import notify
@@ -45,8 +46,30 @@ from guillotina.transactions import abort, commit
 from guillotina.utils import get_registry, get_security_policy, import_class
 
 
+def _plain_segments(path: Tuple[str, ...]) -> List[str]:
+    """
+    Leading path segments that are object ids and not views or protected names
+    """
+    segments = []
+    for segment in path:
+        if segment[0] in ("_", "@") or segment in (".", ".."):
+            break
+        segments.append(segment)
+    return segments
+
+
+def _default_lookup(ob: IBaseObject) -> bool:
+    """
+    Children of the object are resolved with the default folder lookup
+    """
+    return isinstance(ob, Folder) and type(ob).async_get is Folder.async_get
+
+
 async def traverse(
-    request: IRequest, parent: IBaseObject, path: Tuple[str, ...]
+    request: IRequest,
+    parent: IBaseObject,
+    path: Tuple[str, ...],
+    prefetched: Optional[List[IBaseObject]] = None,
 ) -> Tuple[IBaseObject, Tuple[str, ...]]:
     """Do not use outside the main router function."""
     if IApplication.providedBy(parent):
@@ -67,7 +90,17 @@ async def traverse(
             # shortcut
             return parent, path
 
-        if IAsyncContainer.providedBy(parent):
+        if not _default_lookup(parent):
+            prefetched = None
+        elif prefetched is None and len(_plain_segments(path)) > 1:
+            # resolve all the ids left in the path at once
+            prefetched = await parent.async_get_path(_plain_segments(path))  # type: ignore
+            if len(prefetched) == 0:
+                return parent, path
+
+        if prefetched:
+            context, prefetched = prefetched[0], prefetched[1:]
+        elif IAsyncContainer.providedBy(parent):
             context = await parent.async_get(path[0], suppress_events=True)
             if context is None:
                 return parent, path
@@ -102,7 +135,7 @@ async def traverse(
             except ModuleNotFoundError:
                 logger.error("Can not apply layer " + layer, request=request)
 
-    return await traverse(request, context, path[1:])
+    return await traverse(request, context, path[1:], prefetched)
 
 
 class BaseMatchInfo:
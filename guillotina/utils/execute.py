@@ -6,7 +6,7 @@ from typing import Any, Callable, Coroutine, Optional
 from guillotina import task_vars
 from guillotina.component import get_utility
 from guillotina.exceptions import TransactionNotFound
-from guillotina.interfaces import IAsyncJobPool, IQueueUtility
+from guillotina.interfaces import IAsyncJobPool, IDurableQueueUtility, IQueueUtility
 from guillotina.profile import profilable
 from guillotina.task_vars import txn
 from guillotina.transactions import get_transaction
@@ -53,6 +53,12 @@ class ExecuteContext:
         before_commit(self.func, *self.args, **self.kwargs)
 
 
+def _get_job_context():
+    db = task_vars.db.get()
+    container = task_vars.container.get()
+    return {"db_id": getattr(db, "id", None), "container_id": getattr(container, "id", None)}
+
+
 def in_queue(func: Callable[..., Coroutine[Any, Any, Any]], *args, **kwargs) -> ExecuteContext:
     """
     Execute view-type object(context, request) in the async queue.
@@ -87,6 +93,30 @@ def in_pool(func: Callable[..., Coroutine[Any, Any, Any]], *args, **kwargs) -> E
     return ExecuteContext(__add_to_pool, partial(func, *args, **kwargs))
 
 
+def in_durable_queue(func: Callable[..., Coroutine[Any, Any, Any]], *args, **kwargs) -> ExecuteContext:
+    """
+    Store the function call in the durable job queue of ``guillotina.contrib.jobs``.
+
+    The job is run at least once by a worker of any process, in a new transaction
+    of the database and container of the current task, without the request or
+    the authenticated user.
+
+    :param func: module level function to be queued
+    :param \\*args: json serializable arguments to call the func with
+    :param \\**kwargs: json serializable keyword arguments to call the func with
+
+    :rtype: ExecuteContext
+    """
+    util = get_utility(IDurableQueueUtility)
+    if not util.initialized:
+        raise ValueError("Durable jobs not initialized")
+    if not util.accepts(func, args, kwargs):
+        raise ValueError(
+            f"Only module level functions with json serializable arguments can be stored: {func}"
+        )
+    return ExecuteContext(util.add, func, args, kwargs, **_get_job_context())
+
+
 def after_request(func: Callable[..., Coroutine[Any, Any, Any]], *args, _name=None, _scope="", **kwargs):
     """
     Execute after the request has successfully finished.
@@ -1,6 +1,7 @@
 from guillotina.component import get_multi_adapter
 from guillotina.content import create_content
 from guillotina.interfaces import IResourceDeserializeFromJson
+from guillotina.json.deserialize_content import clear_deserialization_plans
 from guillotina.tests import mocks
 from guillotina.tests.utils import get_mocked_request
 
@@ -11,15 +12,17 @@ import time
 ITERATIONS = 1000
 
 # ----------------------------------------------------
-# Measure performance of serializing data
+# Measure performance of deserializing data
 #
 # Lessons:
-#
+#   - The writable fields, permissions and converters of a schema are compiled
+#     once in a plan, "cold" compiles the plans for every payload
+#   - A patch only converts and validates the fields in the payload
 # ----------------------------------------------------
 
 
-async def runit(type_name):
-    print(f"Test content serialization with {type_name}")
+async def runit(type_name, cold=False):
+    print(f"Test content deserialization with {type_name}{' (cold)' if cold else ''}")
     request = get_mocked_request()
     txn = mocks.MockTransaction()
     ob = await create_content(type_name, id="foobar")
@@ -48,11 +51,25 @@ async def runit(type_name):
     }
     start = time.time()
     for _ in range(ITERATIONS):
+        if cold:
+            clear_deserialization_plans()
         await deserializer(data, validate_all=True)
     end = time.time()
     print(f"Done with {ITERATIONS} in {end - start} seconds")
 
+    print(f"Test content patch with {type_name}{' (cold)' if cold else ''}")
+    data = {"title": "Foobar", "measures.configuration.ITestBehavior1": {"foobar": "456"}}
+    start = time.time()
+    for _ in range(ITERATIONS * 10):
+        if cold:
+            clear_deserialization_plans()
+        await deserializer(data)
+    end = time.time()
+    print(f"Done with {ITERATIONS * 10} in {end - start} seconds")
+
 
 async def run():
+    await runit("TestContent1", cold=True)
     await runit("TestContent1")
+    await runit("TestContent6", cold=True)
     await runit("TestContent6")
@@ -2,25 +2,28 @@ from guillotina.component import get_multi_adapter
 from guillotina.content import create_content
 from guillotina.interfaces import IResourceDeserializeFromJson
 from guillotina.interfaces import IResourceSerializeToJson
+from guillotina.json.serialize_content import clear_serialization_plans
 from guillotina.tests import mocks
-from guillotina.utils import get_current_request
+from guillotina.tests.utils import get_mocked_request
 
 import time
 
 
-ITERATIONS = 100
+ITERATIONS = 1000
 
 # ----------------------------------------------------
 # Measure performance of serializing data
 #
 # Lessons:
-#
+#   - Listings serialize many objects of the same type, the fields, permissions
+#     and filters of a type are compiled once in a plan reused for every object
+#   - "cold" compiles the plans for every object, as it was done before plans
 # ----------------------------------------------------
 
 
-async def runit(type_name):
-    print(f"Test content serialization with {type_name}")
-    request = get_current_request()
+async def runit(db, type_name, cold=False):
+    print(f"Test content serialization with {type_name}{' (cold)' if cold else ''}")
+    request = get_mocked_request(db=db)
     txn = mocks.MockTransaction()
     ob = await create_content(type_name, id="foobar")
     ob.__txn__ = txn
@@ -35,12 +38,17 @@ async def runit(type_name):
     await deserializer(data, validate_all=True)
     start = time.time()
     for _ in range(ITERATIONS):
+        if cold:
+            clear_serialization_plans()
         serializer = get_multi_adapter((ob, request), IResourceSerializeToJson)
         await serializer()
     end = time.time()
     print(f"Done with {ITERATIONS} in {end - start} seconds")
 
 
-async def run():
-    await runit("TestContent1")
-    await runit("TestContent6")
+async def run(app):
+    db = app.root["db"]
+    await runit(db, "TestContent1", cold=True)
+    await runit(db, "TestContent1")
+    await runit(db, "TestContent6", cold=True)
+    await runit(db, "TestContent6")